@@ -1,3 +1,6 @@
+import logging
+import os
+
 from fastmcp import FastMCP, Context
 from starlette.requests import Request
 from starlette.responses import PlainTextResponse
@@ -82,7 +85,18 @@ def analyze_data(data_points: list[float]) -> str:
     return f"Please analyze these data points: {formatted_data}"
 
 # Create ASGI application
-app = mcp.http_app()
+# Worker processes are set with WORKERS (uvicorn --workers). Sessions are
+# kept in process memory, so with more than one worker the app runs
+# stateless and any worker can answer any request. Stateless requests have
+# no session to send an elicitation back on, so get_user_info only works
+# with a single worker.
+WORKERS = int(os.getenv("WORKERS", "1"))
+if WORKERS > 1:
+    logging.getLogger(__name__).warning(
+        "WORKERS > 1 runs the app stateless; elicitation (get_user_info) "
+        "is unavailable"
+    )
+app = mcp.http_app(stateless_http=WORKERS > 1)
 
 """
 # Middleware to force plain HTTP/JSON responses (disable SSE)
@@ -2,7 +2,8 @@
 Configuration settings for the MCP server.
 """
 
-from typing import Optional
+import os
+from typing import Optional, Set
 
 from pydantic import ConfigDict, Field
 from pydantic_settings import BaseSettings
@@ -21,6 +22,9 @@ class MCPServerConfig(BaseSettings):
     host: str = Field(default="0.0.0.0")
     port: int = Field(default=9000)
     debug: bool = Field(default=False)
+    workers: int = Field(default=1)
+    # Seconds a prefork worker gives in-flight requests when shutting down
+    graceful_shutdown_timeout: float = Field(default=5.0)
 
     # Authentication settings
     tenant_id: Optional[str] = Field(default=None)
@@ -28,11 +32,69 @@ class MCPServerConfig(BaseSettings):
     jwks_uri: Optional[str] = Field(default=None)
     issuer: Optional[str] = Field(default=None)
     audience: Optional[str] = Field(default=None)
+    # Local JWKS file used instead of jwks_uri (tests, air-gapped runs)
+    jwks_file: Optional[str] = Field(default=None)
+    # Seconds JWKS keys stay valid when the response sets no max-age
+    jwks_cache_ttl: float = Field(default=3600.0)
+    # Verified bearer tokens remembered until their exp (0 disables)
+    token_cache_size: int = Field(default=10_000)
 
     # MCP specific settings
     server_name: str = Field(default="BBMCPServer")
     enable_auth: bool = Field(default=True)
 
+    # Tag filters applied to listings and calls (JSON lists in .env)
+    include_tags: Optional[Set[str]] = Field(default=None)
+    exclude_tags: Optional[Set[str]] = Field(default=None)
+
+    # Result cache settings (bytes of cached results per domain)
+    cache_domain_memory_limit: int = Field(default=8 * 1024 * 1024)
+
+    # Thread pools for synchronous tools
+    shared_executor_workers: int = Field(default=8)
+    domain_executor_workers: int = Field(default=4)
+
+    # Process pool for CPU-bound tools (timeout in seconds per call)
+    process_workers: int = Field(default=os.cpu_count() or 1)
+    process_timeout: float = Field(default=30.0)
+
+    # Default per-domain concurrency bulkhead (calls running / calls queued)
+    domain_max_concurrency: int = Field(default=64)
+    domain_max_queue: int = Field(default=256)
+
+    # Largest JSON-RPC batch accepted on the streamable-HTTP endpoint
+    max_batch_size: int = Field(default=32)
+
+    # SQLite file for idempotent tool results (in memory when unset)
+    idempotency_db_path: Optional[str] = Field(default=None)
+
+    # Default rendering of formatter-based tools: full, compact or structured
+    response_mode: str = Field(default="full")
+
+    # Truncate response timestamps to this many seconds and format each
+    # tick once (0 keeps microseconds)
+    timestamp_resolution: float = Field(default=0.0)
+
+    # Warm up tools at start-up; /health answers 503 until it is done
+    warmup: bool = Field(default=False)
+
+    # Seconds between background readiness checks, and the event loop lag
+    # above which /ready reports not ready
+    readiness_interval: float = Field(default=5.0)
+    readiness_max_loop_lag: float = Field(default=0.5)
+
+    # OpenTelemetry tracing (needs opentelemetry-sdk); the exporter is
+    # file (JSON lines in tracing_file), memory or global
+    tracing: bool = Field(default=False)
+    tracing_exporter: str = Field(default="file")
+    tracing_file: str = Field(default="traces.jsonl")
+
+    # Authenticated /debug routes (CPU and memory profiling); requests need DEBUG_TOKEN
+    # or a bearer token the server's auth accepts that carries DEBUG_SCOPE
+    debug_routes: bool = Field(default=False)
+    debug_token: Optional[str] = Field(default=None)
+    debug_scope: str = Field(default="mcp.debug")
+
 
 # Global configuration instance
 config = MCPServerConfig()
@@ -0,0 +1,334 @@
+"""
+JWKS key management for JWT authentication.
+
+``JWKSKeyCache`` keeps the identity provider's signing keys by ``kid``.
+Keys are fetched once at start-up and refreshed in the background before
+they expire, so verifying a token never waits on the identity provider: a
+token signed with an unknown key is rejected and triggers an early
+refresh. A local JWKS file can stand in for the provider in tests and
+air-gapped deployments.
+
+``VerifiedTokenCache`` remembers tokens that passed verification until
+their ``exp``, so a client reusing its token skips the RS256 signature
+check. The cache is emptied whenever the key set changes.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+from authlib.jose import JsonWebKey
+from fastmcp.server.auth.auth import AccessToken
+from fastmcp.server.auth.providers.jwt import JWTVerifier
+
+from core.tracing import record_auth_timing
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JWKS_TTL = 3600.0
+DEFAULT_FETCH_TIMEOUT = 5.0
+# Refresh once this fraction of the key set's lifetime has passed
+REFRESH_AHEAD = 0.8
+# Shortest interval between refreshes triggered by unknown key IDs
+MIN_REFRESH_INTERVAL = 30.0
+MAX_RETRY_DELAY = 300.0
+DEFAULT_KID = "_default"
+DEFAULT_TOKEN_CACHE_SIZE = 10_000
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+def parse_jwks(jwks_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the public keys of a JWKS document by ``kid``."""
+    keys = {}
+    for key_data in jwks_data.get("keys", []):
+        jwk = JsonWebKey.import_key(key_data)
+        keys[key_data.get("kid") or DEFAULT_KID] = jwk.get_public_key()
+    return keys
+
+
+class JWKSKeyCache:
+    """Signing keys by ``kid``, refreshed in the background."""
+
+    def __init__(
+        self,
+        jwks_uri: Optional[str] = None,
+        jwks_file: Optional[str] = None,
+        ttl: float = DEFAULT_JWKS_TTL,
+        fetch_timeout: float = DEFAULT_FETCH_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not jwks_uri and not jwks_file:
+            raise ValueError("Either jwks_uri or jwks_file must be provided")
+        self.jwks_uri = jwks_uri
+        self.jwks_file = jwks_file
+        self.ttl = ttl
+        self.fetch_timeout = fetch_timeout
+        self._clock = clock
+        self._keys: Dict[str, Any] = {}
+        self._fingerprint: Optional[str] = None
+        self.generation = 0
+        self._fetched_at: Optional[float] = None
+        self._lifetime = ttl
+        self._retry_delay = 0.0
+        self._refresh_requested_at = float("-inf")
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.fetches = 0
+        self.failures = 0
+
+    @property
+    def source(self) -> str:
+        """Where the keys come from."""
+        return self.jwks_uri or Path(self.jwks_file).resolve().as_uri()
+
+    @property
+    def loaded(self) -> bool:
+        """True once a key set has been loaded."""
+        return bool(self._keys)
+
+    def _install(self, data: Dict[str, Any], max_age: Optional[float]) -> None:
+        keys = parse_jwks(data)
+        fingerprint = json.dumps(data.get("keys", []), sort_keys=True)
+        if fingerprint != self._fingerprint:
+            # Verified tokens are only trusted for the key set that checked them
+            self._fingerprint = fingerprint
+            self.generation += 1
+        self._keys = keys
+        self._fetched_at = self._clock()
+        self._lifetime = max_age if max_age else self.ttl
+        self._retry_delay = 0.0
+        self.fetches += 1
+        logger.info(f"🔑 Loaded {len(keys)} JWKS keys from {self.source}")
+
+    def _record_failure(self, error: Exception) -> None:
+        self.failures += 1
+        self._retry_delay = min(max(self._retry_delay * 2, 1.0), MAX_RETRY_DELAY)
+        logger.warning(
+            f"⚠️  JWKS refresh from {self.source} failed ({error}); keeping "
+            f"{len(self._keys)} cached keys, retrying in {self._retry_delay:.0f}s"
+        )
+
+    @staticmethod
+    def _max_age(response: httpx.Response) -> Optional[float]:
+        match = _MAX_AGE.search(response.headers.get("cache-control", ""))
+        return float(match.group(1)) if match else None
+
+    def prefetch(self) -> bool:
+        """Load the keys synchronously at start-up; return True on success."""
+        try:
+            if self.jwks_file:
+                data, max_age = json.loads(Path(self.jwks_file).read_text()), None
+            else:
+                response = httpx.get(self.jwks_uri, timeout=self.fetch_timeout)
+                response.raise_for_status()
+                data, max_age = response.json(), self._max_age(response)
+            self._install(data, max_age)
+            return True
+        except Exception as e:
+            self._record_failure(e)
+            return False
+
+    async def refresh(self) -> bool:
+        """Reload the keys; on failure the cached keys stay in use."""
+        try:
+            if self.jwks_file:
+                text = await asyncio.to_thread(Path(self.jwks_file).read_text)
+                data, max_age = json.loads(text), None
+            else:
+                async with httpx.AsyncClient(timeout=self.fetch_timeout) as client:
+                    response = await client.get(self.jwks_uri)
+                response.raise_for_status()
+                data, max_age = response.json(), self._max_age(response)
+            self._install(data, max_age)
+            return True
+        except Exception as e:
+            self._record_failure(e)
+            return False
+
+    def seconds_until_refresh(self) -> float:
+        """Delay before the next background refresh."""
+        if self._retry_delay:
+            return self._retry_delay
+        if self._fetched_at is None:
+            return 0.0
+        due = self._fetched_at + self._lifetime * REFRESH_AHEAD
+        return max(0.0, due - self._clock())
+
+    def start(self) -> None:
+        """Start the background refresh in the running event loop."""
+        loop = asyncio.get_running_loop()
+        if (
+            self._task is not None
+            and not self._task.done()
+            and self._task.get_loop() is loop
+        ):
+            return
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self.seconds_until_refresh()
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.refresh()
+
+    async def ensure_loaded(self) -> bool:
+        """
+        Start the background refresh and, while no keys are loaded, load
+        them now; return True once keys are loaded.
+
+        Run as a readiness check, it retries a failed start-up prefetch
+        without waiting for a token to start the refresh task.
+        """
+        self.start()
+        if not self.loaded:
+            await self.refresh()
+        return self.loaded
+
+    def request_refresh(self) -> None:
+        """Ask the background task to refresh soon (rate limited)."""
+        now = self._clock()
+        if now - self._refresh_requested_at < MIN_REFRESH_INTERVAL:
+            return
+        self._refresh_requested_at = now
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def stop(self) -> None:
+        """Cancel the background refresh."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def get(self, kid: Optional[str]) -> Any:
+        """Return the cached key for ``kid`` without fetching."""
+        if kid and kid in self._keys:
+            return self._keys[kid]
+        if not kid and len(self._keys) == 1:
+            return next(iter(self._keys.values()))
+
+        self.request_refresh()
+        if not self._keys:
+            raise ValueError("No JWKS keys loaded")
+        if kid:
+            raise ValueError(f"Key ID '{kid}' not found in JWKS")
+        raise ValueError("Multiple keys in JWKS but no key ID (kid) in token")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cached key IDs, their age and fetch counters."""
+        return {
+            "source": self.source,
+            "refreshing": self._task is not None and not self._task.done(),
+            "kids": sorted(self._keys),
+            "age": (
+                self._clock() - self._fetched_at
+                if self._fetched_at is not None
+                else None
+            ),
+            "generation": self.generation,
+            "fetches": self.fetches,
+            "failures": self.failures,
+        }
+
+
+class VerifiedTokenCache:
+    """Verified access tokens by token hash, kept until their ``exp``."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_TOKEN_CACHE_SIZE,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, AccessToken]" = OrderedDict()
+        self._generation: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def _check_generation(self, generation: int) -> None:
+        if generation != self._generation:
+            self._entries.clear()
+            self._generation = generation
+
+    def get(self, token: str, generation: int) -> Optional[AccessToken]:
+        """Return the cached result for a token verified with this key set."""
+        if not self.max_entries:
+            return None
+        self._check_generation(generation)
+
+        key = self._key(token)
+        access = self._entries.get(key)
+        if access is None or access.expires_at <= self._clock():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return access
+
+    def put(self, token: str, access: AccessToken, generation: int) -> None:
+        """Remember a verified token; tokens without ``exp`` are not cached."""
+        if not self.max_entries or access.expires_at is None:
+            return
+        self._check_generation(generation)
+        key = self._key(token)
+        self._entries[key] = access
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit and miss counters and the number of cached tokens."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+class CachedJWKSVerifier(JWTVerifier):
+    """
+    ``JWTVerifier`` that takes keys from a ``JWKSKeyCache`` and remembers
+    verified tokens (``token_cache_size=0`` turns that off).
+    """
+
+    def __init__(
+        self,
+        *,
+        key_cache: JWKSKeyCache,
+        token_cache_size: int = DEFAULT_TOKEN_CACHE_SIZE,
+        **kwargs,
+    ):
+        super().__init__(jwks_uri=key_cache.source, **kwargs)
+        self.key_cache = key_cache
+        self.token_cache = VerifiedTokenCache(token_cache_size)
+
+    async def verify_token(self, token: str) -> Optional[AccessToken]:
+        started = time.time_ns()
+        generation = self.key_cache.generation
+        access = self.token_cache.get(token, generation)
+        cached = access is not None
+        if access is None:
+            access = await super().verify_token(token)
+            if access is not None:
+                self.token_cache.put(token, access, generation)
+        record_auth_timing(started, time.time_ns(), cached)
+        return access
+
+    async def _get_jwks_key(self, kid: Optional[str]) -> Any:
+        self.key_cache.start()
+        return self.key_cache.get(kid)
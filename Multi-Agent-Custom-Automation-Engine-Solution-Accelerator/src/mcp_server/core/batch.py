@@ -0,0 +1,306 @@
+"""
+JSON-RPC batch requests for the streamable-HTTP transport.
+
+The MCP transport handles a single JSON-RPC message per POST.
+``BatchMiddleware`` also accepts a JSON array of messages on the MCP
+endpoint. It replays each message through the app as a request of its own,
+all of them concurrently, and returns the answers together:
+
+* clients that accept ``text/event-stream`` get an SSE stream with each
+  response (and any progress notification) as soon as it is produced;
+* other clients get a single JSON array, in the order of the batch.
+
+Every call still goes through the server middleware, so batched calls are
+subject to the same bulkheads, caches and tag filters as single calls.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 32
+INVALID_REQUEST = -32600
+INTERNAL_ERROR = -32603
+CONTENT_TYPE_JSON = "application/json"
+CONTENT_TYPE_SSE = "text/event-stream"
+
+
+def _error(request_id: Any, code: int, message: str, data: Any = None) -> dict:
+    error = {"code": code, "message": message}
+    if data is not None:
+        error["data"] = data
+    return {"jsonrpc": "2.0", "id": request_id, "error": error}
+
+
+def _header(scope, name: bytes) -> str:
+    for key, value in scope.get("headers", ()):
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return ""
+
+
+class _SSEParser:
+    """Incrementally extract JSON messages from an SSE byte stream."""
+
+    def __init__(self):
+        self._buffer = b""
+
+    def feed(self, chunk: bytes) -> List[dict]:
+        self._buffer = (self._buffer + chunk).replace(b"\r\n", b"\n")
+        messages = []
+        while b"\n\n" in self._buffer:
+            event, self._buffer = self._buffer.split(b"\n\n", 1)
+            data = b"\n".join(
+                line[5:].lstrip()
+                for line in event.split(b"\n")
+                if line.startswith(b"data:")
+            )
+            if not data:
+                continue
+            try:
+                messages.append(json.loads(data))
+            except ValueError:
+                logger.debug(f"Ignoring non-JSON SSE event: {data[:80]!r}")
+        return messages
+
+
+class BatchMiddleware:
+    """ASGI middleware that executes JSON-RPC batches concurrently."""
+
+    def __init__(
+        self,
+        app,
+        path: str = "/mcp",
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    ):
+        self.app = app
+        self.route_path = path
+        self.path = path.rstrip("/")
+        self.max_batch_size = max_batch_size
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"].rstrip("/") != self.path
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        body = await self._read_body(receive)
+        if not body.lstrip().startswith(b"["):
+            await self.app(scope, self._replay(body, receive), send)
+            return
+
+        try:
+            messages = json.loads(body)
+        except ValueError:
+            # Let the transport report the parse error as usual
+            await self.app(scope, self._replay(body, receive), send)
+            return
+
+        if not messages or len(messages) > self.max_batch_size:
+            await self._send_json(
+                send,
+                400,
+                _error(
+                    None,
+                    INVALID_REQUEST,
+                    f"Batch must contain 1 to {self.max_batch_size} messages",
+                ),
+                scope,
+            )
+            return
+
+        if all(isinstance(m, dict) and "id" not in m for m in messages):
+            # Only notifications: nothing to wait for
+            await self._send_json(send, 202, None, scope)
+            await asyncio.gather(
+                *(self._call(scope, message, lambda _msg: None) for message in messages)
+            )
+            return
+
+        if CONTENT_TYPE_SSE in _header(scope, b"accept"):
+            await self._stream(scope, messages, send)
+        else:
+            responses = await asyncio.gather(
+                *(self._call(scope, message, lambda _msg: None) for message in messages)
+            )
+            await self._send_json(
+                send, 200, [r for r in responses if r is not None], scope
+            )
+
+    async def _stream(self, scope, messages: List[Any], send) -> None:
+        """Send responses as SSE events in completion order."""
+        queue: "asyncio.Queue[Optional[dict]]" = asyncio.Queue()
+
+        async def run(message):
+            response = await self._call(scope, message, queue.put_nowait)
+            if response is not None:
+                queue.put_nowait(response)
+
+        tasks = [asyncio.create_task(run(message)) for message in messages]
+        finished = asyncio.gather(*tasks, return_exceptions=True)
+        finished.add_done_callback(lambda _future: queue.put_nowait(None))
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": self._response_headers(scope, CONTENT_TYPE_SSE)
+                + [(b"cache-control", b"no-cache, no-transform")],
+            }
+        )
+        try:
+            while (message := await queue.get()) is not None:
+                event = f"event: message\ndata: {json.dumps(message)}\n\n"
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": event.encode("utf-8"),
+                        "more_body": True,
+                    }
+                )
+        finally:
+            for task in tasks:
+                task.cancel()
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def _call(
+        self, scope, message: Any, on_notification: Callable[[dict], None]
+    ) -> Optional[dict]:
+        """Run one batch entry through the app and return its response."""
+        if not isinstance(message, dict):
+            return _error(None, INVALID_REQUEST, "Batch entries must be objects")
+
+        request_id = message.get("id")
+        body = json.dumps(message).encode("utf-8")
+        headers = [
+            (key, value)
+            for key, value in scope["headers"]
+            if key.lower() not in (b"content-length", b"accept")
+        ] + [
+            (b"content-length", str(len(body)).encode("latin-1")),
+            (b"accept", f"{CONTENT_TYPE_JSON}, {CONTENT_TYPE_SSE}".encode("latin-1")),
+        ]
+
+        finished = asyncio.Event()
+        state: Dict[str, Any] = {
+            "status": 500,
+            "content_type": "",
+            "body": b"",
+            "response": None,
+            "body_sent": False,
+        }
+        parser = _SSEParser()
+
+        async def receive():
+            if not state["body_sent"]:
+                state["body_sent"] = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        def handle(decoded: dict) -> None:
+            if "method" in decoded:
+                on_notification(decoded)
+            elif decoded.get("id") == request_id:
+                state["response"] = decoded
+
+        async def capture(event):
+            if event["type"] == "http.response.start":
+                state["status"] = event["status"]
+                for key, value in event.get("headers", ()):
+                    if key.lower() == b"content-type":
+                        state["content_type"] = value.decode("latin-1")
+            elif event["type"] == "http.response.body":
+                chunk = event.get("body", b"")
+                if state["content_type"].startswith(CONTENT_TYPE_SSE):
+                    for decoded in parser.feed(chunk):
+                        handle(decoded)
+                else:
+                    state["body"] += chunk
+
+        try:
+            # Use the route's exact path so entries are not redirected
+            sub_scope = {
+                **scope,
+                "headers": headers,
+                "path": self.route_path,
+                "raw_path": self.route_path.encode("latin-1"),
+            }
+            await self.app(sub_scope, receive, capture)
+        except Exception as e:
+            logger.exception(f"❌ Batch entry {request_id!r} failed")
+            return _error(request_id, INTERNAL_ERROR, f"Internal error: {e}")
+        finally:
+            finished.set()
+
+        if request_id is None:
+            return None
+        if state["response"] is not None:
+            return state["response"]
+        return self._response_from_body(request_id, state["status"], state["body"])
+
+    @staticmethod
+    def _response_from_body(request_id: Any, status: int, body: bytes) -> dict:
+        """Turn a plain JSON or error response into a JSON-RPC response."""
+        try:
+            decoded = json.loads(body) if body else None
+        except ValueError:
+            decoded = None
+
+        if isinstance(decoded, dict) and ("result" in decoded or "error" in decoded):
+            return {**decoded, "id": request_id}
+        return _error(
+            request_id,
+            INTERNAL_ERROR,
+            f"HTTP {status}",
+            data=body.decode("utf-8", "replace") or None,
+        )
+
+    @staticmethod
+    def _response_headers(scope, content_type: str) -> list:
+        headers = [(b"content-type", content_type.encode("latin-1"))]
+        session_id = _header(scope, b"mcp-session-id")
+        if session_id:
+            headers.append((b"mcp-session-id", session_id.encode("latin-1")))
+        return headers
+
+    async def _send_json(self, send, status: int, payload: Any, scope) -> None:
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": self._response_headers(scope, CONTENT_TYPE_JSON)
+                + [(b"content-length", str(len(body)).encode("latin-1"))],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                return body
+
+    @staticmethod
+    def _replay(body: bytes, receive):
+        """Return a ``receive`` that yields the already-read body first."""
+        sent = False
+
+        async def replay():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return replay
@@ -0,0 +1,239 @@
+"""
+Concurrency bulkheads for MCP tools.
+
+Every domain gets a bulkhead (a concurrency limit plus a bounded wait
+queue) so a burst of slow calls in one domain cannot starve the others.
+A tool can add its own, tighter bulkhead with
+``meta={"max_concurrency": 2, "max_queue": 10}``. When a queue is full the
+call is rejected straight away with a "server busy" error.
+
+Workflow tools that call other tools of their domain (see
+``core.pipeline.tool_step``) set ``"domain_bulkhead": False``: holding a
+domain slot while their steps queue for one could deadlock the domain, so
+only their own tool bulkhead applies.
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastmcp.server.middleware import Middleware
+from mcp.shared.exceptions import McpError
+from mcp.types import ErrorData
+
+from core.metrics import MetricsRegistry
+from core.registry import TOOL, ToolRegistry
+from core.tracing import QUEUE_WAIT, record_call_attribute
+
+SERVER_BUSY = -32000
+DEFAULT_DOMAIN_CONCURRENCY = 64
+DEFAULT_DOMAIN_QUEUE = 256
+
+
+class ServerBusyError(McpError):
+    """Raised when a bulkhead's wait queue is full."""
+
+    def __init__(self, bulkhead: str):
+        super().__init__(
+            ErrorData(
+                code=SERVER_BUSY,
+                message=f"Server busy: too many pending calls for {bulkhead}",
+                data={"bulkhead": bulkhead},
+            )
+        )
+
+
+class Bulkhead:
+    """A concurrency limit with a bounded queue of waiting calls."""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        self.completed = 0
+        self.total_wait = 0.0
+
+    @property
+    def saturated(self) -> bool:
+        """True when new calls would be rejected."""
+        return self._semaphore.locked() and self.waiting >= self.max_queue
+
+    async def acquire(self) -> float:
+        """Take a slot, waiting in the queue if needed; return the wait in seconds."""
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise ServerBusyError(self.name)
+
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        wait = time.perf_counter() - started
+        self.total_wait += wait
+        self.active += 1
+        return wait
+
+    def release(self) -> None:
+        """Free a slot taken by ``acquire``."""
+        self.active -= 1
+        self.completed += 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return limits, current occupancy and rejection counters."""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "avg_wait": self.total_wait / self.completed if self.completed else 0.0,
+        }
+
+
+class BulkheadRegistry:
+    """Creates and holds the domain and tool bulkheads."""
+
+    def __init__(
+        self,
+        default_concurrency: int = DEFAULT_DOMAIN_CONCURRENCY,
+        default_queue: int = DEFAULT_DOMAIN_QUEUE,
+    ):
+        self.default_concurrency = default_concurrency
+        self.default_queue = default_queue
+        self._domain_limits: Dict[str, tuple] = {}
+        self._bulkheads: Dict[str, Bulkhead] = {}
+
+    def set_domain_limits(
+        self,
+        domain: str,
+        max_concurrent: Optional[int] = None,
+        max_queue: Optional[int] = None,
+    ) -> None:
+        """Override the default limits for one domain."""
+        self._domain_limits[domain] = (
+            max_concurrent or self.default_concurrency,
+            max_queue if max_queue is not None else self.default_queue,
+        )
+
+    def for_domain(self, domain: str) -> Bulkhead:
+        """Return the bulkhead shared by every component of a domain."""
+        name = f"domain:{domain}"
+        bulkhead = self._bulkheads.get(name)
+        if bulkhead is None:
+            limits = self._domain_limits.get(
+                domain, (self.default_concurrency, self.default_queue)
+            )
+            bulkhead = Bulkhead(name, *limits)
+            self._bulkheads[name] = bulkhead
+        return bulkhead
+
+    def for_tool(self, tool: str, meta: Dict[str, Any]) -> Optional[Bulkhead]:
+        """Return the tool's own bulkhead if its meta declares a limit."""
+        max_concurrent = meta.get("max_concurrency")
+        if not max_concurrent:
+            return None
+
+        name = f"tool:{tool}"
+        bulkhead = self._bulkheads.get(name)
+        if bulkhead is None:
+            bulkhead = Bulkhead(
+                name, int(max_concurrent), int(meta.get("max_queue", 0))
+            )
+            self._bulkheads[name] = bulkhead
+        return bulkhead
+
+    def shedding(self) -> bool:
+        """True while any bulkhead is rejecting new calls."""
+        return any(bulkhead.saturated for bulkhead in self._bulkheads.values())
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return statistics for every bulkhead created so far."""
+        return {name: bulkhead.stats() for name, bulkhead in self._bulkheads.items()}
+
+    def register_metrics(self, metrics: MetricsRegistry) -> None:
+        """Export occupancy and counters of every bulkhead on ``metrics``."""
+
+        def read(field: str) -> Callable[[], Dict[Tuple[str, ...], float]]:
+            # Bulkhead names are "domain:<domain>" or "tool:<tool>"
+            return lambda: {
+                tuple(name.split(":", 1)): getattr(bulkhead, field)
+                for name, bulkhead in list(self._bulkheads.items())
+            }
+
+        for kind, name, help_text, field in (
+            ("gauge", "mcp_bulkhead_active_calls", "Calls holding a slot.", "active"),
+            (
+                "gauge",
+                "mcp_bulkhead_queued_calls",
+                "Calls waiting for a slot.",
+                "waiting",
+            ),
+            (
+                "counter",
+                "mcp_bulkhead_rejected_total",
+                "Calls rejected because the wait queue was full.",
+                "rejected",
+            ),
+            (
+                "counter",
+                "mcp_bulkhead_completed_total",
+                "Calls that held a slot and released it.",
+                "completed",
+            ),
+        ):
+            metrics.observed(kind, name, help_text, ("scope", "name"), read(field))
+
+
+class BulkheadMiddleware(Middleware):
+    """Run tool calls and resource reads inside their bulkheads."""
+
+    def __init__(self, registry: ToolRegistry, bulkheads: BulkheadRegistry):
+        self.registry = registry
+        self.bulkheads = bulkheads
+
+    async def _guarded(self, entry, context, call_next):
+        if entry is None:
+            return await call_next(context)
+
+        tool_bulkhead = self.bulkheads.for_tool(entry.name, entry.meta)
+        if entry.meta.get("domain_bulkhead", True):
+            domain_bulkhead = self.bulkheads.for_domain(entry.domain.value)
+        else:
+            domain_bulkhead = None
+
+        # Take the narrower tool slot first so queued calls of one tool do
+        # not hold domain slots other tools could use.
+        wait = 0.0
+        if tool_bulkhead is not None:
+            wait += await tool_bulkhead.acquire()
+        try:
+            if domain_bulkhead is None:
+                record_call_attribute(QUEUE_WAIT, wait)
+                return await call_next(context)
+            wait += await domain_bulkhead.acquire()
+            record_call_attribute(QUEUE_WAIT, wait)
+            try:
+                return await call_next(context)
+            finally:
+                domain_bulkhead.release()
+        finally:
+            if tool_bulkhead is not None:
+                tool_bulkhead.release()
+
+    async def on_call_tool(self, context, call_next):
+        entry = self.registry.get(TOOL, context.message.name)
+        return await self._guarded(entry, context, call_next)
+
+    async def on_read_resource(self, context, call_next):
+        entry = self.registry.resolve_resource(str(context.message.uri))
+        return await self._guarded(entry, context, call_next)
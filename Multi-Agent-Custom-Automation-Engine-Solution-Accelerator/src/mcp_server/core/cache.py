@@ -0,0 +1,240 @@
+"""
+Declarative result cache for MCP tools and resources.
+
+A tool or resource opts in through its ``meta`` dict::
+
+    @mcp.tool(meta={"cache": {"ttl": 300, "max_entries": 256, "key_args": ["a", "b"]}})
+
+``ttl`` is in seconds, ``max_entries`` bounds the per-component LRU and
+``key_args`` restricts the cache key to the listed arguments (all arguments
+are used when omitted). ``"cache": True`` enables caching with defaults.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from fastmcp.server.middleware import Middleware
+
+from core.registry import TOOL, ToolRegistry
+from core.tracing import CACHE_STATUS, record_call_attribute
+from utils.formatters import current_response_mode
+
+DEFAULT_TTL = 300.0
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_DOMAIN_MEMORY_LIMIT = 8 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Caching options declared by a component."""
+
+    ttl: float = DEFAULT_TTL
+    max_entries: int = DEFAULT_MAX_ENTRIES
+    key_args: Optional[Tuple[str, ...]] = None
+
+    @classmethod
+    def from_meta(cls, meta: Dict[str, Any]) -> Optional["CachePolicy"]:
+        """Build a policy from a component's ``meta`` dict, if it opts in."""
+        options = meta.get("cache")
+        if not options:
+            return None
+        if options is True:
+            return cls()
+
+        key_args = options.get("key_args")
+        return cls(
+            ttl=float(options.get("ttl", DEFAULT_TTL)),
+            max_entries=int(options.get("max_entries", DEFAULT_MAX_ENTRIES)),
+            key_args=tuple(key_args) if key_args is not None else None,
+        )
+
+    def make_key(self, arguments: Optional[Dict[str, Any]]) -> str:
+        """Build a stable cache key from call arguments."""
+        arguments = arguments or {}
+        if self.key_args is not None:
+            arguments = {name: arguments.get(name) for name in self.key_args}
+        return json.dumps(arguments, sort_keys=True, default=str)
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for one cached component."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+def estimate_size(value: Any) -> int:
+    """Rough byte size of a cached tool or resource result."""
+    content = getattr(value, "content", None)
+    if isinstance(content, list):
+        size = sum(len(getattr(block, "text", "") or "") for block in content)
+        structured = getattr(value, "structured_content", None)
+        if structured is not None:
+            size += len(json.dumps(structured, default=str))
+        return size
+    if isinstance(content, (str, bytes)):
+        return len(content)
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(item) for item in value)
+    return len(repr(value))
+
+
+class ResultCache:
+    """
+    Per-component LRU caches with TTL and a memory budget per domain.
+
+    Each component gets its own LRU bounded by ``max_entries``. When the
+    estimated size of a domain's entries exceeds ``domain_memory_limit``,
+    the least recently used entries of that domain are evicted first.
+    """
+
+    def __init__(
+        self,
+        domain_memory_limit: int = DEFAULT_DOMAIN_MEMORY_LIMIT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.domain_memory_limit = domain_memory_limit
+        self._clock = clock
+        # component -> key -> (expires_at, last_used, size, value)
+        self._entries: Dict[str, "OrderedDict[Hashable, list]"] = {}
+        self._component_domain: Dict[str, str] = {}
+        self._domain_bytes: Dict[str, int] = {}
+        self._stats: Dict[str, CacheStats] = {}
+
+    def get(self, component: str, key: Hashable) -> Tuple[bool, Any]:
+        """Return ``(hit, value)`` for a cached result."""
+        stats = self._stats.setdefault(component, CacheStats())
+        entries = self._entries.get(component)
+        item = entries.get(key) if entries is not None else None
+
+        if item is None:
+            stats.misses += 1
+            return False, None
+
+        now = self._clock()
+        if item[0] <= now:
+            self._remove(component, key)
+            stats.expirations += 1
+            stats.misses += 1
+            return False, None
+
+        item[1] = now
+        entries.move_to_end(key)
+        stats.hits += 1
+        return True, item[3]
+
+    def put(
+        self,
+        domain: str,
+        component: str,
+        key: Hashable,
+        value: Any,
+        policy: CachePolicy,
+    ) -> None:
+        """Store a result, evicting entries to respect the configured limits."""
+        size = estimate_size(value)
+        if size > self.domain_memory_limit:
+            return
+
+        now = self._clock()
+        entries = self._entries.setdefault(component, OrderedDict())
+        self._component_domain[component] = domain
+        stats = self._stats.setdefault(component, CacheStats())
+
+        if key in entries:
+            self._remove(component, key)
+        entries[key] = [now + policy.ttl, now, size, value]
+        self._domain_bytes[domain] = self._domain_bytes.get(domain, 0) + size
+
+        while len(entries) > policy.max_entries:
+            self._remove(component, next(iter(entries)))
+            stats.evictions += 1
+
+        while self._domain_bytes[domain] > self.domain_memory_limit:
+            victim = self._least_recent_in_domain(domain)
+            if victim is None:
+                break
+            self._remove(*victim)
+            self._stats[victim[0]].evictions += 1
+
+    def clear(self, component: Optional[str] = None) -> None:
+        """Drop cached entries for one component, or for all of them."""
+        components = [component] if component else list(self._entries)
+        for name in components:
+            for key in list(self._entries.get(name, ())):
+                self._remove(name, key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters per component and memory use per domain."""
+        return {
+            "components": {
+                name: {**asdict(stats), "entries": len(self._entries.get(name, ()))}
+                for name, stats in self._stats.items()
+            },
+            "domain_bytes": dict(self._domain_bytes),
+            "domain_memory_limit": self.domain_memory_limit,
+        }
+
+    def _least_recent_in_domain(self, domain: str) -> Optional[Tuple[str, Hashable]]:
+        oldest = None
+        for component, entries in self._entries.items():
+            if self._component_domain.get(component) != domain or not entries:
+                continue
+            key = next(iter(entries))
+            last_used = entries[key][1]
+            if oldest is None or last_used < oldest[0]:
+                oldest = (last_used, component, key)
+        return (oldest[1], oldest[2]) if oldest else None
+
+    def _remove(self, component: str, key: Hashable) -> None:
+        item = self._entries[component].pop(key)
+        domain = self._component_domain[component]
+        self._domain_bytes[domain] -= item[2]
+
+
+class ResultCacheMiddleware(Middleware):
+    """Serve repeated calls to cache-enabled tools and resources from memory."""
+
+    def __init__(self, registry: ToolRegistry, cache: ResultCache):
+        self.registry = registry
+        self.cache = cache
+
+    async def on_call_tool(self, context, call_next):
+        entry = self.registry.get(TOOL, context.message.name)
+        policy = CachePolicy.from_meta(entry.meta) if entry else None
+        if policy is None:
+            return await call_next(context)
+
+        # Responses differ per response mode, so the mode is part of the key
+        mode = current_response_mode().value
+        key = f"{mode}:{policy.make_key(context.message.arguments)}"
+        hit, result = self.cache.get(entry.name, key)
+        record_call_attribute(CACHE_STATUS, "hit" if hit else "miss")
+        if hit:
+            return result
+
+        result = await call_next(context)
+        self.cache.put(entry.domain.value, entry.name, key, result, policy)
+        return result
+
+    async def on_read_resource(self, context, call_next):
+        uri = str(context.message.uri)
+        entry = self.registry.resolve_resource(uri)
+        policy = CachePolicy.from_meta(entry.meta) if entry else None
+        if policy is None:
+            return await call_next(context)
+
+        hit, contents = self.cache.get(entry.name, uri)
+        record_call_attribute(CACHE_STATUS, "hit" if hit else "miss")
+        if hit:
+            return contents
+
+        contents = list(await call_next(context))
+        self.cache.put(entry.domain.value, entry.name, uri, contents, policy)
+        return contents
@@ -0,0 +1,480 @@
+"""
+Execution policies for synchronous MCP tools.
+
+Synchronous tools run on the event loop by default. A service can move
+them to a shared bounded thread pool or to a pool dedicated to its domain
+by setting ``executor_policy`` on its ``MCPToolBase`` subclass, and a
+single tool can override it with ``meta={"executor": "shared"}``.
+
+CPU-bound tools can use ``"process"`` to run in a managed process pool.
+Those tools must be module-level functions so workers can import them,
+and they cannot take a ``Context`` argument.
+"""
+
+import asyncio
+import contextvars
+import functools
+import importlib
+import inspect
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    # Process workers import this module; keep them off the metrics stack
+    from core.metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARED_WORKERS = 8
+DEFAULT_DOMAIN_WORKERS = 4
+DEFAULT_PROCESS_WORKERS = os.cpu_count() or 1
+DEFAULT_PROCESS_TIMEOUT = 30.0
+DEFAULT_PING_TIMEOUT = 1.0
+
+
+class ExecutorPolicy(Enum):
+    """Where a synchronous tool runs."""
+
+    INLINE = "inline"
+    SHARED = "shared"
+    DOMAIN = "domain"
+    PROCESS = "process"
+
+
+# Functions resolved inside a process-pool worker, by (module, qualname)
+_worker_functions: Dict[Tuple[str, str], Callable] = {}
+
+
+def _warm_worker(modules: Tuple[str, ...]) -> None:
+    """Process-pool initializer: import service modules before the first call."""
+    for module in modules:
+        importlib.import_module(module)
+
+
+def _ping() -> int:
+    """No-op task used to start workers ahead of the first call."""
+    return os.getpid()
+
+
+def _invoke_in_worker(module: str, qualname: str, args: tuple, kwargs: dict):
+    """Resolve a module-level function by name and call it."""
+    fn = _worker_functions.get((module, qualname))
+    if fn is None:
+        fn = importlib.import_module(module)
+        for part in qualname.split("."):
+            fn = getattr(fn, part)
+        fn = inspect.unwrap(fn)
+        _worker_functions[(module, qualname)] = fn
+    return fn(*args, **kwargs)
+
+
+class InstrumentedThreadPool:
+    """Thread pool that tracks queue depth and time spent waiting for a worker."""
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"mcp-{name}"
+        )
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.started = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls waiting for a free worker."""
+        return self.submitted - self.started
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run ``fn`` on the pool, propagating context variables."""
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        submitted_at = time.perf_counter()
+
+        def job():
+            wait = time.perf_counter() - submitted_at
+            with self._lock:
+                self.started += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+            try:
+                return context.run(fn, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self.completed += 1
+
+        with self._lock:
+            self.submitted += 1
+        return await loop.run_in_executor(self._executor, job)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool size, queue depth and wait times in seconds."""
+        with self._lock:
+            started = self.started
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self.submitted - started,
+                "running": started - self.completed,
+                "started": started,
+                "completed": self.completed,
+                "total_wait": self.total_wait,
+                "avg_wait": self.total_wait / started if started else 0.0,
+                "max_wait": self.max_wait,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads."""
+        self._executor.shutdown(wait=wait)
+
+
+class ManagedProcessPool:
+    """
+    Process pool for CPU-bound tools.
+
+    Workers are spawned on the first call (or warm-up) with the registered
+    service modules already imported. Each call has a timeout. A timed-out
+    call cannot be stopped on its own, so its pool is retired: new calls go
+    to a fresh pool, and the old workers are terminated once the calls still
+    running on them have finished or timed out, so a timeout never kills
+    unrelated calls. Until then both pools' workers are alive. A crashed
+    pool fails all its calls anyway; it is torn down at once and calls
+    interrupted by the crash are retried once on the new pool.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_PROCESS_WORKERS,
+        timeout: float = DEFAULT_PROCESS_TIMEOUT,
+        warm_modules: Iterable[str] = (),
+    ):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.warm_modules: Set[str] = set(warm_modules)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Calls running on each pool, including retired ones
+        self._calls: Dict[ProcessPoolExecutor, int] = {}
+        self._retired: Set[ProcessPoolExecutor] = set()
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self.restarts = 0
+
+    def add_warm_module(self, module: str) -> None:
+        """Import ``module`` in every worker started from now on."""
+        self.warm_modules.add(module)
+
+    def start(self) -> ProcessPoolExecutor:
+        """Start the workers if they are not running yet."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker,
+                    initargs=(tuple(sorted(self.warm_modules)),),
+                )
+                for _ in range(self.max_workers):
+                    self._executor.submit(_ping)
+            return self._executor
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a module-level function in a worker process."""
+        target = (fn.__module__, fn.__qualname__)
+        for attempt in range(2):
+            executor = self.start()
+            with self._lock:
+                self.in_flight += 1
+                self._calls[executor] = self._calls.get(executor, 0) + 1
+            try:
+                future = executor.submit(_invoke_in_worker, *target, args, kwargs)
+                result = await asyncio.wait_for(
+                    asyncio.wrap_future(future), timeout=self.timeout
+                )
+            except asyncio.TimeoutError:
+                with self._lock:
+                    self.timeouts += 1
+                self._retire(executor)
+                raise TimeoutError(
+                    f"{fn.__qualname__} exceeded {self.timeout}s in the process pool"
+                )
+            except BrokenProcessPool:
+                with self._lock:
+                    self.crashes += 1
+                self._retire(executor)
+                self._terminate(executor)
+                if attempt:
+                    raise
+                logger.warning(
+                    f"⚠️  Process pool crashed, retrying {fn.__qualname__}"
+                )
+                continue
+            finally:
+                self._call_done(executor)
+
+            with self._lock:
+                self.completed += 1
+            return result
+
+    async def ping(self) -> bool:
+        """Start the workers if needed and wait until one answers."""
+        future = self.start().submit(_ping)
+        await asyncio.wrap_future(future)
+        return True
+
+    async def check(self, timeout: float = DEFAULT_PING_TIMEOUT) -> str:
+        """
+        Readiness check that never starts the workers.
+
+        A pool that has not started is ready: its workers spawn on the first
+        call or warm-up. A pool running calls is evidently alive. An idle
+        pool must answer a ping within ``timeout``.
+        """
+        with self._lock:
+            executor, in_flight = self._executor, self.in_flight
+        if executor is None:
+            return "not started"
+        if in_flight:
+            return "busy"
+        await asyncio.wait_for(
+            asyncio.wrap_future(executor.submit(_ping)), timeout=timeout
+        )
+        return "answered"
+
+    def _retire(self, executor: ProcessPoolExecutor) -> None:
+        """Send new calls to a fresh pool; ``executor`` dies once it is idle."""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+            self._retired.add(executor)
+            self.restarts += 1
+
+    def _call_done(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            remaining = self._calls.pop(executor) - 1
+            if remaining:
+                self._calls[executor] = remaining
+            idle = not remaining and executor in self._retired
+        if idle:
+            self._terminate(executor)
+
+    def _terminate(self, executor: ProcessPoolExecutor) -> None:
+        """Kill the workers of a retired pool."""
+        with self._lock:
+            if executor not in self._retired:
+                return
+            self._retired.discard(executor)
+
+        # ProcessPoolExecutor cannot stop running work; terminate the workers.
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return call, timeout and crash counters."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "running": self._executor is not None,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "timeouts": self.timeouts,
+                "crashes": self.crashes,
+                "restarts": self.restarts,
+                "retired": len(self._retired),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the workers, including those of retired pools."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            retired = list(self._retired)
+        for old in retired:
+            self._terminate(old)
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+class ExecutorManager:
+    """Owns the shared pool and the per-domain pools, created on first use."""
+
+    def __init__(
+        self,
+        shared_workers: int = DEFAULT_SHARED_WORKERS,
+        domain_workers: int = DEFAULT_DOMAIN_WORKERS,
+        process_workers: int = DEFAULT_PROCESS_WORKERS,
+        process_timeout: float = DEFAULT_PROCESS_TIMEOUT,
+    ):
+        self.shared_workers = shared_workers
+        self.domain_workers = domain_workers
+        self._pools: Dict[str, InstrumentedThreadPool] = {}
+        self._lock = threading.Lock()
+        self.process_pool = ManagedProcessPool(
+            max_workers=process_workers, timeout=process_timeout
+        )
+
+    def get_pool(
+        self, policy: ExecutorPolicy, domain: str
+    ) -> Optional[InstrumentedThreadPool]:
+        """Return the pool for a policy, or ``None`` for inline execution."""
+        if policy is ExecutorPolicy.INLINE:
+            return None
+
+        if policy is ExecutorPolicy.SHARED:
+            name, workers = "shared", self.shared_workers
+        else:
+            name, workers = f"domain-{domain}", self.domain_workers
+
+        with self._lock:
+            pool = self._pools.get(name)
+            if pool is None:
+                pool = InstrumentedThreadPool(name, workers)
+                self._pools[name] = pool
+        return pool
+
+    def wrap(self, fn: Callable, policy: ExecutorPolicy, domain: str) -> Callable:
+        """
+        Wrap a synchronous function so it runs according to ``policy``.
+
+        Coroutine functions and inline policies are returned unchanged. The
+        wrapper keeps the original signature so FastMCP builds the same
+        argument schema.
+        """
+        if policy is ExecutorPolicy.INLINE or inspect.iscoroutinefunction(fn):
+            return fn
+
+        if policy is ExecutorPolicy.PROCESS:
+            return self._wrap_process(fn)
+
+        @functools.wraps(fn)
+        async def offloaded(*args, **kwargs):
+            pool = self.get_pool(policy, domain)
+            return await pool.run(fn, *args, **kwargs)
+
+        return offloaded
+
+    def _wrap_process(self, fn: Callable) -> Callable:
+        if "<locals>" in fn.__qualname__:
+            raise ValueError(
+                f"{fn.__qualname__} must be a module-level function to run "
+                "in the process pool"
+            )
+        if any(
+            "Context" in str(param.annotation)
+            for param in inspect.signature(fn).parameters.values()
+        ):
+            raise ValueError(
+                f"{fn.__qualname__} takes a Context and cannot run in the "
+                "process pool"
+            )
+
+        # Workers spawn on the first call or warm-up, not when the service loads
+        self.process_pool.add_warm_module(fn.__module__)
+
+        @functools.wraps(fn)
+        async def offloaded(*args, **kwargs):
+            return await self.process_pool.run(fn, *args, **kwargs)
+
+        return offloaded
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return statistics for every pool created so far."""
+        with self._lock:
+            pools = dict(self._pools)
+        stats = {name: pool.stats() for name, pool in pools.items()}
+        stats["process"] = self.process_pool.stats()
+        return stats
+
+    def register_metrics(self, metrics: "MetricsRegistry") -> None:
+        """Export queue depth, wait times and call counters of every pool."""
+
+        def read(
+            thread_field: Optional[str], process_field: Optional[str] = None
+        ) -> Callable[[], Dict[Tuple[str, ...], float]]:
+            def values() -> Dict[Tuple[str, ...], float]:
+                stats = self.stats()
+                process = stats.pop("process")
+                samples = {}
+                if thread_field:
+                    for pool, pool_stats in stats.items():
+                        samples[(pool,)] = pool_stats[thread_field]
+                if process_field:
+                    samples[("process",)] = process[process_field]
+                return samples
+
+            return values
+
+        for kind, name, help_text, fields in (
+            (
+                "gauge",
+                "mcp_executor_queue_depth",
+                "Calls waiting for a worker thread.",
+                ("queue_depth",),
+            ),
+            (
+                "gauge",
+                "mcp_executor_max_wait_seconds",
+                "Longest wait for a worker thread so far.",
+                ("max_wait",),
+            ),
+            (
+                "counter",
+                "mcp_executor_wait_seconds_total",
+                "Time calls spent waiting for a worker thread.",
+                ("total_wait",),
+            ),
+            (
+                "counter",
+                "mcp_executor_started_total",
+                "Calls that got a worker thread.",
+                ("started",),
+            ),
+            (
+                "gauge",
+                "mcp_executor_running_calls",
+                "Calls on a worker; for the process pool, submitted and unfinished.",
+                ("running", "in_flight"),
+            ),
+            (
+                "counter",
+                "mcp_executor_completed_total",
+                "Calls finished.",
+                ("completed", "completed"),
+            ),
+            (
+                "counter",
+                "mcp_executor_timeouts_total",
+                "Process pool calls that timed out.",
+                (None, "timeouts"),
+            ),
+            (
+                "counter",
+                "mcp_executor_crashes_total",
+                "Process pool crashes.",
+                (None, "crashes"),
+            ),
+        ):
+            metrics.observed(kind, name, help_text, ("pool",), read(*fields))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop every pool."""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.shutdown(wait=wait)
+        self.process_pool.shutdown(wait=wait)
@@ -2,10 +2,70 @@
 Core MCP server components and factory patterns.
 """
 
+import asyncio
+import contextlib
+import functools
+import importlib
+import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, Any
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Any, Set, Tuple
 from enum import Enum
 from fastmcp import FastMCP
+from fastmcp.resources.template import match_uri_template
+from fastmcp.server.middleware import Middleware
+
+from core.bulkhead import (
+    DEFAULT_DOMAIN_CONCURRENCY,
+    DEFAULT_DOMAIN_QUEUE,
+    BulkheadMiddleware,
+    BulkheadRegistry,
+)
+from core.cache import (
+    DEFAULT_DOMAIN_MEMORY_LIMIT,
+    ResultCache,
+    ResultCacheMiddleware,
+)
+from core.executors import (
+    DEFAULT_DOMAIN_WORKERS,
+    DEFAULT_PROCESS_TIMEOUT,
+    DEFAULT_PROCESS_WORKERS,
+    DEFAULT_SHARED_WORKERS,
+    ExecutorManager,
+    ExecutorPolicy,
+)
+from core.idempotency import (
+    IdempotencyMiddleware,
+    MemoryIdempotencyStore,
+    SQLiteIdempotencyStore,
+)
+from core.memory import SessionTracker, SessionTrackingMiddleware
+from core.metrics import MetricsMiddleware, MetricsRegistry
+from core.readiness import (
+    DEFAULT_MAX_LOOP_LAG,
+    DEFAULT_READINESS_INTERVAL,
+    ReadinessCheck,
+    ReadinessMonitor,
+)
+from core.response_mode import (
+    ResponseModeMiddleware,
+    StructuredContentMiddleware,
+)
+from core.tracing import (
+    RequestTracingMiddleware,
+    ToolTracingMiddleware,
+    Tracing,
+)
+from core.warmup import ToolWarmer, WarmupCall
+from core.registry import (
+    ListingCacheMiddleware,
+    ServiceRegistrar,
+    ToolEntry,
+    ToolRegistry,
+    TOOL,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class Domain(Enum):
@@ -20,10 +80,27 @@ class Domain(Enum):
 class MCPToolBase(ABC):
     """Base class for MCP tool services."""
 
+    # How synchronous tools of this service run (see core.executors)
+    executor_policy: ExecutorPolicy = ExecutorPolicy.INLINE
+
+    # Concurrent calls and queued calls allowed for the whole domain
+    # (None uses the factory defaults, see core.bulkhead)
+    max_concurrency: Optional[int] = None
+    max_queue: Optional[int] = None
+
+    # Side-effect-free calls run during warm-up (see core.warmup)
+    warmup_calls: Tuple[WarmupCall, ...] = ()
+
     def __init__(self, domain: Domain):
         self.domain = domain
         self.tools = []
 
+    def readiness_checks(
+        self, factory: "MCPToolFactory"
+    ) -> Dict[str, ReadinessCheck]:
+        """Return named checks that must pass before the server is ready."""
+        return {}
+
     @abstractmethod
     def register_tools(self, mcp: FastMCP) -> None:
         """Register tools with the MCP server."""
@@ -36,43 +113,376 @@ class MCPToolBase(ABC):
         pass
 
 
+@dataclass(frozen=True)
+class ServiceDescriptor:
+    """
+    Lightweight description of a service that is imported on first use.
+
+    The manifest (tool names, resource URIs and prompt names) lets the
+    factory answer summaries and route requests without importing the
+    service module until one of its components is listed or called.
+    """
+
+    domain: Domain
+    module: str
+    class_name: str
+    tools: Tuple[str, ...] = ()
+    resources: Tuple[str, ...] = ()
+    prompts: Tuple[str, ...] = ()
+
+    @property
+    def tool_count(self) -> int:
+        """Return the number of tools declared in the manifest."""
+        return len(self.tools)
+
+    def provides_resource(self, uri: str) -> bool:
+        """Check whether a resource URI matches one of the manifest entries."""
+        return any(
+            uri == resource or match_uri_template(uri, resource) is not None
+            for resource in self.resources
+        )
+
+    def load(self) -> MCPToolBase:
+        """Import the service module and build the service instance."""
+        module = importlib.import_module(self.module)
+        service_class = getattr(module, self.class_name)
+        return service_class()
+
+
+class LazyServiceMiddleware(Middleware):
+    """Load deferred services right before their components are needed."""
+
+    def __init__(self, factory: "MCPToolFactory"):
+        self.factory = factory
+
+    async def on_call_tool(self, context, call_next):
+        self.factory.load_services_for(tool=context.message.name)
+        return await call_next(context)
+
+    async def on_read_resource(self, context, call_next):
+        self.factory.load_services_for(resource=str(context.message.uri))
+        return await call_next(context)
+
+    async def on_get_prompt(self, context, call_next):
+        self.factory.load_services_for(prompt=context.message.name)
+        return await call_next(context)
+
+    async def on_list_tools(self, context, call_next):
+        self.factory.load_all_services()
+        return await call_next(context)
+
+    async def on_list_resources(self, context, call_next):
+        self.factory.load_all_services()
+        return await call_next(context)
+
+    async def on_list_resource_templates(self, context, call_next):
+        self.factory.load_all_services()
+        return await call_next(context)
+
+    async def on_list_prompts(self, context, call_next):
+        self.factory.load_all_services()
+        return await call_next(context)
+
+
 class MCPToolFactory:
     """Factory for creating and managing MCP tools."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache_domain_memory_limit: int = DEFAULT_DOMAIN_MEMORY_LIMIT,
+        shared_executor_workers: int = DEFAULT_SHARED_WORKERS,
+        domain_executor_workers: int = DEFAULT_DOMAIN_WORKERS,
+        process_workers: int = DEFAULT_PROCESS_WORKERS,
+        process_timeout: float = DEFAULT_PROCESS_TIMEOUT,
+        domain_max_concurrency: int = DEFAULT_DOMAIN_CONCURRENCY,
+        domain_max_queue: int = DEFAULT_DOMAIN_QUEUE,
+        idempotency_db_path: Optional[str] = None,
+        default_response_mode: str = "full",
+        readiness_interval: float = DEFAULT_READINESS_INTERVAL,
+        readiness_max_loop_lag: float = DEFAULT_MAX_LOOP_LAG,
+    ):
         self._services: Dict[Domain, MCPToolBase] = {}
+        self._descriptors: Dict[Domain, ServiceDescriptor] = {}
         self._mcp_server: Optional[FastMCP] = None
+        self.registry = ToolRegistry()
+        self.result_cache = ResultCache(
+            domain_memory_limit=cache_domain_memory_limit
+        )
+        self.executors = ExecutorManager(
+            shared_workers=shared_executor_workers,
+            domain_workers=domain_executor_workers,
+            process_workers=process_workers,
+            process_timeout=process_timeout,
+        )
+        self.bulkheads = BulkheadRegistry(
+            default_concurrency=domain_max_concurrency,
+            default_queue=domain_max_queue,
+        )
+        self.idempotency = IdempotencyMiddleware(
+            self.registry,
+            SQLiteIdempotencyStore(idempotency_db_path)
+            if idempotency_db_path
+            else MemoryIdempotencyStore(),
+        )
+        self.response_modes = ResponseModeMiddleware(default_response_mode)
+        self.listings = ListingCacheMiddleware(self.registry)
+        self.warmer = ToolWarmer()
+        self.tracing: Optional[Tracing] = None
+        self.sessions = SessionTracker()
+        self.metrics = MetricsRegistry()
+        self.call_metrics = MetricsMiddleware(self.registry, self.metrics)
+        self.bulkheads.register_metrics(self.metrics)
+        self.executors.register_metrics(self.metrics)
+        self.readiness = ReadinessMonitor(
+            interval=readiness_interval,
+            max_loop_lag=readiness_max_loop_lag,
+            collect=self._service_readiness_checks,
+        )
+        self.readiness.add_check(
+            "server", lambda: self._mcp_server is not None, live=True
+        )
+        self.readiness.add_check("warmup", lambda: self.warmer.ready, live=True)
+        self.readiness.add_check(
+            "load_shedding", lambda: not self.bulkheads.shedding(), live=True
+        )
 
     def register_service(self, service: MCPToolBase) -> None:
         """Register a tool service with the factory."""
         self._services[service.domain] = service
+        self._descriptors.pop(service.domain, None)
+
+    def register_descriptor(self, descriptor: ServiceDescriptor) -> None:
+        """Register a service that is imported and built on first use."""
+        self._descriptors[descriptor.domain] = descriptor
+        self._services.pop(descriptor.domain, None)
 
     def create_mcp_server(
-        self, name: str = "BB MCP Server", auth=None
+        self,
+        name: str = "BB MCP Server",
+        auth=None,
+        include_tags: Optional[Set[str]] = None,
+        exclude_tags: Optional[Set[str]] = None,
+        warmup: bool = False,
+        tracing: Optional[Tracing] = None,
     ) -> FastMCP:
-        """Create and configure the MCP server with all registered services."""
-        self._mcp_server = FastMCP(name, auth=auth)
+        """
+        Create and configure the MCP server with all registered services.
+
+        With ``warmup`` the server warms up its tools in the background as
+        it starts, and ``warmer.ready`` turns true once that is done. With
+        ``tracing`` every request and tool execution is traced.
+        """
+        self.warmer = ToolWarmer(enabled=warmup)
+        if warmup:
+            self._mcp_server = FastMCP(
+                name, auth=auth, lifespan=self._warmup_lifespan
+            )
+        else:
+            self._mcp_server = FastMCP(name, auth=auth)
+
+        # Tag filters are resolved against the registry's tag index
+        self.registry.set_tag_filter(include_tags, exclude_tags)
 
         # Register all tools from all services
         for service in self._services.values():
-            service.register_tools(self._mcp_server)
+            self._register_service_tools(service)
+
+        self.tracing = tracing
+        if tracing is not None:
+            # Outermost, so the request span covers every other layer
+            self._mcp_server.add_middleware(
+                RequestTracingMiddleware(self.registry, tracing.tracer)
+            )
+        self._mcp_server.add_middleware(SessionTrackingMiddleware(self.sessions))
+        # Deferred services are loaded by the middleware on first use
+        if self._descriptors:
+            self._mcp_server.add_middleware(LazyServiceMiddleware(self))
+        # Outside every other layer, so cached and rejected calls are counted
+        self._mcp_server.add_middleware(self.call_metrics)
+        self._mcp_server.add_middleware(self.listings)
+        self.listings.install(self._mcp_server)
+        self._mcp_server.add_middleware(self.response_modes)
+        self._mcp_server.add_middleware(
+            ResultCacheMiddleware(self.registry, self.result_cache)
+        )
+        # Duplicate calls are answered before they take a bulkhead slot
+        self._mcp_server.add_middleware(self.idempotency)
+        self._mcp_server.add_middleware(
+            BulkheadMiddleware(self.registry, self.bulkheads)
+        )
+        if tracing is not None:
+            # Inside the bulkheads, so the tool span is execution time only
+            self._mcp_server.add_middleware(
+                ToolTracingMiddleware(self.registry, tracing.tracer)
+            )
+        # Innermost, so cached and replayed results keep their structured content
+        self._mcp_server.add_middleware(StructuredContentMiddleware())
 
         return self._mcp_server
 
+    @contextlib.asynccontextmanager
+    async def _warmup_lifespan(self, server: FastMCP):
+        """Server lifespan that warms up the tools in the background."""
+        task = asyncio.create_task(self.warmer.run(server, self._load_for_warmup))
+        try:
+            yield {}
+        finally:
+            task.cancel()
+
+    def _load_for_warmup(self):
+        self.load_all_services()
+        return list(self._services.values())
+
+    def _service_readiness_checks(self) -> Dict[str, ReadinessCheck]:
+        """Collect the readiness checks of every loaded service."""
+        checks = {}
+        for service in list(self._services.values()):
+            for name, check in service.readiness_checks(self).items():
+                checks[f"{service.domain.value}.{name}"] = check
+        return checks
+
+    def _register_service_tools(self, service: MCPToolBase) -> None:
+        """Register a service's components through the indexing registrar."""
+        if service.max_concurrency or service.max_queue is not None:
+            self.bulkheads.set_domain_limits(
+                service.domain.value, service.max_concurrency, service.max_queue
+            )
+        service.register_tools(
+            ServiceRegistrar(
+                self._mcp_server,
+                self.registry,
+                service.domain,
+                wrap_handler=functools.partial(self._wrap_handler, service),
+            )
+        )
+
+    def _wrap_handler(
+        self, service: MCPToolBase, entry: ToolEntry, fn: Callable
+    ) -> Callable:
+        """Apply the service's execution policy to a registered handler."""
+        policy = ExecutorPolicy(
+            entry.meta.get("executor", service.executor_policy.value)
+        )
+        return self.executors.wrap(fn, policy, service.domain.value)
+
+    def load_service(self, domain: Domain) -> Optional[MCPToolBase]:
+        """Import and register a deferred service, if it is not loaded yet."""
+        if domain in self._services:
+            return self._services[domain]
+
+        descriptor = self._descriptors.pop(domain, None)
+        if descriptor is None:
+            return None
+
+        service = descriptor.load()
+        self._services[domain] = service
+        if self._mcp_server is not None:
+            self._register_service_tools(service)
+
+        logger.info(
+            f"📦 Loaded {descriptor.class_name} for domain {domain.value}"
+        )
+        return service
+
+    def load_services_for(
+        self,
+        tool: Optional[str] = None,
+        resource: Optional[str] = None,
+        prompt: Optional[str] = None,
+    ) -> None:
+        """Load the deferred service that provides a tool, resource or prompt."""
+        for domain, descriptor in list(self._descriptors.items()):
+            if (
+                (tool is not None and tool in descriptor.tools)
+                or (resource is not None and descriptor.provides_resource(resource))
+                or (prompt is not None and prompt in descriptor.prompts)
+            ):
+                self.load_service(domain)
+                return
+
+        # Unknown component: fall back to loading everything so that an
+        # incomplete manifest never hides a component from the client.
+        self.load_all_services()
+
+    def load_all_services(self) -> None:
+        """Load every deferred service."""
+        for domain in list(self._descriptors):
+            self.load_service(domain)
+
+    def get_tool_entry(self, name: str) -> Optional[ToolEntry]:
+        """Look up a registered tool (handler, domain, tags, meta) by name."""
+        return self.registry.get(TOOL, name)
+
+    def find_tools(
+        self,
+        include_tags: Optional[Set[str]] = None,
+        exclude_tags: Optional[Set[str]] = None,
+    ) -> Set[str]:
+        """Return the names of registered tools matching a tag filter."""
+        return set(self.registry.find(TOOL, include_tags, exclude_tags))
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get result cache hit/miss counters and memory use per domain."""
+        return self.result_cache.stats()
+
+    def get_executor_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get queue depth, wait times and crash counters of the tool pools."""
+        return self.executors.stats()
+
+    def get_bulkhead_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get active calls, queue depth and rejections per bulkhead."""
+        return self.bulkheads.stats()
+
+    def get_listing_stats(self) -> Dict[str, int]:
+        """Get hits and misses of the serialized listing cache."""
+        return self.listings.stats()
+
+    def get_idempotency_stats(self) -> Dict[str, Any]:
+        """Get executed, replayed and deduplicated call counts per tool."""
+        return self.idempotency.stats()
+
+    def get_response_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get calls and response bytes per response mode."""
+        return self.response_modes.stats()
+
+    def get_warmup_stats(self) -> Dict[str, Any]:
+        """Get the warm-up status, prepared tools and synthetic call errors."""
+        return self.warmer.stats()
+
+    def get_session_stats(self, estimate: bool = False) -> Dict[str, Any]:
+        """Get live sessions, pending elicitations and per-session memory."""
+        return self.sessions.stats(estimate=estimate, exclude=(self, self._mcp_server))
+
+    async def estimate_session_stats(self) -> Dict[str, Any]:
+        """Get session stats with per-session memory, measured off the event loop."""
+        return await self.sessions.estimate(exclude=(self, self._mcp_server))
+
+    def get_readiness_stats(self) -> Dict[str, Any]:
+        """Get overall readiness and the latest result of every check."""
+        return self.readiness.status()
+
+    def render_metrics(self) -> str:
+        """Get call, bulkhead and pool metrics in the Prometheus text format."""
+        return self.metrics.render()
+
     def get_services_by_domain(self, domain: Domain) -> Optional[MCPToolBase]:
-        """Get service by domain."""
-        return self._services.get(domain)
+        """Get service by domain, loading it if it was deferred."""
+        return self.load_service(domain)
 
     def get_all_services(self) -> Dict[Domain, MCPToolBase]:
-        """Get all registered services."""
+        """Get all services that have been built so far."""
         return self._services.copy()
 
     def get_tool_summary(self) -> Dict[str, Any]:
         """Get a summary of all tools and services."""
         summary = {
-            "total_services": len(self._services),
+            "total_services": len(self._services) + len(self._descriptors),
             "total_tools": sum(
                 service.tool_count for service in self._services.values()
+            )
+            + sum(
+                descriptor.tool_count
+                for descriptor in self._descriptors.values()
             ),
             "services": {},
         }
@@ -81,6 +491,14 @@ class MCPToolFactory:
             summary["services"][domain.value] = {
                 "tool_count": service.tool_count,
                 "class_name": service.__class__.__name__,
+                "loaded": True,
+            }
+
+        for domain, descriptor in self._descriptors.items():
+            summary["services"][domain.value] = {
+                "tool_count": descriptor.tool_count,
+                "class_name": descriptor.class_name,
+                "loaded": False,
             }
 
         return summary
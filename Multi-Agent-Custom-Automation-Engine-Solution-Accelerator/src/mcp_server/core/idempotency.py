@@ -0,0 +1,287 @@
+"""
+Idempotency keys for side-effecting MCP tools.
+
+A tool opts in through its ``meta`` dict::
+
+    @mcp.tool(meta={"idempotency": {"key_args": ["employee_name"], "ttl": 3600}})
+
+The first successful result for a key is stored for ``ttl`` seconds and
+returned for every later call with the same key arguments, and identical
+calls that arrive while the first one is still running wait for it instead
+of executing again. Keys also hold the response mode and the authenticated
+caller, so a result is only replayed in the form and to the caller it was
+produced for. Errors, raised or rendered with ``format_error_response``,
+are never stored. If the first call is cancelled, one of the calls waiting
+for it runs the tool instead.
+
+Results are kept in memory by default; a SQLite store shares them between
+worker processes and survives restarts. Its queries run in a thread so a
+busy database does not stall the event loop.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastmcp.server.dependencies import get_access_token
+from fastmcp.server.middleware import Middleware
+from fastmcp.tools.tool import ToolResult
+from mcp.types import ContentBlock
+from pydantic import TypeAdapter
+
+from core.registry import TOOL, ToolRegistry
+from utils.formatters import current_response_mode, current_response_state
+
+DEFAULT_TTL = 24 * 60 * 60.0
+DEFAULT_MAX_ENTRIES = 10_000
+
+_content_adapter = TypeAdapter(List[ContentBlock])
+
+
+@dataclass(frozen=True)
+class IdempotencyPolicy:
+    """Idempotency options declared by a tool."""
+
+    key_args: Tuple[str, ...]
+    ttl: float = DEFAULT_TTL
+
+    @classmethod
+    def from_meta(cls, meta: Dict[str, Any]) -> Optional["IdempotencyPolicy"]:
+        """Build a policy from a tool's ``meta`` dict, if it opts in."""
+        options = meta.get("idempotency")
+        if not options:
+            return None
+        return cls(
+            key_args=tuple(options["key_args"]),
+            ttl=float(options.get("ttl", DEFAULT_TTL)),
+        )
+
+    def make_key(
+        self,
+        tool: str,
+        arguments: Optional[Dict[str, Any]],
+        mode: str = "",
+        principal: str = "",
+    ) -> str:
+        """Build the idempotency key for a call by ``principal`` in ``mode``."""
+        arguments = arguments or {}
+        values = {name: arguments.get(name) for name in self.key_args}
+        scope = json.dumps([principal, mode])
+        return f"{tool}:{scope}:{json.dumps(values, sort_keys=True, default=str)}"
+
+
+def current_principal() -> str:
+    """Subject of the authenticated caller, or ``""`` without auth."""
+    try:
+        token = get_access_token()
+    except (RuntimeError, TypeError):
+        return ""
+    if token is None:
+        return ""
+    return str((token.claims or {}).get("sub") or token.client_id)
+
+
+class _LeaderCancelled(Exception):
+    """The call the others were waiting for was cancelled."""
+
+
+@dataclass
+class IdempotencyStats:
+    """Counters for one idempotent tool."""
+
+    executed: int = 0
+    replayed: int = 0
+    joined: int = 0
+
+
+def serialize_result(result: ToolResult) -> str:
+    """Encode a tool result as JSON."""
+    return json.dumps(
+        {
+            "content": _content_adapter.dump_python(
+                result.content, mode="json", by_alias=True, exclude_none=True
+            ),
+            "structured_content": result.structured_content,
+        }
+    )
+
+
+def deserialize_result(payload: str) -> ToolResult:
+    """Decode a tool result stored by ``serialize_result``."""
+    data = json.loads(payload)
+    return ToolResult(
+        content=_content_adapter.validate_python(data["content"]),
+        structured_content=data["structured_content"],
+    )
+
+
+class MemoryIdempotencyStore:
+    """Results kept in process memory, oldest dropped beyond ``max_entries``."""
+
+    blocking = False
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, ToolResult]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[ToolResult]:
+        """Return the stored result for a key, if it has not expired."""
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        if item[0] <= self._clock():
+            del self._entries[key]
+            return None
+        return item[1]
+
+    def put(self, key: str, result: ToolResult, ttl: float) -> None:
+        """Store a result for ``ttl`` seconds."""
+        self._entries.pop(key, None)
+        self._entries[key] = (self._clock() + ttl, result)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteIdempotencyStore:
+    """Results kept in a SQLite database shared by every worker process."""
+
+    # get and put do I/O; the middleware runs them in a thread
+    blocking = True
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS idempotency ("
+            "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, result TEXT NOT NULL)"
+        )
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[ToolResult]:
+        """Return the stored result for a key, if it has not expired."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result FROM idempotency WHERE key = ? AND expires_at > ?",
+                (key, self._clock()),
+            ).fetchone()
+        return deserialize_result(row[0]) if row else None
+
+    def put(self, key: str, result: ToolResult, ttl: float) -> None:
+        """Store a result for ``ttl`` seconds and drop expired rows."""
+        now = self._clock()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO idempotency VALUES (?, ?, ?)",
+                (key, now + ttl, serialize_result(result)),
+            )
+            self._db.execute("DELETE FROM idempotency WHERE expires_at <= ?", (now,))
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM idempotency").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+
+class IdempotencyMiddleware(Middleware):
+    """Replay stored results and share in-flight executions of idempotent tools."""
+
+    def __init__(self, registry: ToolRegistry, store):
+        self.registry = registry
+        self.store = store
+        self._in_flight: Dict[str, "asyncio.Future[ToolResult]"] = {}
+        self._stats: Dict[str, IdempotencyStats] = {}
+
+    async def _get(self, key: str) -> Optional[ToolResult]:
+        if self.store.blocking:
+            return await asyncio.to_thread(self.store.get, key)
+        return self.store.get(key)
+
+    async def _put(self, key: str, result: ToolResult, ttl: float) -> None:
+        if self.store.blocking:
+            await asyncio.to_thread(self.store.put, key, result, ttl)
+        else:
+            self.store.put(key, result, ttl)
+
+    async def on_call_tool(self, context, call_next):
+        entry = self.registry.get(TOOL, context.message.name)
+        policy = IdempotencyPolicy.from_meta(entry.meta) if entry else None
+        if policy is None:
+            return await call_next(context)
+
+        stats = self._stats.setdefault(entry.name, IdempotencyStats())
+        key = policy.make_key(
+            entry.name,
+            context.message.arguments,
+            mode=current_response_mode().value,
+            principal=current_principal(),
+        )
+
+        while True:
+            stored = await self._get(key)
+            if stored is not None:
+                stats.replayed += 1
+                return stored
+
+            pending = self._in_flight.get(key)
+            if pending is None:
+                break
+            try:
+                result = await asyncio.shield(pending)
+            except _LeaderCancelled:
+                # Nobody cancelled this call; look again and maybe run it
+                continue
+            stats.joined += 1
+            return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await call_next(context)
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody joined the call
+            future.exception()
+            raise
+        else:
+            stats.executed += 1
+            future.set_result(result)
+            state = current_response_state()
+            if state is None or not state.error:
+                await self._put(key, result, policy.ttl)
+            return result
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-tool counters and the number of stored results."""
+        return {
+            "tools": {name: asdict(stats) for name, stats in self._stats.items()},
+            "stored": len(self.store),
+            "in_flight": len(self._in_flight),
+        }
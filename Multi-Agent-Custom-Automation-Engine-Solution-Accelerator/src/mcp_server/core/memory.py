@@ -0,0 +1,280 @@
+"""
+Memory diagnostics for long-running servers.
+
+``MemoryProfiler`` takes ``tracemalloc`` snapshots and diffs each one
+against the previous, reporting the allocation sites that grew the most.
+Tracing only starts with the first snapshot, so it costs nothing until
+someone asks.
+
+``SessionTracker`` follows live client sessions through
+``SessionTrackingMiddleware``. Sessions are held weakly, so a session
+disappears from the report once the transport drops it. Tools that wait on
+the client wrap ``ctx.elicit`` in ``pending_elicitation()`` so abandoned
+elicitations show up as pending counts. ``estimate_size`` gives a rough
+per-session figure: the bytes reachable from the session object that no
+module or other session also holds.
+"""
+
+import asyncio
+import contextlib
+import gc
+import sys
+import time
+import tracemalloc
+import weakref
+from collections import Counter
+from contextvars import ContextVar
+from types import BuiltinFunctionType, CodeType, FunctionType, ModuleType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastmcp.server.middleware import Middleware
+
+DEFAULT_TRACE_FRAMES = 10
+DEFAULT_TOP_SITES = 20
+DEFAULT_MAX_OBJECTS = 50_000
+
+# Objects shared by the whole process, never attributed to one session
+_SHARED_TYPES = (ModuleType, type, FunctionType, BuiltinFunctionType, CodeType)
+
+_current_session: ContextVar[Optional[Tuple["SessionTracker", str]]] = ContextVar(
+    "mcp_current_session", default=None
+)
+
+
+def estimate_size(
+    root: Any,
+    exclude: Iterable[Any] = (),
+    max_objects: int = DEFAULT_MAX_OBJECTS,
+) -> int:
+    """
+    Approximate bytes reachable from ``root``.
+
+    The walk stops at modules, classes, functions, module globals and the
+    ``exclude`` objects, and after ``max_objects`` objects, so the result is
+    an estimate of what ``root`` keeps alive rather than an exact figure.
+    """
+    stop = {id(vars(module)) for module in list(sys.modules.values()) if module}
+    stop.update(id(obj) for obj in exclude)
+    seen = set()
+    stack = [root]
+    total = 0
+    while stack and len(seen) < max_objects:
+        obj = stack.pop()
+        key = id(obj)
+        if key in seen or key in stop or isinstance(obj, _SHARED_TYPES):
+            continue
+        seen.add(key)
+        total += sys.getsizeof(obj, 0)
+        stack.extend(gc.get_referents(obj))
+    return total
+
+
+def _site(frame) -> str:
+    return f"{frame.filename}:{frame.lineno}"
+
+
+class MemoryProfiler:
+    """Takes tracemalloc snapshots and diffs them."""
+
+    def __init__(self, frames: int = DEFAULT_TRACE_FRAMES):
+        self.frames = frames
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._taken_at: Optional[float] = None
+        self._started_tracing = False
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def _take(self) -> tracemalloc.Snapshot:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<unknown>"),
+            )
+        )
+        self._snapshot, self._taken_at = snapshot, time.monotonic()
+        return snapshot
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Start tracing if needed and take the baseline snapshot."""
+        self._take()
+        return self.stats()
+
+    def diff(
+        self, top: int = DEFAULT_TOP_SITES, group_by: str = "lineno"
+    ) -> List[Dict[str, Any]]:
+        """
+        Take a snapshot and return the sites that grew most since the last.
+
+        The new snapshot becomes the baseline of the next diff.
+        """
+        if self._snapshot is None:
+            raise ValueError("Take a snapshot before asking for a diff")
+        previous = self._snapshot
+        differences = self._take().compare_to(previous, group_by)
+        return [
+            {
+                "site": _site(difference.traceback[0]),
+                "size_diff": difference.size_diff,
+                "size": difference.size,
+                "count_diff": difference.count_diff,
+                "count": difference.count,
+                "traceback": [_site(frame) for frame in difference.traceback],
+            }
+            for difference in differences[:top]
+        ]
+
+    def stop(self) -> None:
+        """Drop the snapshot and stop tracing if this profiler started it."""
+        self._snapshot = self._taken_at = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Return whether tracing is on, traced bytes and the snapshot age."""
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "tracing": self.tracing,
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "snapshot_age": (
+                time.monotonic() - self._taken_at
+                if self._taken_at is not None
+                else None
+            ),
+        }
+
+
+class SessionTracker:
+    """Live client sessions and the elicitations they have not answered."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._sessions: "weakref.WeakValueDictionary[str, Any]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._last_seen: Dict[str, float] = {}
+        self._pending: Counter = Counter()
+
+    def touch(self, session_id: str, session: Any) -> None:
+        """Record activity of a session."""
+        if session_id not in self._sessions:
+            self._sessions[session_id] = session
+            weakref.finalize(session, self._forget, session_id)
+        self._last_seen[session_id] = self._clock()
+
+    def _forget(self, session_id: str) -> None:
+        self._last_seen.pop(session_id, None)
+        self._pending.pop(session_id, None)
+
+    @property
+    def live_sessions(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def pending_elicitations(self) -> int:
+        return sum(self._pending.values())
+
+    def begin_elicitation(self, session_id: str) -> None:
+        """Count an elicitation the session has not answered yet."""
+        self._pending[session_id] += 1
+
+    def end_elicitation(self, session_id: str) -> None:
+        """Stop counting an elicitation once it is answered or abandoned."""
+        self._pending[session_id] -= 1
+        if self._pending[session_id] <= 0:
+            del self._pending[session_id]
+
+    def _counts(self, sessions: Dict[str, Any]) -> Dict[str, Any]:
+        now = self._clock()
+        return {
+            "live_sessions": len(sessions),
+            "pending_elicitations": self.pending_elicitations,
+            "sessions": {
+                session_id: {
+                    "pending_elicitations": self._pending.get(session_id, 0),
+                    "idle_seconds": now - self._last_seen.get(session_id, now),
+                }
+                for session_id in sessions
+            },
+        }
+
+    @staticmethod
+    def _add_sizes(
+        stats: Dict[str, Any], sessions: Dict[str, Any], exclude: List[Any]
+    ) -> None:
+        for session_id, session in sessions.items():
+            others = [other for other in sessions.values() if other is not session]
+            stats["sessions"][session_id]["estimated_bytes"] = estimate_size(
+                session, exclude=exclude + others
+            )
+
+    def stats(self, estimate: bool = False, exclude: Iterable[Any] = ()) -> Dict[str, Any]:
+        """
+        Return session and pending elicitation counts, per session too.
+
+        With ``estimate`` each session also gets ``estimated_bytes``; objects
+        in ``exclude`` (the server, the factory) are never counted.
+        """
+        sessions = dict(self._sessions.items())
+        stats = self._counts(sessions)
+        if estimate:
+            self._add_sizes(stats, sessions, list(exclude))
+        return stats
+
+    async def estimate(self, exclude: Iterable[Any] = ()) -> Dict[str, Any]:
+        """
+        ``stats(estimate=True)`` with the size walk in a worker thread.
+
+        The walk visits every session against every other one, so it runs
+        off the event loop; the counts are read on the loop first.
+        """
+        sessions = dict(self._sessions.items())
+        stats = self._counts(sessions)
+        await asyncio.to_thread(self._add_sizes, stats, sessions, list(exclude))
+        return stats
+
+
+@contextlib.contextmanager
+def pending_elicitation():
+    """Count an elicitation as pending for the current session while it waits."""
+    current = _current_session.get()
+    if current is None:
+        yield
+        return
+    tracker, session_id = current
+    tracker.begin_elicitation(session_id)
+    try:
+        yield
+    finally:
+        tracker.end_elicitation(session_id)
+
+
+class SessionTrackingMiddleware(Middleware):
+    """Register the session of every request with a ``SessionTracker``."""
+
+    def __init__(self, tracker: SessionTracker):
+        self.tracker = tracker
+
+    async def on_request(self, context, call_next):
+        fastmcp_context = context.fastmcp_context
+        if fastmcp_context is None:
+            return await call_next(context)
+        try:
+            session_id = fastmcp_context.session_id
+            session = fastmcp_context.session
+        except (LookupError, RuntimeError, ValueError):
+            return await call_next(context)
+
+        self.tracker.touch(session_id, session)
+        token = _current_session.set((self.tracker, session_id))
+        try:
+            return await call_next(context)
+        finally:
+            _current_session.reset(token)
@@ -0,0 +1,311 @@
+"""
+Prometheus metrics for MCP tools, resources and prompts.
+
+``MetricsMiddleware`` records, for every call and labelled by component
+kind, name and domain: call and error counts, a latency histogram, the
+number of calls in flight, and request and response sizes. The metrics
+live in a ``MetricsRegistry`` that renders the Prometheus text format
+(version 0.0.4) for the ``/metrics`` route, without a client library.
+Components with counters of their own add ``Observed`` metrics that are
+read at render time.
+"""
+
+import json
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import pydantic_core
+from fastmcp.server.middleware import Middleware
+from fastmcp.tools.tool import ToolResult
+
+from core.registry import PROMPT, RESOURCE, TOOL, ToolRegistry
+from core.response_mode import result_size
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+UNKNOWN = "unknown"
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+
+    def _label_text(self, values: LabelValues, extra: str = "") -> str:
+        pairs = [f'{k}="{_escape(v)}"' for k, v in zip(self.labels, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} {self.kind}",
+            *self._samples(),
+        ]
+
+
+class Counter(_Metric):
+    """A monotonically increasing count per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *values: str, amount: float = 1) -> None:
+        self._values[values] = self._values.get(values, 0) + amount
+
+    def get(self, *values: str) -> float:
+        return self._values.get(values, 0)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{self._label_text(values)} {_format_value(value)}"
+            for values, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(Counter):
+    """A value per label set that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, *values: str, amount: float = 1) -> None:
+        self.inc(*values, amount=-amount)
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: per-bucket counts (last one is +Inf), sum, count
+        self._series: Dict[LabelValues, List[Any]] = {}
+
+    def observe(self, value: float, *values: str) -> None:
+        series = self._series.get(values)
+        if series is None:
+            series = self._series[values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def count(self, *values: str) -> int:
+        series = self._series.get(values)
+        return series[2] if series else 0
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for values, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{self._label_text(values, le)} {cumulative}"
+                )
+            labels = self._label_text(values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Observed(_Metric):
+    """
+    A gauge or counter read from its source when the metrics are rendered.
+
+    For components that already keep their own counters, such as bulkheads
+    and executor pools: ``read`` returns the current value per label set.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str],
+        kind: str,
+        read: Callable[[], Dict[LabelValues, float]],
+    ):
+        super().__init__(name, help_text, labels)
+        if kind not in (Counter.kind, Gauge.kind):
+            raise ValueError(f"Cannot observe a {kind}")
+        self.kind = kind
+        self.read = read
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{self._label_text(values)} {_format_value(value)}"
+            for values, value in sorted(self.read().items())
+        ]
+
+
+class MetricsRegistry:
+    """Holds metrics and renders them in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _add(self, metric: _Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help_text, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._add(Histogram(name, help_text, labels, buckets))
+
+    def observed(
+        self,
+        kind: str,
+        name: str,
+        help_text: str,
+        labels: Sequence[str],
+        read: Callable[[], Dict[LabelValues, float]],
+    ) -> Observed:
+        return self._add(Observed(name, help_text, labels, kind, read))
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def payload_size(result: Any) -> int:
+    """Approximate size in bytes of a tool, resource or prompt result."""
+    if isinstance(result, ToolResult):
+        return result_size(result)
+    if isinstance(result, (list, tuple)):
+        return sum(payload_size(item) for item in result)
+    content = getattr(result, "content", None)
+    if isinstance(content, bytes):
+        return len(content)
+    if isinstance(content, str):
+        return len(content.encode("utf-8"))
+    return len(pydantic_core.to_json(result, fallback=str))
+
+
+class MetricsMiddleware(Middleware):
+    """Record calls, errors, latency, concurrency and sizes per component."""
+
+    LABELS = ("kind", "name", "domain")
+
+    def __init__(self, registry: ToolRegistry, metrics: MetricsRegistry):
+        self.registry = registry
+        self.calls = metrics.counter(
+            "mcp_calls_total", "Calls by component.", self.LABELS
+        )
+        self.errors = metrics.counter(
+            "mcp_errors_total", "Calls that raised an error.", self.LABELS
+        )
+        self.latency = metrics.histogram(
+            "mcp_call_duration_seconds", "Call latency in seconds.", self.LABELS
+        )
+        self.in_flight = metrics.gauge(
+            "mcp_calls_in_flight", "Calls currently running.", ("kind", "domain")
+        )
+        self.request_size = metrics.histogram(
+            "mcp_request_size_bytes",
+            "Size of call arguments in bytes.",
+            self.LABELS,
+            SIZE_BUCKETS,
+        )
+        self.response_size = metrics.histogram(
+            "mcp_response_size_bytes",
+            "Size of call results in bytes.",
+            self.LABELS,
+            SIZE_BUCKETS,
+        )
+
+    def _labels(self, kind: str, key: str) -> LabelValues:
+        # Only registered names become labels, to bound label cardinality
+        if kind == RESOURCE:
+            entry = self.registry.resolve_resource(key)
+        else:
+            entry = self.registry.get(kind, key)
+        if entry is None:
+            return kind, UNKNOWN, UNKNOWN
+        return kind, entry.name, entry.domain.value
+
+    async def _measure(self, kind: str, key: str, arguments, context, call_next):
+        labels = self._labels(kind, key)
+        if arguments:
+            self.request_size.observe(
+                len(json.dumps(arguments, default=str).encode("utf-8")), *labels
+            )
+        self.calls.inc(*labels)
+        self.in_flight.inc(kind, labels[2])
+        started = time.perf_counter()
+        try:
+            result = await call_next(context)
+        except Exception:
+            self.errors.inc(*labels)
+            raise
+        finally:
+            self.latency.observe(time.perf_counter() - started, *labels)
+            self.in_flight.dec(kind, labels[2])
+        self.response_size.observe(payload_size(result), *labels)
+        return result
+
+    async def on_call_tool(self, context, call_next):
+        message = context.message
+        return await self._measure(
+            TOOL, message.name, message.arguments, context, call_next
+        )
+
+    async def on_read_resource(self, context, call_next):
+        uri = str(context.message.uri)
+        return await self._measure(RESOURCE, uri, None, context, call_next)
+
+    async def on_get_prompt(self, context, call_next):
+        message = context.message
+        return await self._measure(
+            PROMPT, message.name, message.arguments, context, call_next
+        )
@@ -0,0 +1,153 @@
+"""
+Dependency-graph runner for multi-step tools.
+
+A pipeline is a list of ``Step`` objects. Each step starts as soon as every
+step it depends on has completed, so independent steps run concurrently and
+the pipeline takes as long as its critical path. Steps whose dependencies
+failed are skipped. ``tool_step`` builds a step that calls another tool of
+the server through an in-memory ``fastmcp.Client``, so the tool's own
+policies apply to it::
+
+    async with Client(ctx.fastmcp) as client:
+        results = await run_pipeline([tool_step(client, "greet", {...}), ...])
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+from utils.formatters import parse_error_response
+
+COMPLETED = "completed"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+@dataclass(frozen=True)
+class Step:
+    """One unit of work in a pipeline."""
+
+    name: str
+    run: Callable[[], Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+
+
+@dataclass
+class StepResult:
+    """Outcome and timing of a step (times in seconds from pipeline start)."""
+
+    name: str
+    status: str
+    result: Any = None
+    error: Optional[str] = None
+    started: float = 0.0
+    duration: float = 0.0
+
+
+def tool_step(
+    client: Client,
+    name: str,
+    arguments: Dict[str, Any],
+    depends_on: Tuple[str, ...] = (),
+) -> Step:
+    """
+    A step that calls tool ``name`` through ``client``.
+
+    ``client`` is a ``fastmcp.Client`` connected to the server itself, so the
+    call goes through the server's middleware and the tool's idempotency,
+    cache and bulkhead policies apply. The step's result is the tool's text
+    output. A tool error, or a response rendered by
+    ``format_error_response``, fails the step.
+    """
+
+    async def run() -> str:
+        result = await client.call_tool(name, arguments, raise_on_error=False)
+        text = "".join(getattr(block, "text", "") for block in result.content)
+        if result.is_error:
+            raise ToolError(text)
+        message = parse_error_response(text)
+        if message is not None:
+            raise ToolError(message)
+        return text
+
+    return Step(name, run, tuple(depends_on))
+
+
+def topological_order(steps: Iterable[Step]) -> List[Step]:
+    """Order steps so every step comes after its dependencies."""
+    by_name = {step.name: step for step in steps}
+    ordered: List[Step] = []
+    state: Dict[str, str] = {}
+
+    def visit(step: Step, path: Tuple[str, ...]) -> None:
+        if state.get(step.name) == "done":
+            return
+        if state.get(step.name) == "visiting":
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + (step.name,))}")
+        state[step.name] = "visiting"
+        for dependency in step.depends_on:
+            if dependency not in by_name:
+                raise ValueError(f"{step.name} depends on unknown step {dependency}")
+            visit(by_name[dependency], path + (step.name,))
+        state[step.name] = "done"
+        ordered.append(step)
+
+    for step in by_name.values():
+        visit(step, ())
+    return ordered
+
+
+async def run_pipeline(
+    steps: Iterable[Step],
+    on_step_done: Optional[Callable[[StepResult], Awaitable[None]]] = None,
+    clock: Callable[[], float] = time.perf_counter,
+) -> Dict[str, StepResult]:
+    """
+    Run the steps as a dependency graph.
+
+    Args:
+        steps: Steps to run; dependencies must name other steps in the list
+        on_step_done: Optional callback awaited after each step finishes
+        clock: Monotonic time source for step timings
+
+    Returns:
+        Results keyed by step name, in dependency order
+    """
+    ordered = topological_order(steps)
+    origin = clock()
+    tasks: Dict[str, "asyncio.Task[StepResult]"] = {}
+
+    async def execute(step: Step) -> StepResult:
+        dependencies = await asyncio.gather(*(tasks[d] for d in step.depends_on))
+        blocked = [d.name for d in dependencies if d.status != COMPLETED]
+        started = clock()
+
+        if blocked:
+            outcome = StepResult(
+                step.name, SKIPPED, error=f"Blocked by {', '.join(blocked)}"
+            )
+        else:
+            try:
+                outcome = StepResult(step.name, COMPLETED, result=await step.run())
+            except Exception as e:
+                outcome = StepResult(step.name, FAILED, error=str(e))
+
+        outcome.started = started - origin
+        outcome.duration = clock() - started
+        if on_step_done is not None:
+            await on_step_done(outcome)
+        return outcome
+
+    for step in ordered:
+        tasks[step.name] = asyncio.create_task(execute(step))
+
+    try:
+        await asyncio.gather(*tasks.values())
+    finally:
+        for task in tasks.values():
+            task.cancel()
+    return {name: task.result() for name, task in tasks.items()}
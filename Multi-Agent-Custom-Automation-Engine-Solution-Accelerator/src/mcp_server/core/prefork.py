@@ -0,0 +1,192 @@
+"""
+Prefork multi-worker mode for the HTTP transports.
+
+The supervisor forks ``N`` workers. Each worker binds its own listening
+socket on the same address with ``SO_REUSEPORT`` so the kernel balances
+incoming connections between them, and serves the FastMCP ASGI app with
+uvicorn. Workers that exit are restarted with an exponential backoff when
+they keep crashing right after start-up. On shutdown each worker gives its
+in-flight requests ``graceful_shutdown`` seconds to finish, and the
+supervisor waits for that before killing it.
+"""
+
+import logging
+import multiprocessing
+import signal
+import socket
+import threading
+import time
+from multiprocessing.connection import wait
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+MIN_HEALTHY_UPTIME = 5.0
+MAX_RESTART_BACKOFF = 30.0
+SHUTDOWN_TIMEOUT = 10.0
+DEFAULT_GRACEFUL_SHUTDOWN = 5.0
+
+
+def create_listening_socket(
+    host: str, port: int, backlog: int = 2048
+) -> socket.socket:
+    """Bind a TCP listening socket that other workers can share via SO_REUSEPORT."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def serve_worker(
+    app_factory: Callable[[], Callable],
+    host: str,
+    port: int,
+    log_level: str = "info",
+    graceful_shutdown: float = DEFAULT_GRACEFUL_SHUTDOWN,
+) -> None:
+    """Worker entry point: bind a shared socket and serve the ASGI app."""
+    import uvicorn
+
+    sock = create_listening_socket(host, port)
+    config = uvicorn.Config(
+        app_factory(),
+        lifespan="on",
+        log_level=log_level,
+        timeout_graceful_shutdown=graceful_shutdown,
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class PreforkSupervisor:
+    """Fork, supervise and restart worker processes."""
+
+    def __init__(
+        self,
+        target: Callable[[], None],
+        workers: int,
+        min_healthy_uptime: float = MIN_HEALTHY_UPTIME,
+        max_backoff: float = MAX_RESTART_BACKOFF,
+        shutdown_timeout: float = SHUTDOWN_TIMEOUT,
+    ):
+        self.target = target
+        self.workers = workers
+        self.min_healthy_uptime = min_healthy_uptime
+        self.max_backoff = max_backoff
+        self.shutdown_timeout = shutdown_timeout
+        self.restarts = 0
+        self._context = multiprocessing.get_context("fork")
+        self._processes: Dict[int, multiprocessing.Process] = {}
+        self._started_at: Dict[int, float] = {}
+        self._backoff: Dict[int, float] = {}
+        self._restart_at: Dict[int, float] = {}
+        self._stopping = threading.Event()
+
+    def _spawn(self, slot: int) -> None:
+        process = self._context.Process(
+            target=self.target, name=f"mcp-worker-{slot}", daemon=False
+        )
+        process.start()
+        self._processes[slot] = process
+        self._started_at[slot] = time.monotonic()
+        logger.info(f"👷 Worker {slot} started (pid {process.pid})")
+
+    def _handle_exit(self, slot: int) -> None:
+        process = self._processes.pop(slot)
+        process.join()
+        uptime = time.monotonic() - self._started_at[slot]
+        logger.warning(
+            f"⚠️  Worker {slot} (pid {process.pid}) exited with code "
+            f"{process.exitcode} after {uptime:.1f}s"
+        )
+
+        # Back off when a worker keeps dying right after start-up
+        if uptime < self.min_healthy_uptime:
+            delay = min(self._backoff.get(slot, 0.25) * 2, self.max_backoff)
+            self._backoff[slot] = delay
+        else:
+            delay = 0.0
+            self._backoff.pop(slot, None)
+        self._restart_at[slot] = time.monotonic() + delay
+
+    def _restart_due_workers(self) -> None:
+        now = time.monotonic()
+        for slot, due in list(self._restart_at.items()):
+            if due <= now:
+                del self._restart_at[slot]
+                self.restarts += 1
+                self._spawn(slot)
+
+    def stop(self, *_args) -> None:
+        """Ask the supervisor to stop; safe to call from a signal handler."""
+        self._stopping.set()
+
+    def alive_workers(self) -> int:
+        """Number of worker processes currently running."""
+        return sum(process.is_alive() for process in self._processes.values())
+
+    def run(self, install_signal_handlers: bool = True) -> None:
+        """Start the workers and supervise them until ``stop`` is called."""
+        if install_signal_handlers:
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+
+        for slot in range(self.workers):
+            self._spawn(slot)
+
+        try:
+            while not self._stopping.is_set():
+                self._restart_due_workers()
+                sentinels = {
+                    process.sentinel: slot
+                    for slot, process in self._processes.items()
+                }
+                for sentinel in wait(list(sentinels), timeout=0.25):
+                    if self._stopping.is_set():
+                        break
+                    self._handle_exit(sentinels[sentinel])
+        finally:
+            self._shutdown()
+
+    def _shutdown(self) -> None:
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+
+        deadline = time.monotonic() + self.shutdown_timeout
+        for process in self._processes.values():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.kill()
+                process.join()
+        logger.info("🛑 All workers stopped")
+
+
+def run_prefork(
+    app_factory: Callable[[], Callable],
+    host: str,
+    port: int,
+    workers: int,
+    log_level: str = "info",
+    graceful_shutdown: float = DEFAULT_GRACEFUL_SHUTDOWN,
+) -> None:
+    """Serve ``app_factory()`` from ``workers`` forked processes on one port."""
+    # uvicorn passes the grace period to asyncio.wait_for, where 0 cancels
+    # every in-flight request at once
+    if graceful_shutdown <= 0:
+        raise ValueError("The graceful shutdown timeout must be positive")
+    # Fail fast in the supervisor if the address cannot be bound at all
+    create_listening_socket(host, port).close()
+
+    supervisor = PreforkSupervisor(
+        target=lambda: serve_worker(
+            app_factory, host, port, log_level, graceful_shutdown
+        ),
+        workers=workers,
+        # Let the workers use their grace period before they are killed
+        shutdown_timeout=max(SHUTDOWN_TIMEOUT, graceful_shutdown + 1.0),
+    )
+    supervisor.run()
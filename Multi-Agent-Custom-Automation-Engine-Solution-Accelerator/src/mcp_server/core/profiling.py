@@ -0,0 +1,164 @@
+"""
+On-demand CPU profiling of the running server.
+
+``Profiler`` profiles live traffic for a few seconds, one run at a time:
+
+* ``sample`` - a statistical sampler that reads every thread's stack at a
+  fixed interval and returns collapsed stacks (``thread;outer;inner count``
+  lines) for flamegraph.pl, speedscope or inferno. It sees the event loop
+  and the executor threads, at a cost independent of call rate.
+* ``cprofile`` - deterministic ``cProfile`` of the event loop thread, so of
+  every coroutine and inline tool, returned as pstats text or as a binary
+  pstats dump for snakeviz or flameprof.
+
+Process-pool workers are separate processes and are not profiled.
+"""
+
+import asyncio
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from typing import Dict, Optional
+
+SAMPLE = "sample"
+CPROFILE = "cprofile"
+MODES = (SAMPLE, CPROFILE)
+DEFAULT_PROFILE_SECONDS = 10.0
+MAX_PROFILE_SECONDS = 120.0
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one runs."""
+
+
+def _frame_label(code) -> str:
+    name = getattr(code, "co_qualname", code.co_name)
+    location = f"{os.path.basename(code.co_filename)}:{code.co_firstlineno}"
+    return f"{name} ({location})".replace(";", ":")
+
+
+class StackSampler:
+    """Samples the stacks of all threads from a background thread."""
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            labels.append(names.get(thread_id, f"thread-{thread_id}"))
+            self.stacks[";".join(reversed(labels))] += 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def collapsed(self) -> str:
+        """Return the samples as collapsed stacks, most frequent first."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+
+def pstats_text(profile: cProfile.Profile, sort: str = "cumulative", limit: int = 60) -> str:
+    """Render a cProfile run as a pstats table."""
+    out = io.StringIO()
+    pstats.Stats(profile, stream=out).sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+def pstats_dump(profile: cProfile.Profile) -> bytes:
+    """Return a cProfile run in the binary format of ``Profile.dump_stats``."""
+    profile.create_stats()
+    return marshal.dumps(profile.stats)
+
+
+class Profiler:
+    """Runs one CPU profile at a time across live traffic."""
+
+    def __init__(
+        self,
+        max_seconds: float = MAX_PROFILE_SECONDS,
+        sample_interval: float = DEFAULT_SAMPLE_INTERVAL,
+    ):
+        self.max_seconds = max_seconds
+        self.sample_interval = sample_interval
+        self.running = False
+        self.runs = 0
+
+    def _check(self, seconds: float) -> None:
+        if not 0 < seconds <= self.max_seconds:
+            raise ValueError(
+                f"seconds must be greater than 0 and at most {self.max_seconds}"
+            )
+        if self.running:
+            raise ProfilerBusyError("A profile is already running")
+
+    async def sample(self, seconds: float = DEFAULT_PROFILE_SECONDS) -> StackSampler:
+        """Sample every thread for ``seconds`` and return the sampler."""
+        self._check(seconds)
+        self.running = True
+        sampler = StackSampler(self.sample_interval)
+        try:
+            sampler.start()
+            await asyncio.sleep(seconds)
+        finally:
+            await asyncio.to_thread(sampler.stop)
+            self.running = False
+            self.runs += 1
+        return sampler
+
+    async def cprofile(self, seconds: float = DEFAULT_PROFILE_SECONDS) -> cProfile.Profile:
+        """Profile the event loop thread for ``seconds`` with cProfile."""
+        self._check(seconds)
+        self.running = True
+        profile = cProfile.Profile()
+        try:
+            try:
+                profile.enable()
+            except ValueError as e:
+                # Another profiler, e.g. one started outside the server, is active
+                raise ProfilerBusyError(str(e)) from e
+            await asyncio.sleep(seconds)
+        finally:
+            profile.disable()
+            self.running = False
+            self.runs += 1
+        return profile
+
+    def stats(self) -> Dict[str, object]:
+        """Return whether a profile is running and how many have run."""
+        return {"running": self.running, "runs": self.runs}
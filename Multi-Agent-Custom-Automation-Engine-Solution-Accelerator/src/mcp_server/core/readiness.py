@@ -0,0 +1,188 @@
+"""
+Readiness checks for the ``/ready`` probe.
+
+``/health`` tells the orchestrator the process is alive; ``/ready`` tells
+it whether the server can take traffic now. ``ReadinessMonitor`` runs the
+registered checks (those of the factory, of each loaded service and of the
+auth provider) in the background every ``interval`` seconds, so a probe
+only reads the latest results. It also measures how late its own timer
+fires to detect a saturated event loop. Live checks, such as load
+shedding, are cheap and evaluated on every probe instead.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_READINESS_INTERVAL = 5.0
+DEFAULT_CHECK_TIMEOUT = 2.0
+DEFAULT_MAX_LOOP_LAG = 0.5
+EVENT_LOOP = "event_loop"
+
+# A check returns (or resolves to) a truthy value when it passes; a
+# non-empty string also becomes the detail shown by /ready
+ReadinessCheck = Callable[[], Union[Any, Awaitable[Any]]]
+
+
+@dataclass
+class CheckResult:
+    """Outcome of one readiness check."""
+
+    ok: bool
+    detail: str = ""
+    duration: float = 0.0
+
+
+class ReadinessMonitor:
+    """Runs readiness checks in the background and reports the latest results."""
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_READINESS_INTERVAL,
+        timeout: float = DEFAULT_CHECK_TIMEOUT,
+        max_loop_lag: float = DEFAULT_MAX_LOOP_LAG,
+        collect: Optional[Callable[[], Dict[str, ReadinessCheck]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.interval = interval
+        self.timeout = timeout
+        self.max_loop_lag = max_loop_lag
+        self._collect = collect
+        self._clock = clock
+        self._checks: Dict[str, ReadinessCheck] = {}
+        self._live_checks: Dict[str, Callable[[], Any]] = {}
+        self.results: Dict[str, CheckResult] = {}
+        self.checked_at: Optional[float] = None
+        self.loop_lag = 0.0
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def add_check(self, name: str, check: ReadinessCheck, live: bool = False) -> None:
+        """
+        Register a check.
+
+        Background checks may be coroutines and are bounded by ``timeout``;
+        live checks must be cheap and synchronous.
+        """
+        if live:
+            self._live_checks[name] = check
+        else:
+            self._checks[name] = check
+
+    async def _run_check(self, check: ReadinessCheck) -> CheckResult:
+        started = self._clock()
+        try:
+            outcome = check()
+            if inspect.isawaitable(outcome):
+                outcome = await asyncio.wait_for(outcome, timeout=self.timeout)
+            ok = bool(outcome)
+            detail = outcome if isinstance(outcome, str) else "" if ok else "failed"
+        except asyncio.TimeoutError:
+            ok, detail = False, f"timed out after {self.timeout}s"
+        except Exception as e:
+            ok, detail = False, str(e) or type(e).__name__
+        return CheckResult(ok, detail, self._clock() - started)
+
+    async def run_checks(self) -> Dict[str, CheckResult]:
+        """Run every background check concurrently and store the results."""
+        checks = dict(self._checks)
+        if self._collect is not None:
+            checks.update(self._collect())
+        names = list(checks)
+        outcomes = await asyncio.gather(
+            *(self._run_check(checks[name]) for name in names)
+        )
+        results = dict(zip(names, outcomes))
+        results[EVENT_LOOP] = CheckResult(
+            self.loop_lag <= self.max_loop_lag,
+            f"lag {self.loop_lag:.3f}s",
+        )
+
+        failed = sorted(name for name, result in results.items() if not result.ok)
+        previously_failed = sorted(
+            name for name, result in self.results.items() if not result.ok
+        )
+        if failed != previously_failed:
+            if failed:
+                logger.warning(f"⚠️  Readiness checks failing: {', '.join(failed)}")
+            else:
+                logger.info("✅ All readiness checks pass")
+
+        self.results = results
+        self.checked_at = self._clock()
+        return results
+
+    def start(self) -> None:
+        """Start the background checks in the running event loop."""
+        loop = asyncio.get_running_loop()
+        if (
+            self._task is not None
+            and not self._task.done()
+            and self._task.get_loop() is loop
+        ):
+            return
+        self._task = loop.create_task(self._check_loop())
+
+    async def _check_loop(self) -> None:
+        while True:
+            await self.run_checks()
+            due = self._clock() + self.interval
+            await asyncio.sleep(self.interval)
+            # A busy event loop wakes the timer up late
+            self.loop_lag = max(0.0, self._clock() - due)
+
+    def stop(self) -> None:
+        """Cancel the background checks."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @property
+    def ready(self) -> bool:
+        """True when the last run and every live check passed."""
+        return self.status()["ready"]
+
+    def status(self) -> Dict[str, Any]:
+        """Return overall readiness and the result of every check."""
+        results = dict(self.results)
+        for name, check in self._live_checks.items():
+            try:
+                results[name] = CheckResult(bool(check()))
+            except Exception as e:
+                results[name] = CheckResult(False, str(e) or type(e).__name__)
+            if not results[name].ok and not results[name].detail:
+                results[name].detail = "failed"
+
+        return {
+            "ready": self.checked_at is not None
+            and all(result.ok for result in results.values()),
+            "age": (
+                self._clock() - self.checked_at
+                if self.checked_at is not None
+                else None
+            ),
+            "checks": {
+                name: {
+                    "ok": result.ok,
+                    "detail": result.detail,
+                    "duration": result.duration,
+                }
+                for name, result in sorted(results.items())
+            },
+        }
+
+    async def probe(self) -> Dict[str, Any]:
+        """
+        Return the readiness status for a probe request.
+
+        Starts the background checks on the first probe and runs them once
+        inline so the first answer is not a guess.
+        """
+        self.start()
+        if self.checked_at is None:
+            await self.run_checks()
+        return self.status()
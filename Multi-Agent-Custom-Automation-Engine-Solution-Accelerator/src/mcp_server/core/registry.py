@@ -0,0 +1,362 @@
+"""
+Component registry with name and tag indexes for the MCP tool factory.
+"""
+
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from fastmcp.exceptions import NotFoundError
+from fastmcp.resources.template import match_uri_template
+from fastmcp.server.middleware import Middleware
+
+if TYPE_CHECKING:
+    from fastmcp import FastMCP
+
+    from core.factory import Domain
+
+TOOL = "tool"
+RESOURCE = "resource"
+PROMPT = "prompt"
+
+
+@dataclass
+class ToolEntry:
+    """A tool, resource or prompt registered through the factory."""
+
+    kind: str
+    name: str
+    domain: "Domain"
+    handler: Callable
+    tags: FrozenSet[str] = frozenset()
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+class ToolRegistry:
+    """
+    Index of every component registered by the factory's services.
+
+    Keeps a name -> entry index and a tag -> names inverted index per
+    component kind. ``version`` increases on every registration so callers
+    can cache anything derived from the registry.
+    """
+
+    def __init__(
+        self,
+        include_tags: Optional[Iterable[str]] = None,
+        exclude_tags: Optional[Iterable[str]] = None,
+    ):
+        self._entries: Dict[str, Dict[str, ToolEntry]] = {
+            TOOL: {},
+            RESOURCE: {},
+            PROMPT: {},
+        }
+        self._tag_index: Dict[str, Dict[str, Set[str]]] = {
+            TOOL: {},
+            RESOURCE: {},
+            PROMPT: {},
+        }
+        self.version = 0
+        self._enabled_cache: Dict[str, Tuple[int, FrozenSet[str]]] = {}
+        self.set_tag_filter(include_tags, exclude_tags)
+
+    def set_tag_filter(
+        self,
+        include_tags: Optional[Iterable[str]] = None,
+        exclude_tags: Optional[Iterable[str]] = None,
+    ) -> None:
+        """Set the server-wide tag filter applied to listings and calls."""
+        self.include_tags = set(include_tags) if include_tags is not None else None
+        self.exclude_tags = set(exclude_tags) if exclude_tags is not None else None
+        self.version += 1
+
+    def add(self, entry: ToolEntry) -> None:
+        """Index a component and bump the registry version."""
+        previous = self._entries[entry.kind].get(entry.name)
+        if previous is not None:
+            for tag in previous.tags:
+                self._tag_index[entry.kind][tag].discard(entry.name)
+
+        self._entries[entry.kind][entry.name] = entry
+        for tag in entry.tags:
+            self._tag_index[entry.kind].setdefault(tag, set()).add(entry.name)
+        self.version += 1
+
+    def get(self, kind: str, name: str) -> Optional[ToolEntry]:
+        """Look up a component by name (or URI for resources)."""
+        return self._entries[kind].get(name)
+
+    def resolve_resource(self, uri: str) -> Optional[ToolEntry]:
+        """Find the resource entry serving a concrete URI."""
+        entry = self._entries[RESOURCE].get(uri)
+        if entry is not None:
+            return entry
+        for template, entry in self._entries[RESOURCE].items():
+            if "{" in template and match_uri_template(uri, template) is not None:
+                return entry
+        return None
+
+    def entries(self, kind: str = TOOL) -> List[ToolEntry]:
+        """Return all entries of a kind."""
+        return list(self._entries[kind].values())
+
+    def find(
+        self,
+        kind: str = TOOL,
+        include_tags: Optional[Iterable[str]] = None,
+        exclude_tags: Optional[Iterable[str]] = None,
+    ) -> FrozenSet[str]:
+        """
+        Resolve a tag filter against the inverted index.
+
+        Mirrors FastMCP semantics: a component is kept when it has any of the
+        include tags (or no include filter is given) and none of the exclude
+        tags.
+        """
+        index = self._tag_index[kind]
+        if include_tags is None:
+            names = set(self._entries[kind])
+        else:
+            names = set()
+            for tag in include_tags:
+                names |= index.get(tag, set())
+
+        for tag in exclude_tags or ():
+            names -= index.get(tag, set())
+
+        return frozenset(names)
+
+    def enabled_names(self, kind: str = TOOL) -> FrozenSet[str]:
+        """Names allowed by the server-wide tag filter, cached per version."""
+        cached = self._enabled_cache.get(kind)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+
+        names = self.find(kind, self.include_tags, self.exclude_tags)
+        self._enabled_cache[kind] = (self.version, names)
+        return names
+
+    def is_enabled(self, kind: str, name: str) -> bool:
+        """Check a component against the server-wide tag filter."""
+        if name not in self._entries[kind]:
+            return True
+        return name in self.enabled_names(kind)
+
+
+class ServiceRegistrar:
+    """
+    Proxy handed to ``MCPToolBase.register_tools``.
+
+    Records every tool, resource and prompt in the registry before
+    forwarding the registration to the real FastMCP server, optionally
+    wrapping the handler first (see ``MCPToolFactory._wrap_handler``). Any
+    other attribute is delegated to the server unchanged.
+    """
+
+    def __init__(
+        self,
+        mcp,
+        registry: ToolRegistry,
+        domain: "Domain",
+        wrap_handler: Optional[Callable[[ToolEntry, Callable], Callable]] = None,
+    ):
+        self._mcp = mcp
+        self._registry = registry
+        self._domain = domain
+        self._wrap_handler = wrap_handler
+
+    def __getattr__(self, item):
+        return getattr(self._mcp, item)
+
+    def tool(self, name_or_fn=None, **kwargs):
+        """Register a tool (same call patterns as ``FastMCP.tool``)."""
+        return self._decorator(TOOL, name_or_fn, kwargs)
+
+    def prompt(self, name_or_fn=None, **kwargs):
+        """Register a prompt (same call patterns as ``FastMCP.prompt``)."""
+        return self._decorator(PROMPT, name_or_fn, kwargs)
+
+    def resource(self, uri: str, **kwargs):
+        """Register a resource or resource template."""
+
+        def decorator(fn):
+            return self._register(RESOURCE, fn, kwargs, uri=uri)
+
+        return decorator
+
+    def _decorator(self, kind: str, name_or_fn, kwargs: Dict[str, Any]):
+        if callable(name_or_fn):
+            return self._register(kind, name_or_fn, kwargs)
+        if isinstance(name_or_fn, str):
+            kwargs = {**kwargs, "name": name_or_fn}
+
+        def decorator(fn):
+            return self._register(kind, fn, kwargs)
+
+        return decorator
+
+    def _register(self, kind: str, fn, kwargs: Dict[str, Any], uri=None):
+        name = uri or kwargs.get("name") or fn.__name__
+        entry = ToolEntry(
+            kind=kind,
+            name=name,
+            domain=self._domain,
+            handler=fn,
+            tags=frozenset(kwargs.get("tags") or ()),
+            meta=dict(kwargs.get("meta") or {}),
+        )
+        self._registry.add(entry)
+
+        if self._wrap_handler is not None:
+            fn = self._wrap_handler(entry, fn)
+
+        if kind == RESOURCE:
+            return self._mcp.resource(uri, **kwargs)(fn)
+        return getattr(self._mcp, kind)(**kwargs)(fn)
+
+
+class ListingCacheMiddleware(Middleware):
+    """
+    Filter listings by the tag index and keep their serialized form.
+
+    Calls to components hidden by the tag filter are rejected the same way
+    FastMCP rejects unknown components. FastMCP converts a listing to MCP
+    types after the middleware chain, so ``install`` takes over the
+    server's list handlers: they still run the chain, but reuse the
+    converted listing while the chain returns the same components under
+    the same registry version. Adding, removing, enabling or disabling a
+    FastMCP component changes the listing and so converts it again.
+    """
+
+    def __init__(self, registry: ToolRegistry):
+        self.registry = registry
+        # Per listing: registry version, components and their MCP form
+        self._serialized: Dict[str, Tuple[int, list, list]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def install(self, server: "FastMCP") -> None:
+        """Serve the server's list requests through ``serialized``."""
+
+        def handler(key, list_components, convert):
+            async def handle():
+                components = await list_components()
+                return self.serialized(key, components, convert)
+
+            return handle
+
+        def meta() -> Optional[bool]:
+            return server.include_fastmcp_meta
+
+        low_level = server._mcp_server
+        low_level.list_tools()(
+            handler(
+                "tools",
+                lambda: server._list_tools_middleware(),
+                lambda tool: tool.to_mcp_tool(
+                    name=tool.key, include_fastmcp_meta=meta()
+                ),
+            )
+        )
+        low_level.list_resources()(
+            handler(
+                "resources",
+                lambda: server._list_resources_middleware(),
+                lambda resource: resource.to_mcp_resource(
+                    uri=resource.key, include_fastmcp_meta=meta()
+                ),
+            )
+        )
+        low_level.list_resource_templates()(
+            handler(
+                "resource_templates",
+                lambda: server._list_resource_templates_middleware(),
+                lambda template: template.to_mcp_template(
+                    uriTemplate=template.key, include_fastmcp_meta=meta()
+                ),
+            )
+        )
+        low_level.list_prompts()(
+            handler(
+                "prompts",
+                lambda: server._list_prompts_middleware(),
+                lambda prompt: prompt.to_mcp_prompt(
+                    name=prompt.key, include_fastmcp_meta=meta()
+                ),
+            )
+        )
+
+    def serialized(
+        self, key: str, components: List[Any], convert: Callable[[Any], Any]
+    ) -> List[Any]:
+        """MCP form of a listing, converted again only when it changed."""
+        version = self.registry.version
+        cached = self._serialized.get(key)
+        if (
+            cached is not None
+            and cached[0] == version
+            and len(cached[1]) == len(components)
+            and all(old is new for old, new in zip(cached[1], components))
+        ):
+            self.hits += 1
+            return cached[2]
+
+        self.misses += 1
+        listing = [convert(component) for component in components]
+        self._serialized[key] = (version, list(components), listing)
+        return listing
+
+    def stats(self) -> Dict[str, int]:
+        """Return serialized listing cache hits and misses."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    async def _filtered(self, kind: str, context, call_next):
+        components = await call_next(context)
+        enabled = self.registry.enabled_names(kind)
+        return [
+            component
+            for component in components
+            if self.registry.get(kind, component.key) is None
+            or component.key in enabled
+        ]
+
+    async def on_list_tools(self, context, call_next):
+        return await self._filtered(TOOL, context, call_next)
+
+    async def on_list_resources(self, context, call_next):
+        return await self._filtered(RESOURCE, context, call_next)
+
+    async def on_list_resource_templates(self, context, call_next):
+        return await self._filtered(RESOURCE, context, call_next)
+
+    async def on_list_prompts(self, context, call_next):
+        return await self._filtered(PROMPT, context, call_next)
+
+    async def on_call_tool(self, context, call_next):
+        name = context.message.name
+        if not self.registry.is_enabled(TOOL, name):
+            raise NotFoundError(f"Unknown tool: {name!r}")
+        return await call_next(context)
+
+    async def on_read_resource(self, context, call_next):
+        uri = str(context.message.uri)
+        entry = self.registry.resolve_resource(uri)
+        if entry is not None and not self.registry.is_enabled(RESOURCE, entry.name):
+            raise NotFoundError(f"Unknown resource: {uri!r}")
+        return await call_next(context)
+
+    async def on_get_prompt(self, context, call_next):
+        name = context.message.name
+        if not self.registry.is_enabled(PROMPT, name):
+            raise NotFoundError(f"Unknown prompt: {name!r}")
+        return await call_next(context)
@@ -0,0 +1,140 @@
+"""
+Response modes for tools built on ``utils.formatters``.
+
+A client picks the mode of a single call through the request ``_meta``::
+
+    {"name": "greet_test", "arguments": {...}, "_meta": {"response_mode": "compact"}}
+
+or for the rest of its session with the ``set_response_mode`` tool. Session
+preferences are keyed on the session object and dropped with it. Calls
+without either use the server default. An unknown mode in ``_meta`` is
+rejected as invalid params. In ``structured`` mode the details
+dict is also returned as MCP structured content; tools that support it
+are registered with ``output_schema=None`` so the payload is not checked
+against FastMCP's wrapped-string schema.
+"""
+
+import json
+import weakref
+from typing import Any, Dict, Optional
+
+from fastmcp.server.middleware import Middleware
+from fastmcp.tools.tool import ToolResult
+from mcp.shared.exceptions import McpError
+from mcp.types import INVALID_PARAMS, ErrorData
+
+from utils.formatters import (
+    ResponseMode,
+    current_response_state,
+    response_mode,
+)
+
+_session_modes: "weakref.WeakKeyDictionary[Any, ResponseMode]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class UnknownResponseModeError(McpError):
+    """Raised when a request asks for a response mode that does not exist."""
+
+    def __init__(self, requested: Any):
+        modes = [mode.value for mode in ResponseMode]
+        super().__init__(
+            ErrorData(
+                code=INVALID_PARAMS,
+                message=(
+                    f"Unknown response mode {requested!r}; "
+                    f"expected one of {', '.join(modes)}"
+                ),
+                data={"response_mode": requested, "modes": modes},
+            )
+        )
+
+
+def set_session_response_mode(session: Any, mode: ResponseMode) -> None:
+    """Remember the preferred mode of a client session."""
+    _session_modes[session] = ResponseMode(mode)
+
+
+def get_session_response_mode(session: Any) -> Optional[ResponseMode]:
+    """Preferred mode of a client session, if it set one."""
+    return _session_modes.get(session) if session is not None else None
+
+
+def result_size(result: Any) -> int:
+    """UTF-8 size in bytes of a tool result's text and structured content."""
+    size = sum(
+        len((getattr(block, "text", None) or "").encode("utf-8"))
+        for block in getattr(result, "content", None) or ()
+    )
+    structured = getattr(result, "structured_content", None)
+    if structured is not None:
+        size += len(json.dumps(structured, default=str).encode("utf-8"))
+    return size
+
+
+class ResponseModeMiddleware(Middleware):
+    """Select the response mode of each tool call and measure output size."""
+
+    def __init__(self, default_mode: ResponseMode = ResponseMode.FULL):
+        self.default_mode = ResponseMode(default_mode)
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def resolve(self, context) -> ResponseMode:
+        """Mode requested in ``_meta``, else the session's, else the default."""
+        fastmcp_context = context.fastmcp_context
+        request_meta = None
+        session = None
+        if fastmcp_context is not None:
+            try:
+                # FastMCP drops _meta from the params it hands to middleware
+                request_meta = fastmcp_context.request_context.meta
+                session = fastmcp_context.session
+            except (LookupError, RuntimeError, ValueError):
+                pass
+
+        for meta in (getattr(context.message, "meta", None), request_meta):
+            requested = getattr(meta, "response_mode", None) if meta else None
+            if requested:
+                try:
+                    return ResponseMode(requested)
+                except ValueError:
+                    raise UnknownResponseModeError(requested) from None
+
+        return get_session_response_mode(session) or self.default_mode
+
+    async def on_call_tool(self, context, call_next):
+        mode = self.resolve(context)
+        with response_mode(mode):
+            result = await call_next(context)
+
+        stats = self._stats.setdefault(mode.value, {"calls": 0, "bytes": 0})
+        stats["calls"] += 1
+        stats["bytes"] += result_size(result)
+        return result
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return calls, total bytes and average bytes per response mode."""
+        return {
+            mode: {**stats, "avg_bytes": stats["bytes"] / stats["calls"]}
+            for mode, stats in self._stats.items()
+        }
+
+
+class StructuredContentMiddleware(Middleware):
+    """Attach the payload recorded by the formatters as structured content."""
+
+    async def on_call_tool(self, context, call_next):
+        result = await call_next(context)
+        state = current_response_state()
+        if (
+            state is None
+            or state.mode is not ResponseMode.STRUCTURED
+            or state.structured is None
+        ):
+            return result
+
+        tool = await context.fastmcp_context.fastmcp.get_tool(context.message.name)
+        if tool.output_schema is not None:
+            return result
+        return ToolResult(content=result.content, structured_content=state.structured)
@@ -0,0 +1,278 @@
+"""
+Opt-in OpenTelemetry tracing of MCP requests.
+
+``RequestTracingMiddleware`` opens a server span per JSON-RPC request that
+joins the client's trace through the W3C ``traceparent`` of the request
+``_meta`` or, on the HTTP transports, of the HTTP headers.
+``ToolTracingMiddleware`` opens a child span around each tool execution,
+inside the bulkheads, so the gap between the two spans is time spent in
+caches, idempotency checks and queues. On the HTTP transports the request
+span starts when the bearer token check starts and has an ``mcp.auth``
+child covering it.
+
+Other layers annotate the request in progress with
+``record_call_attribute`` (cache status, queue wait) without depending on
+OpenTelemetry, which is an optional dependency needed only when tracing
+is enabled. It is imported by ``Tracing`` and the span middlewares, so
+importing this module stays cheap when tracing is off.
+"""
+
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple
+
+from fastmcp.server.dependencies import get_http_headers, get_http_request
+from fastmcp.server.middleware import Middleware
+
+from core.registry import TOOL, ToolRegistry
+
+MEMORY = "memory"
+FILE = "file"
+GLOBAL = "global"
+EXPORTERS = (MEMORY, FILE, GLOBAL)
+DEFAULT_TRACE_FILE = "traces.jsonl"
+
+# Span attributes
+METHOD = "mcp.method.name"
+SESSION_ID = "mcp.session.id"
+TOOL_NAME = "mcp.tool.name"
+DOMAIN = "mcp.domain"
+CACHE_STATUS = "mcp.cache.status"
+QUEUE_WAIT = "mcp.queue.wait"
+AUTH_CACHED = "mcp.auth.cached"
+AUTH_SPAN = "mcp.auth"
+
+# Where the auth timing of an HTTP request is kept in the ASGI scope state
+AUTH_STATE_KEY = "mcp_auth_timing"
+
+_call_attributes: ContextVar[Optional[Dict[str, Any]]] = ContextVar(
+    "mcp_call_attributes", default=None
+)
+_auth_timing: ContextVar[Optional[Tuple[int, int, bool]]] = ContextVar(
+    "mcp_auth_timing", default=None
+)
+
+
+def record_call_attribute(key: str, value: Any) -> None:
+    """Set an attribute on the traced request in progress, if any."""
+    attributes = _call_attributes.get()
+    if attributes is not None:
+        attributes[key] = value
+
+
+def record_auth_timing(started_ns: int, ended_ns: int, cached: bool) -> None:
+    """Remember when the bearer token of the current HTTP request was checked."""
+    _auth_timing.set((started_ns, ended_ns, cached))
+
+
+class AuthTimingMiddleware:
+    """
+    ASGI middleware that hands the auth timing to the request's spans.
+
+    It runs after authentication in the same task, but MCP requests are
+    handled in the session's task, so the timing travels in the scope.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        timing = _auth_timing.get()
+        if timing is not None and scope["type"] == "http":
+            scope.setdefault("state", {})[AUTH_STATE_KEY] = timing
+        await self.app(scope, receive, send)
+
+
+class Tracing:
+    """
+    A tracer and the exporter its spans go to.
+
+    ``memory`` keeps finished spans in ``finished_spans()`` (tests, local
+    debugging), ``file`` appends them as JSON lines to ``path`` and
+    ``global`` uses the process-wide tracer provider, e.g. one set up by
+    ``opentelemetry-instrument`` with an OTLP exporter.
+    """
+
+    def __init__(
+        self,
+        exporter: str = MEMORY,
+        path: str = DEFAULT_TRACE_FILE,
+        service_name: str = "mcp-server",
+    ):
+        if exporter not in EXPORTERS:
+            raise ValueError(
+                f"Unknown trace exporter {exporter!r}, expected one of {EXPORTERS}"
+            )
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError("tracing needs the opentelemetry-sdk package") from None
+
+        self.exporter_name = exporter
+        self.exporter = None
+        self.provider = None
+        self._file = None
+        if exporter == GLOBAL:
+            self.tracer = trace.get_tracer(__name__)
+            return
+
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import (
+            BatchSpanProcessor,
+            ConsoleSpanExporter,
+            SimpleSpanProcessor,
+        )
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+            InMemorySpanExporter,
+        )
+
+        self.provider = TracerProvider(
+            resource=Resource.create({"service.name": service_name})
+        )
+        if exporter == MEMORY:
+            self.exporter = InMemorySpanExporter()
+            self.provider.add_span_processor(SimpleSpanProcessor(self.exporter))
+        else:
+            self._file = open(path, "a", encoding="utf-8")
+            self.exporter = ConsoleSpanExporter(
+                out=self._file,
+                formatter=lambda span: span.to_json(indent=None) + "\n",
+            )
+            self.provider.add_span_processor(BatchSpanProcessor(self.exporter))
+        self.tracer = self.provider.get_tracer(__name__)
+
+    def finished_spans(self) -> list:
+        """Return the spans kept by the ``memory`` exporter."""
+        if self.exporter_name != MEMORY:
+            return []
+        return list(self.exporter.get_finished_spans())
+
+    def shutdown(self) -> None:
+        """Flush pending spans and close the trace file."""
+        if self.provider is not None:
+            self.provider.shutdown()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _trace_carrier(context) -> Dict[str, str]:
+    """W3C trace context of a request: ``_meta`` first, then HTTP headers."""
+    carrier = get_http_headers()
+    request_meta = None
+    fastmcp_context = context.fastmcp_context
+    if fastmcp_context is not None:
+        try:
+            # FastMCP drops _meta from the params it hands to middleware
+            request_meta = fastmcp_context.request_context.meta
+        except (LookupError, RuntimeError, ValueError):
+            pass
+
+    for meta in (request_meta, getattr(context.message, "meta", None)):
+        for key in ("traceparent", "tracestate"):
+            value = getattr(meta, key, None) if meta else None
+            if value:
+                carrier[key] = str(value)
+    return carrier
+
+
+def _take_auth_timing() -> Optional[Tuple[int, int, bool]]:
+    """Auth timing of the HTTP request, for the first span that asks."""
+    try:
+        request = get_http_request()
+    except RuntimeError:
+        return None
+    return request.scope.get("state", {}).pop(AUTH_STATE_KEY, None)
+
+
+def _session_id(context) -> Optional[str]:
+    fastmcp_context = context.fastmcp_context
+    if fastmcp_context is None:
+        return None
+    try:
+        return fastmcp_context.session_id
+    except (LookupError, RuntimeError, ValueError):
+        return None
+
+
+class RequestTracingMiddleware(Middleware):
+    """Open a server span per JSON-RPC request."""
+
+    def __init__(self, registry: ToolRegistry, tracer):
+        from opentelemetry import propagate, trace
+
+        self.registry = registry
+        self.tracer = tracer
+        self._propagate = propagate
+        self._trace = trace
+
+    def _target(self, context) -> Tuple[Optional[str], Optional[Any]]:
+        """Name of the called component and its registry entry."""
+        message = context.message
+        if context.method == "tools/call":
+            return message.name, self.registry.get(TOOL, message.name)
+        if context.method == "resources/read":
+            uri = str(message.uri)
+            return uri, self.registry.resolve_resource(uri)
+        return getattr(message, "name", None), None
+
+    async def on_request(self, context, call_next):
+        target, _ = self._target(context)
+        attributes = {METHOD: context.method}
+        session_id = _session_id(context)
+        if session_id:
+            attributes[SESSION_ID] = session_id
+        if context.method == "tools/call":
+            attributes[TOOL_NAME] = target
+
+        # Requests FastMCP makes while handling another become its children
+        nested = self._trace.get_current_span().get_span_context().is_valid
+        parent = None if nested else self._propagate.extract(_trace_carrier(context))
+        auth = None if nested else _take_auth_timing()
+        call_attributes: Dict[str, Any] = {}
+        token = _call_attributes.set(call_attributes)
+        try:
+            with self.tracer.start_as_current_span(
+                f"{context.method} {target}" if target else context.method,
+                context=parent,
+                kind=self._trace.SpanKind.SERVER,
+                attributes=attributes,
+                start_time=auth[0] if auth else None,
+            ) as span:
+                if auth:
+                    self.tracer.start_span(
+                        AUTH_SPAN, start_time=auth[0], attributes={AUTH_CACHED: auth[2]}
+                    ).end(end_time=auth[1])
+                try:
+                    return await call_next(context)
+                finally:
+                    # Lazily loaded services are registered by now
+                    _, entry = self._target(context)
+                    if entry is not None:
+                        call_attributes.setdefault(DOMAIN, entry.domain.value)
+                    span.set_attributes(call_attributes)
+        finally:
+            _call_attributes.reset(token)
+
+
+class ToolTracingMiddleware(Middleware):
+    """Open a span around the execution of each tool."""
+
+    def __init__(self, registry: ToolRegistry, tracer):
+        self.registry = registry
+        self.tracer = tracer
+
+    async def on_call_tool(self, context, call_next):
+        name = context.message.name
+        attributes = {TOOL_NAME: name}
+        entry = self.registry.get(TOOL, name)
+        if entry is not None:
+            attributes[DOMAIN] = entry.domain.value
+        queue_wait = (_call_attributes.get() or {}).get(QUEUE_WAIT)
+        if queue_wait is not None:
+            attributes[QUEUE_WAIT] = queue_wait
+
+        with self.tracer.start_as_current_span(
+            f"execute_tool {name}", attributes=attributes
+        ):
+            return await call_next(context)
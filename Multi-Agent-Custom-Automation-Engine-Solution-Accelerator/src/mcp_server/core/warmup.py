@@ -0,0 +1,123 @@
+"""
+Warm-up of registered tools before the server takes traffic.
+
+The first call of a tool pays one-time costs: importing its service module,
+building its argument validator and listing entry, and starting the pool it
+runs in. ``ToolWarmer`` pays them at start-up instead. It loads every
+deferred service, prepares each registered tool, then runs the synthetic
+calls services declare in ``warmup_calls``. Synthetic calls go straight to
+the tool, bypassing caches and idempotency, so services must only declare
+calls without side effects.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List
+
+from fastmcp.utilities.types import get_cached_typeadapter
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+READY = "ready"
+
+
+@dataclass(frozen=True)
+class WarmupCall:
+    """A synthetic tool call run during warm-up."""
+
+    tool: str
+    arguments: Dict[str, Any] = field(default_factory=dict)
+
+
+class ToolWarmer:
+    """Runs the warm-up once and tracks whether the server is ready."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.status = PENDING if enabled else READY
+        self.tools = 0
+        self.calls = 0
+        self.errors: List[str] = []
+        self.duration = 0.0
+
+    @property
+    def ready(self) -> bool:
+        """True once warm-up has finished (always, when it is disabled)."""
+        return self.status == READY
+
+    async def run(self, server, load_services: Callable[[], Iterable[Any]]) -> None:
+        """
+        Warm up every tool of ``server``.
+
+        Args:
+            server: The FastMCP server
+            load_services: Loads every deferred service and returns them all
+        """
+        if self.status != PENDING:
+            return
+
+        self.status = RUNNING
+        started = time.perf_counter()
+        try:
+            services = list(load_services())
+            tools = await server.get_tools()
+            for tool in tools.values():
+                self._prepare(tool)
+                # Let health checks through between tools
+                await asyncio.sleep(0)
+            for service in services:
+                for call in getattr(service, "warmup_calls", ()):
+                    await self._call(tools, call)
+        except asyncio.CancelledError:
+            self.status = PENDING
+            raise
+        except Exception as e:
+            self.errors.append(str(e))
+            logger.exception("❌ Warm-up failed")
+
+        self.duration = time.perf_counter() - started
+        self.status = READY
+        logger.info(
+            f"🔥 Warm-up finished in {self.duration:.2f}s: {self.tools} tools, "
+            f"{self.calls} synthetic calls, {len(self.errors)} errors"
+        )
+
+    def _prepare(self, tool) -> None:
+        """Build the listing entry and argument validator of a tool."""
+        try:
+            tool.to_mcp_tool()
+            fn = getattr(tool, "fn", None)
+            if fn is not None:
+                get_cached_typeadapter(fn)
+            self.tools += 1
+        except Exception as e:
+            self.errors.append(f"{tool.name}: {e}")
+            logger.warning(f"⚠️  Could not prepare {tool.name} during warm-up: {e}")
+
+    async def _call(self, tools: Dict[str, Any], call: WarmupCall) -> None:
+        """Run one synthetic call directly on the tool."""
+        tool = tools.get(call.tool)
+        if tool is None:
+            self.errors.append(f"{call.tool}: unknown tool")
+            return
+        try:
+            await tool.run(dict(call.arguments))
+            self.calls += 1
+        except Exception as e:
+            self.errors.append(f"{call.tool}: {e}")
+            logger.warning(f"⚠️  Warm-up call to {call.tool} failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the warm-up status, counters and errors."""
+        return {
+            "enabled": self.enabled,
+            "status": self.status,
+            "tools": self.tools,
+            "calls": self.calls,
+            "errors": list(self.errors),
+            "duration": self.duration,
+        }
@@ -1,28 +1,93 @@
 """
 BB MCP Server - FastMCP server with organized tools and services.
+
+FastMCP, the auth provider and the server itself are created when ``mcp``
+(or ``factory``) is first used, so ``--help`` and spawned worker processes
+only pay for the settings import.
 """
 
 import argparse
 import logging
+import sys
 
 from config.settings import config
-from core.factory import MCPToolFactory
-from fastmcp.server.auth.providers.jwt import JWTVerifier
-from services.bb_demo_service import BBDemoService
-from services.demo_tech_support_service import TechSupportService
-from services.demo_general_service import GeneralService
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Global factory instance
-factory = MCPToolFactory()
 
-# Initialize services
-factory.register_service(BBDemoService())
-factory.register_service(TechSupportService())
-factory.register_service(GeneralService())
+def create_factory():
+    """Create the tool factory and register the service descriptors."""
+    from core.factory import Domain, MCPToolFactory, ServiceDescriptor
+    from utils.date_utils import Clock, set_clock
+
+    set_clock(Clock(resolution=config.timestamp_resolution))
+
+    tool_factory = MCPToolFactory(
+        cache_domain_memory_limit=config.cache_domain_memory_limit,
+        shared_executor_workers=config.shared_executor_workers,
+        domain_executor_workers=config.domain_executor_workers,
+        process_workers=config.process_workers,
+        process_timeout=config.process_timeout,
+        domain_max_concurrency=config.domain_max_concurrency,
+        domain_max_queue=config.domain_max_queue,
+        idempotency_db_path=config.idempotency_db_path,
+        default_response_mode=config.response_mode,
+        readiness_interval=config.readiness_interval,
+        readiness_max_loop_lag=config.readiness_max_loop_lag,
+    )
+
+    # Register services lazily: modules are imported on first list or call
+    tool_factory.register_descriptor(
+        ServiceDescriptor(
+            domain=Domain.DEMO,
+            module="services.bb_demo_service",
+            class_name="BBDemoService",
+            tools=("add_two_numbers", "get_user_info"),
+            resources=("config://app_config", "users://{user_id}/telephone"),
+            prompts=("analyze_data",),
+        )
+    )
+    tool_factory.register_descriptor(
+        ServiceDescriptor(
+            domain=Domain.TECH_SUPPORT,
+            module="services.demo_tech_support_service",
+            class_name="TechSupportService",
+            tools=(
+                "send_welcome_email",
+                "set_up_office_365_account",
+                "configure_laptop",
+                "setup_vpn_access",
+                "create_system_accounts",
+                "onboard_employee",
+                "bulk_onboard_employees",
+            ),
+        )
+    )
+    tool_factory.register_descriptor(
+        ServiceDescriptor(
+            domain=Domain.DATA,
+            module="services.data_analysis_service",
+            class_name="DataAnalysisService",
+            tools=("describe_data_points",),
+        )
+    )
+    tool_factory.register_descriptor(
+        ServiceDescriptor(
+            domain=Domain.GENERAL,
+            module="services.demo_general_service",
+            class_name="GeneralService",
+            tools=(
+                "greet_test",
+                "get_server_status",
+                "set_response_mode",
+                "format_dates",
+            ),
+        )
+    )
+
+    return tool_factory
 
 
 def create_fastmcp_server():
@@ -32,22 +97,53 @@ def create_fastmcp_server():
         auth = None
         if config.enable_auth:
             auth_config = {
-                "jwks_uri": config.jwks_uri,
+                "jwks": config.jwks_file or config.jwks_uri,
                 "issuer": config.issuer,
                 "audience": config.audience,
             }
             if all(auth_config.values()):
-                auth = JWTVerifier(
-                    jwks_uri=auth_config["jwks_uri"],
+                # Keys are fetched now and refreshed in the background,
+                # never while a request waits
+                key_cache = _lazy("JWKSKeyCache")(
+                    jwks_uri=config.jwks_uri,
+                    jwks_file=config.jwks_file,
+                    ttl=config.jwks_cache_ttl,
+                )
+                key_cache.prefetch()
+                # Also starts the refresh task and retries a failed prefetch
+                _lazy("factory").readiness.add_check("jwks", key_cache.ensure_loaded)
+                auth = _lazy("CachedJWKSVerifier")(
+                    key_cache=key_cache,
+                    token_cache_size=config.token_cache_size,
                     issuer=auth_config["issuer"],
                     algorithm="RS256",
                     audience=auth_config["audience"],
                 )
 
+        tracing = None
+        if config.tracing:
+            try:
+                from core.tracing import Tracing
+
+                tracing = Tracing(
+                    config.tracing_exporter,
+                    config.tracing_file,
+                    service_name=config.server_name,
+                )
+                logger.info(f"🔭 Tracing enabled ({config.tracing_exporter})")
+            except ImportError as e:
+                logger.warning(
+                    f"⚠️  Tracing disabled, {e}: pip install opentelemetry-sdk"
+                )
+
         # Create MCP server
-        mcp_server = factory.create_mcp_server(
+        mcp_server = _lazy("factory").create_mcp_server(
             name=config.server_name,
             auth=auth,
+            include_tags=config.include_tags,
+            exclude_tags=config.exclude_tags,
+            warmup=config.warmup,
+            tracing=tracing,
         )
 
         logger.info("✅ FastMCP server created successfully")
@@ -60,29 +156,221 @@ def create_fastmcp_server():
         return None
 
 
-# Create FastMCP server instance for fastmcp run command
-mcp = create_fastmcp_server()
-
-# Add /health endpoint if mcp is available
-if mcp:
+def add_health_route(mcp_server) -> None:
+    """Add the /health endpoint; it answers 503 until warm-up is done."""
     try:
         from starlette.requests import Request
         from starlette.responses import PlainTextResponse
 
-        @mcp.custom_route("/health", methods=["GET"])
+        @mcp_server.custom_route("/health", methods=["GET"])
         async def health_check(request: Request) -> PlainTextResponse:
+            if not _lazy("factory").warmer.ready:
+                return PlainTextResponse("WARMING UP", status_code=503)
             return PlainTextResponse("OK")
     except ImportError:
         pass
 
 
+def add_readiness_route(mcp_server) -> None:
+    """Add the /ready endpoint; it answers 503 while any readiness check fails."""
+    try:
+        from starlette.requests import Request
+        from starlette.responses import JSONResponse
+
+        @mcp_server.custom_route("/ready", methods=["GET"])
+        async def readiness_check(request: Request) -> JSONResponse:
+            status = await _lazy("factory").readiness.probe()
+            return JSONResponse(status, status_code=200 if status["ready"] else 503)
+    except ImportError:
+        pass
+
+
+def add_metrics_route(mcp_server) -> None:
+    """Add the /metrics endpoint in the Prometheus text format."""
+    try:
+        from starlette.requests import Request
+        from starlette.responses import Response
+
+        from core.metrics import CONTENT_TYPE
+
+        @mcp_server.custom_route("/metrics", methods=["GET"])
+        async def metrics(request: Request) -> Response:
+            return Response(
+                _lazy("factory").render_metrics(), media_type=CONTENT_TYPE
+            )
+    except ImportError:
+        pass
+
+
+async def _debug_authorized(request, mcp_server) -> bool:
+    """Accept DEBUG_TOKEN, or a server auth token that carries DEBUG_SCOPE."""
+    import hmac
+
+    scheme, _, credentials = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not credentials:
+        return False
+    if config.debug_token and hmac.compare_digest(
+        credentials.encode(), config.debug_token.encode()
+    ):
+        return True
+    if mcp_server.auth is not None:
+        # Any MCP client has a valid token; profiling needs the debug scope
+        access = await mcp_server.auth.verify_token(credentials)
+        return access is not None and config.debug_scope in access.scopes
+    return False
+
+
+def add_debug_routes(mcp_server) -> None:
+    """Add the authenticated /debug/profile and /debug/memory endpoints."""
+    try:
+        from starlette.requests import Request
+        from starlette.responses import JSONResponse, PlainTextResponse, Response
+
+        from core.memory import DEFAULT_TOP_SITES, MemoryProfiler
+        from core.profiling import (
+            CPROFILE,
+            DEFAULT_PROFILE_SECONDS,
+            MODES,
+            SAMPLE,
+            Profiler,
+            ProfilerBusyError,
+            pstats_dump,
+            pstats_text,
+        )
+    except ImportError:
+        return
+
+    if not config.debug_token and mcp_server.auth is None:
+        logger.warning(
+            "⚠️  Debug routes enabled without DEBUG_TOKEN or auth; "
+            "every request to them will be rejected"
+        )
+    profiler = Profiler()
+    memory = MemoryProfiler()
+
+    def unauthorized() -> Response:
+        return PlainTextResponse(
+            "Unauthorized", status_code=401, headers={"WWW-Authenticate": "Bearer"}
+        )
+
+    @mcp_server.custom_route("/debug/profile", methods=["GET"])
+    async def debug_profile(request: Request) -> Response:
+        if not await _debug_authorized(request, mcp_server):
+            return unauthorized()
+
+        params = request.query_params
+        mode = params.get("mode", SAMPLE)
+        output = params.get("format", "text")
+        try:
+            seconds = float(params.get("seconds", DEFAULT_PROFILE_SECONDS))
+            if mode not in MODES:
+                raise ValueError(f"mode must be one of {', '.join(MODES)}")
+            if output not in ("text", "pstats"):
+                raise ValueError("format must be text or pstats")
+            logger.info(f"🔬 Profiling ({mode}) for {seconds}s")
+            if mode == CPROFILE:
+                profile = await profiler.cprofile(seconds)
+            else:
+                sampler = await profiler.sample(seconds)
+        except ValueError as e:
+            return PlainTextResponse(str(e), status_code=400)
+        except ProfilerBusyError as e:
+            return PlainTextResponse(str(e), status_code=409)
+
+        if mode == SAMPLE:
+            return PlainTextResponse(sampler.collapsed())
+        if output == "pstats":
+            return Response(
+                pstats_dump(profile),
+                media_type="application/octet-stream",
+                headers={"Content-Disposition": 'attachment; filename="profile.pstats"'},
+            )
+        return PlainTextResponse(pstats_text(profile))
+
+    @mcp_server.custom_route("/debug/memory", methods=["GET"])
+    async def debug_memory(request: Request) -> Response:
+        if not await _debug_authorized(request, mcp_server):
+            return unauthorized()
+        factory = _lazy("factory")
+        # The per-session estimate is costly; only on ?estimate=true
+        if request.query_params.get("estimate", "false").lower() == "true":
+            sessions = await factory.estimate_session_stats()
+        else:
+            sessions = factory.get_session_stats()
+        return JSONResponse(
+            {
+                "tracemalloc": memory.stats(),
+                "sessions": sessions,
+                "caches": factory.get_cache_stats(),
+                "idempotency": factory.get_idempotency_stats(),
+            }
+        )
+
+    @mcp_server.custom_route("/debug/memory/snapshot", methods=["POST"])
+    async def debug_memory_snapshot(request: Request) -> Response:
+        if not await _debug_authorized(request, mcp_server):
+            return unauthorized()
+        logger.info("🔬 Taking a tracemalloc snapshot")
+        return JSONResponse(memory.snapshot())
+
+    @mcp_server.custom_route("/debug/memory/diff", methods=["GET"])
+    async def debug_memory_diff(request: Request) -> Response:
+        if not await _debug_authorized(request, mcp_server):
+            return unauthorized()
+        params = request.query_params
+        group_by = params.get("group_by", "lineno")
+        try:
+            top = int(params.get("top", DEFAULT_TOP_SITES))
+            if group_by not in ("lineno", "traceback"):
+                raise ValueError("group_by must be lineno or traceback")
+            sites = memory.diff(top=top, group_by=group_by)
+        except ValueError as e:
+            return PlainTextResponse(str(e), status_code=400)
+        return JSONResponse({"tracemalloc": memory.stats(), "sites": sites})
+
+    @mcp_server.custom_route("/debug/memory/stop", methods=["POST"])
+    async def debug_memory_stop(request: Request) -> Response:
+        if not await _debug_authorized(request, mcp_server):
+            return unauthorized()
+        memory.stop()
+        return JSONResponse(memory.stats())
+
+
+def __getattr__(name: str):
+    """Create ``factory``, ``mcp`` and the auth classes on first access."""
+    if name == "factory":
+        value = create_factory()
+    elif name == "mcp":
+        # FastMCP server instance for the fastmcp run command
+        value = create_fastmcp_server()
+        if value:
+            add_health_route(value)
+            add_readiness_route(value)
+            add_metrics_route(value)
+            if config.debug_routes:
+                add_debug_routes(value)
+    elif name == "JWKSKeyCache":
+        from core.auth import JWKSKeyCache as value
+    elif name == "CachedJWKSVerifier":
+        from core.auth import CachedJWKSVerifier as value
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def _lazy(name: str):
+    """Return a module attribute, creating it through ``__getattr__`` if needed."""
+    return getattr(sys.modules[__name__], name)
+
+
 def log_server_info():
     """Log server initialization info."""
-    if not mcp:
+    if not _lazy("mcp"):
         logger.error("❌ FastMCP server not available")
         return
 
-    summary = factory.get_tool_summary()
+    summary = _lazy("factory").get_tool_summary()
     logger.info(f"🚀 {config.server_name} initialized")
     logger.info(f"📊 Total services: {summary['total_services']}")
     logger.info(f"🔧 Total tools: {summary['total_tools']}")
@@ -95,13 +383,60 @@ def log_server_info():
         )
 
 
+def http_middleware(transport: str = "http"):
+    """ASGI middleware for the HTTP transports (JSON-RPC batches on /mcp)."""
+    from starlette.middleware import Middleware
+
+    middleware = []
+    if config.tracing:
+        from core.tracing import AuthTimingMiddleware
+
+        # Runs after authentication, passing its timing on to the spans
+        middleware.append(Middleware(AuthTimingMiddleware))
+    if transport != "sse":
+        import fastmcp
+        from core.batch import BatchMiddleware
+
+        middleware.append(
+            Middleware(
+                BatchMiddleware,
+                path=fastmcp.settings.streamable_http_path,
+                max_batch_size=config.max_batch_size,
+            )
+        )
+    return middleware
+
+
+def create_http_app(transport: str = "http", workers: int = 1):
+    """
+    Build the ASGI app for an HTTP transport.
+
+    Sessions live in process memory, so with several workers the
+    streamable-HTTP transport runs stateless and any worker can answer.
+    Stateless requests have no session, so elicitation and per-session
+    response modes are unavailable then.
+    """
+    http_kwargs = {}
+    if workers > 1 and transport != "sse":
+        logger.warning(
+            "⚠️  Several workers run stateless: elicitation (get_user_info) and "
+            "per-session response modes are unavailable"
+        )
+        http_kwargs["stateless_http"] = True
+    return _lazy("mcp").http_app(
+        transport=transport, middleware=http_middleware(transport), **http_kwargs
+    )
+
+
 def run_server(
     transport: str = "stdio",
     host: str = "127.0.0.1",
     port: int = 9000,
+    workers: int = 1,
     **kwargs,
 ):
     """Run the FastMCP server with specified transport."""
+    mcp = _lazy("mcp")
     if not mcp:
         logger.error("❌ Cannot start FastMCP server - not available")
         return
@@ -114,7 +449,31 @@ def run_server(
             "🌐 Server will be available at: "
             f"http://{host}:{port}/mcp/"
         )
-        mcp.run(transport=transport, host=host, port=port, **kwargs)
+        if workers > 1:
+            from core.prefork import run_prefork
+
+            if transport == "sse":
+                logger.warning(
+                    "⚠️  SSE sessions are bound to one worker; route each "
+                    "client to a single worker (sticky sessions)"
+                )
+            logger.info(f"👥 Prefork mode with {workers} workers")
+            run_prefork(
+                app_factory=lambda: create_http_app(transport, workers),
+                host=host,
+                port=port,
+                workers=workers,
+                log_level=kwargs.get("log_level", "info"),
+                graceful_shutdown=config.graceful_shutdown_timeout,
+            )
+            return
+        mcp.run(
+            transport=transport,
+            host=host,
+            port=port,
+            middleware=http_middleware(transport),
+            **kwargs,
+        )
     else:
         # For STDIO transport, only pass kwargs that are supported
         stdio_kwargs = {
@@ -147,6 +506,16 @@ def main():
         default=9000,
         help="Port to bind to for HTTP transport (default: 9000)",
     )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=config.workers,
+        help=(
+            "Worker processes for HTTP transports, sharing the port via "
+            f"SO_REUSEPORT (default: {config.workers})"
+        ),
+    )
     parser.add_argument(
         "--debug", action="store_true", help="Enable debug mode"
     )
@@ -156,6 +525,11 @@ def main():
 
     args = parser.parse_args()
 
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1 and args.transport == "stdio":
+        parser.error("--workers requires an HTTP transport")
+
     # Override config with command line arguments
     if args.debug:
         import os
@@ -169,21 +543,26 @@ def main():
         os.environ["MCP_ENABLE_AUTH"] = "false"
         config.enable_auth = False
 
-    # Print startup info
-    print("🚀 Starting BB MCP Server - Internal Developer Platform")
-    print(f"📋 Transport: {args.transport.upper()}")
-    print(f"🔧 Debug: {config.debug}")
-    print(f"🔐 Auth: {'Enabled' if config.enable_auth else 'Disabled'}")
+    # Print startup info (stderr: stdout carries the stdio transport)
+    print("🚀 Starting BB MCP Server - Internal Developer Platform", file=sys.stderr)
+    print(f"📋 Transport: {args.transport.upper()}", file=sys.stderr)
+    print(f"🔧 Debug: {config.debug}", file=sys.stderr)
+    print(
+        f"🔐 Auth: {'Enabled' if config.enable_auth else 'Disabled'}",
+        file=sys.stderr,
+    )
     if args.transport in ["http", "streamable-http", "sse"]:
-        print(f"🌐 Host: {args.host}")
-        print(f"🌐 Port: {args.port}")
-    print("-" * 50)
+        print(f"🌐 Host: {args.host}", file=sys.stderr)
+        print(f"🌐 Port: {args.port}", file=sys.stderr)
+        print(f"👥 Workers: {args.workers}", file=sys.stderr)
+    print("-" * 50, file=sys.stderr)
 
     # Run the server
     run_server(
         transport=args.transport,
         host=args.host,
         port=args.port,
+        workers=args.workers,
         log_level="debug" if args.debug else "info",
     )
 
@@ -2,11 +2,15 @@
 
 from fastmcp import FastMCP, Context
 from core.factory import MCPToolBase, Domain
+from core.memory import pending_elicitation
+from core.warmup import WarmupCall
 
 
 class BBDemoService(MCPToolBase):
     """Demo service with template tools for BB Internal Developer Platform."""
 
+    warmup_calls = (WarmupCall("add_two_numbers", {"a": 1, "b": 2}),)
+
     def __init__(self):
         super().__init__(Domain.DEMO)
         self._tool_count = 2  # add_two_numbers, get_user_info
@@ -24,7 +28,11 @@ class BBDemoService(MCPToolBase):
             name="add_two_numbers",
             description="Adds two integer numbers together.",
             tags={self.domain.value, "math", "addition"},
-            meta={"version": "1.0", "author": "bb-platform"},
+            meta={
+                "version": "1.0",
+                "author": "bb-platform",
+                "cache": {"ttl": 3600, "max_entries": 1024},
+            },
         )
         def add(a: int, b: int) -> int:
             """Adds two integer numbers together."""
@@ -43,7 +51,8 @@ class BBDemoService(MCPToolBase):
         )
         async def get_user_info(ctx: Context, user_id: int) -> dict:
             """Retrieves user information by user_id with approval."""
-            result = await ctx.elicit("Choose an action")
+            with pending_elicitation():
+                result = await ctx.elicit("Choose an action")
 
             if result.action == "accept":
                 return {
@@ -65,7 +74,11 @@ class BBDemoService(MCPToolBase):
             description="Provides the application configuration.",
             tags={self.domain.value, "config", "settings"},
             mime_type="application/json",
-            meta={"version": "1.0", "author": "bb-platform"},
+            meta={
+                "version": "1.0",
+                "author": "bb-platform",
+                "cache": {"ttl": 60, "max_entries": 1},
+            },
         )
         def get_config() -> dict:
             """Provides the application configuration."""
@@ -78,7 +91,11 @@ class BBDemoService(MCPToolBase):
             description="Retrieves a user's telephone by ID.",
             mime_type="application/json",
             tags={self.domain.value, "user", "telephone"},
-            meta={"version": "1.0", "author": "bb-platform"},
+            meta={
+                "version": "1.0",
+                "author": "bb-platform",
+                "cache": {"ttl": 300, "max_entries": 1024},
+            },
         )
         def get_user_telephone(user_id: int) -> dict:
             """Retrieves a user's telephone by ID."""
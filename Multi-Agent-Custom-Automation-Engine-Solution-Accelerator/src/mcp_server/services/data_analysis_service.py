@@ -0,0 +1,72 @@
+"""
+Data analysis MCP tools service.
+"""
+
+import math
+import statistics
+from typing import Dict, List
+
+from core.executors import ExecutorPolicy
+from core.factory import Domain, MCPToolBase
+from core.warmup import WarmupCall
+
+
+def describe_data_points(data_points: List[float]) -> Dict[str, float]:
+    """Compute descriptive statistics for a list of numbers."""
+    if not data_points:
+        return {"count": 0}
+
+    ordered = sorted(data_points)
+    count = len(ordered)
+
+    def percentile(fraction: float) -> float:
+        position = (count - 1) * fraction
+        lower = math.floor(position)
+        upper = math.ceil(position)
+        if lower == upper:
+            return ordered[lower]
+        weight = position - lower
+        return ordered[lower] * (1 - weight) + ordered[upper] * weight
+
+    return {
+        "count": count,
+        "min": ordered[0],
+        "max": ordered[-1],
+        "mean": statistics.fmean(ordered),
+        "median": statistics.median(ordered),
+        "stdev": statistics.pstdev(ordered),
+        "p90": percentile(0.90),
+        "p99": percentile(0.99),
+    }
+
+
+class DataAnalysisService(MCPToolBase):
+    """CPU-bound analytics tools, executed in the factory's process pool."""
+
+    executor_policy = ExecutorPolicy.PROCESS
+
+    # Also waits for the process pool workers to start
+    warmup_calls = (WarmupCall("describe_data_points", {"data_points": [1.0, 2.0]}),)
+
+    def __init__(self):
+        super().__init__(Domain.DATA)
+
+    def register_tools(self, mcp) -> None:
+        """Register data analysis tools with the MCP server."""
+        mcp.tool(
+            name="describe_data_points",
+            description=(
+                "Computes count, min, max, mean, median, standard deviation "
+                "and percentiles for a list of numbers."
+            ),
+            tags={self.domain.value, "analytics"},
+        )(describe_data_points)
+
+    def readiness_checks(self, factory):
+        """Ready unless the started process pool stops answering."""
+        return {"process_pool": factory.executors.process_pool.check}
+
+    @property
+    def tool_count(self) -> int:
+        """Return the number of tools provided by this service."""
+        return 1
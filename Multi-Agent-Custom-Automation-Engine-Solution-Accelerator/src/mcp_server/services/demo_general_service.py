@@ -2,21 +2,37 @@
 General purpose MCP tools service.
 """
 
+from typing import List, Optional
+
 from core.factory import Domain, MCPToolBase
-from utils.date_utils import get_current_timestamp
-from utils.formatters import format_error_response, format_success_response
+from core.response_mode import set_session_response_mode
+from core.warmup import WarmupCall
+from fastmcp import Context
+from utils.date_utils import format_date_column, get_current_timestamp
+from utils.formatters import (
+    ResponseMode,
+    format_error_response,
+    format_success_response,
+)
 
 
 class GeneralService(MCPToolBase):
     """General purpose tools for common operations."""
 
+    warmup_calls = (
+        WarmupCall("greet_test", {"name": "warm-up"}),
+        WarmupCall("get_server_status"),
+        WarmupCall("format_dates", {"dates": ["2024-01-18", "01/18/2024"]}),
+    )
+
     def __init__(self):
         super().__init__(Domain.GENERAL)
 
     def register_tools(self, mcp) -> None:
         """Register general tools with the MCP server."""
 
-        @mcp.tool(tags={self.domain.value})
+        # output_schema=None lets structured response mode return the details
+        @mcp.tool(tags={self.domain.value}, output_schema=None)
         def greet_test(name: str) -> str:
             """Test for MCP - Greets the user with the provided name."""
             try:
@@ -35,7 +51,7 @@ class GeneralService(MCPToolBase):
                     error_message=str(e), context="greeting user"
                 )
 
-        @mcp.tool(tags={self.domain.value})
+        @mcp.tool(tags={self.domain.value}, output_schema=None)
         async def get_server_status() -> str:
             """Get the current server status and information."""
             try:
@@ -55,7 +71,56 @@ class GeneralService(MCPToolBase):
                     error_message=str(e), context="getting server status"
                 )
 
+        @mcp.tool(tags={self.domain.value}, output_schema=None)
+        async def set_response_mode(ctx: Context, mode: ResponseMode) -> str:
+            """
+            Choose how tool responses are rendered for the rest of this
+            session: full markdown, compact markdown or structured JSON.
+            """
+            try:
+                mode = ResponseMode(mode)
+                set_session_response_mode(ctx.session, mode)
+                return format_success_response(
+                    action="Response Mode Update",
+                    details={"response_mode": mode.value},
+                    summary=f"Responses in this session now use {mode.value} mode.",
+                )
+            except Exception as e:
+                return format_error_response(
+                    error_message=str(e), context="setting response mode"
+                )
+
+        # Large columns are CPU work: keep them off the event loop
+        @mcp.tool(
+            tags={self.domain.value},
+            output_schema=None,
+            meta={"executor": "shared"},
+        )
+        def format_dates(dates: List[str], day_first: Optional[bool] = None) -> str:
+            """
+            Normalize a whole column of dates to the user display format.
+            Ambiguous dd/mm and mm/dd dates are read in one order for the
+            whole column, detected from the values unless day_first is set.
+            """
+            try:
+                formatted, day_first = format_date_column(dates, day_first=day_first)
+                details = {
+                    "count": len(dates),
+                    "unique": len(set(dates)),
+                    "day_first": day_first,
+                    "formatted": formatted,
+                }
+                summary = f"Formatted {len(dates)} dates."
+
+                return format_success_response(
+                    action="Date Normalization", details=details, summary=summary
+                )
+            except Exception as e:
+                return format_error_response(
+                    error_message=str(e), context="formatting dates"
+                )
+
     @property
     def tool_count(self) -> int:
         """Return the number of tools provided by this service."""
-        return 2
+        return 4
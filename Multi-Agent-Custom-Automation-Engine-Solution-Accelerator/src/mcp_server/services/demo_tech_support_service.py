@@ -2,20 +2,53 @@
 Tech Support MCP tools service.
 """
 
+import asyncio
+from typing import List
+
 from core.factory import MCPToolBase, Domain
+from core.pipeline import COMPLETED, Step, StepResult, run_pipeline, tool_step
+from fastmcp import Client, Context
+from pydantic import BaseModel
+from utils.date_utils import get_clock
 from utils.formatters import format_success_response, format_error_response
 
+DEFAULT_BULK_PARALLEL = 8
+MAX_BULK_PARALLEL = 32
+MAX_LISTED_FAILURES = 10
+
+
+class NewHire(BaseModel):
+    """A new employee to onboard."""
+
+    employee_name: str
+    email_address: str
+    laptop_model: str
+    department: str = "General"
+    operating_system: str = "Windows 11"
+    access_level: str = "Standard"
+    systems: str = "Standard business systems"
+
 
 class TechSupportService(MCPToolBase):
     """Tech Support tools for IT setup and system configuration."""
 
+    # Provisioning calls are slow; keep them from crowding out other domains
+    max_concurrency = 32
+    max_queue = 128
+
     def __init__(self):
         super().__init__(Domain.TECH_SUPPORT)
 
     def register_tools(self, mcp) -> None:
         """Register tech support tools with the MCP server."""
 
-        @mcp.tool(tags={self.domain.value})
+        # output_schema=None lets structured response mode return the details.
+        # Retried calls for the same employee return the first result.
+        @mcp.tool(
+            tags={self.domain.value},
+            output_schema=None,
+            meta={"idempotency": {"key_args": ["employee_name", "email_address"]}},
+        )
         async def send_welcome_email(
             employee_name: str, email_address: str
         ) -> str:
@@ -43,7 +76,11 @@ class TechSupportService(MCPToolBase):
                     context="sending welcome email",
                 )
 
-        @mcp.tool(tags={self.domain.value})
+        @mcp.tool(
+            tags={self.domain.value},
+            output_schema=None,
+            meta={"max_concurrency": 8, "max_queue": 32},
+        )
         async def set_up_office_365_account(
             employee_name: str,
             email_address: str,
@@ -74,7 +111,7 @@ class TechSupportService(MCPToolBase):
                     context="setting up Office 365 account",
                 )
 
-        @mcp.tool(tags={self.domain.value})
+        @mcp.tool(tags={self.domain.value}, output_schema=None)
         async def configure_laptop(
             employee_name: str,
             laptop_model: str,
@@ -111,7 +148,7 @@ class TechSupportService(MCPToolBase):
                     context="configuring laptop",
                 )
 
-        @mcp.tool(tags={self.domain.value})
+        @mcp.tool(tags={self.domain.value}, output_schema=None)
         async def setup_vpn_access(
             employee_name: str, access_level: str = "Standard"
         ) -> str:
@@ -140,7 +177,11 @@ class TechSupportService(MCPToolBase):
                     context="setting up VPN access",
                 )
 
-        @mcp.tool(tags={self.domain.value})
+        @mcp.tool(
+            tags={self.domain.value},
+            output_schema=None,
+            meta={"idempotency": {"key_args": ["employee_name", "systems"]}},
+        )
         async def create_system_accounts(
             employee_name: str, systems: str = "Standard business systems"
         ) -> str:
@@ -169,7 +210,259 @@ class TechSupportService(MCPToolBase):
                     context="creating system accounts",
                 )
 
+        def onboarding_steps(client: Client, hire: NewHire) -> List[Step]:
+            """
+            Onboarding steps for one employee, as a dependency graph.
+
+            Each step calls its tool through ``client``, a client of this
+            server, so retries are deduplicated and the tool bulkheads apply.
+            """
+            return [
+                tool_step(
+                    client,
+                    "create_system_accounts",
+                    {"employee_name": hire.employee_name, "systems": hire.systems},
+                ),
+                tool_step(
+                    client,
+                    "set_up_office_365_account",
+                    {
+                        "employee_name": hire.employee_name,
+                        "email_address": hire.email_address,
+                        "department": hire.department,
+                    },
+                ),
+                tool_step(
+                    client,
+                    "configure_laptop",
+                    {
+                        "employee_name": hire.employee_name,
+                        "laptop_model": hire.laptop_model,
+                        "operating_system": hire.operating_system,
+                    },
+                ),
+                tool_step(
+                    client,
+                    "setup_vpn_access",
+                    {
+                        "employee_name": hire.employee_name,
+                        "access_level": hire.access_level,
+                    },
+                    depends_on=("create_system_accounts",),
+                ),
+                tool_step(
+                    client,
+                    "send_welcome_email",
+                    {
+                        "employee_name": hire.employee_name,
+                        "email_address": hire.email_address,
+                    },
+                    depends_on=(
+                        "create_system_accounts",
+                        "set_up_office_365_account",
+                    ),
+                ),
+            ]
+
+        async def step_concurrency(ctx: Context, steps: List[Step]) -> int:
+            """Concurrency of the tightest bulkhead the steps' tools run in."""
+            limits = [self.max_concurrency or MAX_BULK_PARALLEL]
+            for step in steps:
+                tool = await ctx.fastmcp.get_tool(step.name)
+                limit = (tool.meta or {}).get("max_concurrency")
+                if limit:
+                    limits.append(int(limit))
+            return min(limits)
+
+        # Workflows call the tools above through the server, so they take
+        # no domain slot their steps would wait for
+        @mcp.tool(
+            tags={self.domain.value, "workflow"},
+            output_schema=None,
+            meta={"domain_bulkhead": False, "max_concurrency": 16, "max_queue": 64},
+        )
+        async def onboard_employee(
+            ctx: Context,
+            employee_name: str,
+            email_address: str,
+            laptop_model: str,
+            department: str = "General",
+            operating_system: str = "Windows 11",
+            access_level: str = "Standard",
+            systems: str = "Standard business systems",
+        ) -> str:
+            """
+            Run every onboarding step for a new employee in one call.
+
+            Steps run as a dependency graph: accounts are created before VPN
+            access and the welcome email, and independent steps run
+            concurrently. Progress is reported after each step.
+            """
+            hire = NewHire(
+                employee_name=employee_name,
+                email_address=email_address,
+                laptop_model=laptop_model,
+                department=department,
+                operating_system=operating_system,
+                access_level=access_level,
+                systems=systems,
+            )
+            clock = get_clock()
+            finished = 0
+
+            async def report(step: StepResult) -> None:
+                nonlocal finished
+                finished += 1
+                await ctx.report_progress(
+                    progress=finished,
+                    total=len(steps),
+                    message=f"{step.name} {step.status} in {step.duration:.3f}s",
+                )
+
+            try:
+                started = clock.monotonic()
+                async with Client(ctx.fastmcp) as client:
+                    steps = onboarding_steps(client, hire)
+                    results = await run_pipeline(
+                        steps, on_step_done=report, clock=clock.monotonic
+                    )
+                elapsed = clock.monotonic() - started
+            except Exception as e:
+                return format_error_response(
+                    error_message=str(e),
+                    context="onboarding employee",
+                )
+
+            details = {"employee_name": employee_name, "email_address": email_address}
+            for name, result in results.items():
+                timing = f"{result.status} in {result.duration:.3f}s"
+                details[name] = f"{timing} ({result.error})" if result.error else timing
+            completed = sum(r.status == COMPLETED for r in results.values())
+            details["total_time"] = f"{elapsed:.3f}s"
+
+            if completed < len(steps):
+                return format_error_response(
+                    error_message=(
+                        f"{completed} of {len(steps)} onboarding steps completed "
+                        f"for {employee_name}"
+                    ),
+                    context="; ".join(
+                        f"{name}: {details[name]}"
+                        for name in results
+                        if results[name].status != COMPLETED
+                    ),
+                )
+
+            return format_success_response(
+                action="Employee Onboarding",
+                details=details,
+                summary=(
+                    f"All {len(steps)} onboarding steps completed for "
+                    f"{employee_name} in {elapsed:.3f}s."
+                ),
+            )
+
+        @mcp.tool(
+            tags={self.domain.value, "workflow"},
+            output_schema=None,
+            meta={"domain_bulkhead": False, "max_concurrency": 2, "max_queue": 8},
+        )
+        async def bulk_onboard_employees(
+            ctx: Context,
+            employees: List[NewHire],
+            max_parallel: int = DEFAULT_BULK_PARALLEL,
+        ) -> str:
+            """
+            Onboard a cohort of new employees in one call.
+
+            Employees are processed concurrently, at most ``max_parallel`` at
+            a time, and never more than the tightest bulkhead of the step
+            tools admits. A progress notification is sent as each employee
+            finishes, and the result is a compact summary of the cohort.
+            """
+            if not employees:
+                return format_error_response(
+                    error_message="No employees to onboard",
+                    context="bulk onboarding",
+                )
+
+            clock = get_clock()
+            finished = 0
+            failures: List[str] = []
+            durations: List[float] = []
+
+            async def onboard(
+                client: Client, limit: asyncio.Semaphore, hire: NewHire
+            ) -> None:
+                nonlocal finished
+                async with limit:
+                    started = clock.monotonic()
+                    try:
+                        results = await run_pipeline(
+                            onboarding_steps(client, hire), clock=clock.monotonic
+                        )
+                        failed = [
+                            f"{r.name}: {r.error}"
+                            for r in results.values()
+                            if r.status != COMPLETED
+                        ]
+                    except Exception as e:
+                        failed = [str(e)]
+                    duration = clock.monotonic() - started
+
+                durations.append(duration)
+                finished += 1
+                if failed:
+                    failures.append(f"{hire.employee_name} ({failed[0]})")
+                    message = f"{hire.employee_name}: failed ({failed[0]})"
+                else:
+                    message = f"{hire.employee_name}: onboarded in {duration:.3f}s"
+                await ctx.report_progress(
+                    progress=finished, total=len(employees), message=message
+                )
+
+            started = clock.monotonic()
+            async with Client(ctx.fastmcp) as client:
+                # Each employee calls every step tool once; running more of
+                # them than a step bulkhead admits would only queue and then
+                # shed step calls
+                tightest = await step_concurrency(
+                    ctx, onboarding_steps(client, employees[0])
+                )
+                limit = asyncio.Semaphore(
+                    max(1, min(max_parallel, MAX_BULK_PARALLEL, tightest))
+                )
+                await asyncio.gather(
+                    *(onboard(client, limit, hire) for hire in employees)
+                )
+            elapsed = clock.monotonic() - started
+
+            details = {
+                "employees": len(employees),
+                "onboarded": len(employees) - len(failures),
+                "failed": len(failures),
+                "total_time": f"{elapsed:.3f}s",
+                "average_time_per_employee": (
+                    f"{sum(durations) / len(durations):.3f}s"
+                ),
+            }
+            if failures:
+                shown = failures[:MAX_LISTED_FAILURES]
+                more = len(failures) - len(shown)
+                details["failures"] = "; ".join(shown) + (
+                    f"; and {more} more" if more else ""
+                )
+
+            return format_success_response(
+                action="Bulk Employee Onboarding",
+                details=details,
+                summary=(
+                    f"Onboarded {details['onboarded']} of {len(employees)} "
+                    f"employees in {elapsed:.3f}s."
+                ),
+            )
+
     @property
     def tool_count(self) -> int:
         """Return the number of tools provided by this service."""
-        return 5
+        return 7
@@ -2,54 +2,284 @@
 Date and time utilities for MCP server.
 """
 
+import math
+import re
+import sys
+import time
 from datetime import datetime, timezone
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
+DATE_CACHE_SIZE = 4096
+CALLER_CACHE_SIZE = 1024
+DEFAULT_CLOCK_RESOLUTION = 0.0
+DISPLAY_FORMAT = "%B %d, %Y at %I:%M %p"
 
-def format_date_for_user(date_str: str) -> str:
+# One pass per family instead of trying each strptime format in turn:
+# %Y-%m-%d with an optional " %H:%M:%S", "T%H:%M:%S" or "T%H:%M:%SZ" time,
+# and the ambiguous %m/%d/%Y and %d/%m/%Y.
+_ISO_DATE = re.compile(
+    r"(\d{4})-(\d{1,2})-(\d{1,2})(?:([ T])(\d{1,2}):(\d{1,2}):(\d{1,2})(Z?))?"
+)
+_SLASH_DATE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+
+
+def _valid_date(year: int, month: int, day: int) -> Optional[datetime]:
+    try:
+        return datetime(year, month, day)
+    except ValueError:
+        return None
+
+
+def _read_date(
+    date_str: str,
+) -> Tuple[Optional[datetime], Optional[datetime], Optional[bool]]:
     """
-    Format a date string for user-friendly display.
+    Parse a date string once, in both orders.
+
+    Returns the month-first and the day-first reading (the same date unless
+    the string is an ambiguous slashed date, ``None`` if unsupported) and,
+    for slashed dates that only one order can read, whether that order is
+    day-first.
+    """
+    match = _ISO_DATE.fullmatch(date_str)
+    if match is not None:
+        year, month, day, separator, hour, minute, second, zulu = match.groups()
+        if zulu and separator != "T":
+            return None, None, None
+        try:
+            parsed = datetime(
+                int(year),
+                int(month),
+                int(day),
+                int(hour or 0),
+                int(minute or 0),
+                int(second or 0),
+            )
+        except ValueError:
+            return None, None, None
+        return parsed, parsed, None
+
+    match = _SLASH_DATE.fullmatch(date_str)
+    if match is None:
+        return None, None, None
+
+    first, second, year = (int(group) for group in match.groups())
+    month_first = _valid_date(year, first, second)
+    day_first_date = _valid_date(year, second, first)
+
+    if month_first is not None and day_first_date is not None:
+        return month_first, day_first_date, None
+    if day_first_date is not None:
+        return day_first_date, day_first_date, True
+    if month_first is not None:
+        return month_first, month_first, False
+    return None, None, None
+
+
+def detect_date(
+    date_str: str, day_first: bool = False
+) -> Tuple[Optional[datetime], Optional[bool]]:
+    """
+    Parse a date string in a single pass.
 
     Args:
-        date_str: Input date string in various formats
+        date_str: Input date string
+        day_first: Read ambiguous dd/mm/yyyy dates before mm/dd/yyyy
 
     Returns:
-        Formatted date string
+        The parsed date (``None`` if unsupported) and, for slashed dates
+        that only one order can read, whether that order is day-first
     """
-    try:
-        # Try to parse common date formats
-        date_formats = [
-            "%Y-%m-%d",
-            "%Y-%m-%d %H:%M:%S",
-            "%Y-%m-%dT%H:%M:%S",
-            "%Y-%m-%dT%H:%M:%SZ",
-            "%m/%d/%Y",
-            "%d/%m/%Y",
-        ]
+    month_first, day_first_date, order = _read_date(date_str)
+    return (day_first_date if day_first else month_first), order
+
+
+# DISPLAY_FORMAT pieces rendered once with strftime, so they follow the
+# process locale like strftime itself: month names and every "%I:%M %p"
+_MONTH_NAMES = [""] + [datetime(2000, m, 1).strftime("%B") for m in range(1, 13)]
+_CLOCK_TIMES = [
+    datetime(2000, 1, 1, minute // 60, minute % 60).strftime("%I:%M %p")
+    for minute in range(24 * 60)
+]
+
+
+def _display(value: datetime) -> str:
+    """``value.strftime(DISPLAY_FORMAT)`` from the precomputed pieces."""
+    return (
+        f"{_MONTH_NAMES[value.month]} {value.day:02d}, {value.year} at "
+        f"{_CLOCK_TIMES[value.hour * 60 + value.minute]}"
+    )
+
 
-        parsed_date = None
-        for fmt in date_formats:
-            try:
-                parsed_date = datetime.strptime(date_str, fmt)
-                break
-            except ValueError:
-                continue
+def _format_readings(date_str: str) -> Tuple[str, str, Optional[bool]]:
+    """Month-first and day-first display text of a date, and its order."""
+    month_first, day_first, order = _read_date(date_str)
+    if month_first is None:
+        return date_str, date_str, None
+    if day_first is month_first:
+        text = _display(month_first)
+        return text, text, order
+    return _display(month_first), _display(day_first), order
+
+
+_format_cached = lru_cache(maxsize=DATE_CACHE_SIZE)(_format_readings)
+
+
+class DateParser:
+    """
+    Date formatter for one caller, such as one HR export.
+
+    With ``day_first=None`` the parser starts month-first and remembers the
+    order of the last slashed date that only one order could read, so the
+    ambiguous dates of a day-first export are read day-first as well.
+    """
 
-        if parsed_date is None:
-            # If parsing fails, return the original string
+    def __init__(self, day_first: Optional[bool] = None):
+        self.learns = day_first is None
+        self.day_first = bool(day_first)
+
+    def format(self, date_str: str) -> str:
+        """Format a date string for display, or return it unchanged."""
+        try:
+            *texts, order = _format_cached(date_str)
+        except Exception:
             return date_str
+        if order is not None and self.learns:
+            self.day_first = order
+        return texts[self.day_first]
+
+
+@lru_cache(maxsize=CALLER_CACHE_SIZE)
+def _caller_parser(caller: str, day_first: Optional[bool]) -> DateParser:
+    return DateParser(day_first)
 
-        # Format for user display
-        return parsed_date.strftime("%B %d, %Y at %I:%M %p")
 
+def get_date_parser(caller: str, day_first: Optional[bool] = None) -> DateParser:
+    """
+    Return the parser that remembers the date order used by ``caller``.
+
+    Parsers are kept per caller and ``day_first``; the least recently used
+    are dropped beyond ``CALLER_CACHE_SIZE`` callers.
+    """
+    return _caller_parser(caller, day_first)
+
+
+def format_date_for_user(
+    date_str: str,
+    day_first: Optional[bool] = None,
+    caller: Optional[str] = None,
+) -> str:
+    """
+    Format a date string for user-friendly display.
+
+    Args:
+        date_str: Input date string in various formats
+        day_first: Read ambiguous dates as dd/mm/yyyy instead of mm/dd/yyyy
+        caller: Remember the date order per caller (see ``DateParser``)
+
+    Returns:
+        Formatted date string, or the input if it cannot be parsed
+    """
+    if caller is not None:
+        return get_date_parser(caller, day_first).format(date_str)
+    try:
+        return _format_cached(date_str)[bool(day_first)]
     except Exception:
-        # If any error occurs, return the original string
         return date_str
 
 
+class Clock:
+    """
+    Wall-clock and monotonic time for the server.
+
+    By default wall time keeps full precision. With a ``resolution`` in
+    seconds it is truncated to that tick and its ISO string is formatted
+    once per tick, so every response within a tick shares one string.
+    ``monotonic()`` is the source for measuring durations.
+    """
+
+    def __init__(
+        self,
+        resolution: float = DEFAULT_CLOCK_RESOLUTION,
+        wall: Callable[[], float] = time.time,
+        monotonic: Callable[[], float] = time.perf_counter,
+    ):
+        if resolution < 0:
+            raise ValueError("Clock resolution cannot be negative")
+        self.resolution = resolution
+        self._wall = wall
+        self._monotonic = monotonic
+        self._cached: Tuple[Optional[float], str] = (None, "")
+
+    def _tick(self) -> float:
+        now = self._wall()
+        if self.resolution:
+            return math.floor(now / self.resolution) * self.resolution
+        return now
+
+    def now(self) -> datetime:
+        """Current UTC time, truncated to the resolution."""
+        return datetime.fromtimestamp(self._tick(), timezone.utc)
+
+    def timestamp(self) -> str:
+        """Current UTC time in ISO format, cached for the current tick."""
+        if not self.resolution:
+            return datetime.fromtimestamp(self._wall(), timezone.utc).isoformat()
+        tick = self._tick()
+        cached_tick, text = self._cached
+        if tick != cached_tick:
+            text = datetime.fromtimestamp(tick, timezone.utc).isoformat()
+            self._cached = (tick, text)
+        return text
+
+    def monotonic(self) -> float:
+        """Seconds from an arbitrary origin that never goes backwards."""
+        return self._monotonic()
+
+
+class SimulatedClock(Clock):
+    """A clock that only moves when ``advance`` is called."""
+
+    def __init__(
+        self,
+        start: datetime = datetime(2024, 1, 1, tzinfo=timezone.utc),
+        resolution: float = DEFAULT_CLOCK_RESOLUTION,
+    ):
+        self.wall_time = start.timestamp()
+        self.elapsed = 0.0
+        super().__init__(
+            resolution,
+            wall=lambda: self.wall_time,
+            monotonic=lambda: self.elapsed,
+        )
+
+    def advance(self, seconds: float) -> None:
+        """Move wall and monotonic time forward."""
+        if seconds < 0:
+            raise ValueError("A clock cannot go backwards")
+        self.wall_time += seconds
+        self.elapsed += seconds
+
+
+_clock = Clock()
+
+
+def get_clock() -> Clock:
+    """Return the clock used for timestamps and durations."""
+    return _clock
+
+
+def set_clock(clock: Clock) -> Clock:
+    """Replace the clock (for example with a ``SimulatedClock``); return the old one."""
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
+
+
 def get_current_timestamp() -> str:
     """Get current timestamp in ISO format."""
-    return datetime.now(timezone.utc).isoformat()
+    return _clock.timestamp()
 
 
 def format_timestamp_for_display(timestamp: Optional[str] = None) -> str:
@@ -63,7 +293,7 @@ def format_timestamp_for_display(timestamp: Optional[str] = None) -> str:
         Formatted timestamp string
     """
     if timestamp is None:
-        dt = datetime.now(timezone.utc)
+        dt = _clock.now()
     else:
         try:
             dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
@@ -71,3 +301,183 @@ def format_timestamp_for_display(timestamp: Optional[str] = None) -> str:
             return timestamp or "Unknown time"
 
     return dt.strftime("%B %d, %Y at %I:%M %p UTC")
+
+
+def _dedupe_map(values: Sequence[Any], fn: Callable[[Any], Any]) -> List[Any]:
+    """Apply ``fn`` once per distinct value and map the results back."""
+    results: Dict[Any, Any] = {}
+    output = []
+    for value in values:
+        try:
+            output.append(results[value])
+        except KeyError:
+            results[value] = fn(value)
+            output.append(results[value])
+        except TypeError:  # unhashable input
+            output.append(fn(value))
+    return output
+
+
+def detect_day_first(dates: Iterable[str]) -> bool:
+    """
+    Decide the date order of a whole column.
+
+    Returns True when some slashed date can only be read day-first and none
+    can only be read month-first.
+    """
+    orders = set()
+    for value in dates:
+        if isinstance(value, str):
+            orders.add(_format_cached(value)[2])
+    return True in orders and False not in orders
+
+
+def _numpy():
+    """
+    Return NumPy if it is loaded.
+
+    NumPy is optional and never imported here: array input means the
+    caller has already loaded it.
+    """
+    return sys.modules.get("numpy")
+
+
+def _is_array(values: Any) -> bool:
+    np = _numpy()
+    return np is not None and isinstance(values, np.ndarray)
+
+
+def _is_datetime_array(values: Any) -> bool:
+    return _is_array(values) and values.dtype.kind == "M"
+
+
+@lru_cache(maxsize=4)
+def _clock_table(suffix: str) -> Any:
+    """``_CLOCK_TIMES`` with ``suffix`` appended, as an object array."""
+    return _numpy().array([f"{text}{suffix}" for text in _CLOCK_TIMES], dtype=object)
+
+
+def _format_datetime64_rows(values: Any, suffix: str) -> Any:
+    """Format a ``datetime64`` array one value at a time."""
+    np = _numpy()
+    formatted = np.empty(values.shape, dtype=object)
+    for index, value in np.ndenumerate(values.astype("datetime64[m]")):
+        item = value.item()
+        if isinstance(item, datetime):
+            formatted[index] = f"{_display(item)}{suffix}"
+        elif np.isnat(value):
+            formatted[index] = "NaT"
+        else:
+            # Outside the years datetime supports: keep the ISO text
+            formatted[index] = f"{np.datetime_as_string(value)}{suffix}"
+    return formatted
+
+
+def _format_datetime64(values: Any, suffix: str = "") -> Any:
+    """
+    Format a ``datetime64`` array with ``DISPLAY_FORMAT``.
+
+    Each distinct day is formatted once and the time of day is looked up
+    in the precomputed clock table; rows are then built by concatenating
+    the two object arrays. Arrays with years outside 1-9999, which
+    ``datetime`` cannot hold, are formatted one value at a time.
+    """
+    np = _numpy()
+    missing = np.isnat(values)
+    minutes = values.astype("datetime64[m]")
+    days = minutes.astype("datetime64[D]")
+    present = days[~missing]
+    if present.size and (
+        present.min() < np.datetime64("0001-01-01")
+        or present.max() > np.datetime64("9999-12-31")
+    ):
+        return _format_datetime64_rows(values, suffix)
+
+    minute_of_day = np.where(missing, 0, (minutes - days).astype(np.int64))
+    unique_days, day_index = np.unique(days, return_inverse=True)
+    day_text = np.array(
+        [
+            f"{_MONTH_NAMES[d.month]} {d.day:02d}, {d.year} at " if d is not None else ""
+            for d in unique_days.astype(object)
+        ],
+        dtype=object,
+    )
+    formatted = day_text[day_index.reshape(values.shape)] + _clock_table(suffix)[
+        minute_of_day
+    ]
+    formatted[missing] = "NaT"
+    return formatted
+
+
+def format_date_column(
+    dates: Any, day_first: Optional[bool] = None
+) -> Tuple[Any, bool]:
+    """
+    Format a column of dates and return the date order it was read in.
+
+    Each distinct string is parsed once, in both orders; the order of the
+    column (see ``detect_day_first``) is taken from those same parses. The
+    column is deduplicated here rather than through the shared LRU, which a
+    large column would only flush.
+    """
+    if _is_datetime_array(dates):
+        return _format_datetime64(dates), bool(day_first)
+
+    is_array = _is_array(dates)
+    values = dates.tolist() if is_array else list(dates)
+    readings: Dict[str, Tuple[str, str, Optional[bool]]] = {}
+    for value in values:
+        if isinstance(value, str) and value not in readings:
+            readings[value] = _format_readings(value)
+
+    if day_first is None:
+        orders = {reading[2] for reading in readings.values()}
+        day_first = True in orders and False not in orders
+    pick = 1 if day_first else 0
+    texts = {value: reading[pick] for value, reading in readings.items()}
+    try:
+        formatted = [texts[value] for value in values]
+    except (KeyError, TypeError):  # values that are not strings
+        formatted = [
+            texts[value] if isinstance(value, str) else format_date_for_user(value)
+            for value in values
+        ]
+    return (_numpy().array(formatted, dtype=object) if is_array else formatted), bool(
+        day_first
+    )
+
+
+def format_dates_for_user(dates: Any, day_first: Optional[bool] = None) -> Any:
+    """
+    Format a column of dates for display.
+
+    Args:
+        dates: A sequence of date strings, or a NumPy array of strings or
+            ``datetime64`` values
+        day_first: Date order of ambiguous slashed dates; detected from the
+            whole column when None (see ``detect_day_first``)
+
+    Returns:
+        A NumPy array for array input, otherwise a list
+    """
+    return format_date_column(dates, day_first)[0]
+
+
+def format_timestamps_for_display(timestamps: Any) -> Any:
+    """
+    Format a column of timestamps for display.
+
+    Args:
+        timestamps: A sequence of ISO timestamp strings, or a NumPy array of
+            strings or ``datetime64`` values (read as UTC)
+
+    Returns:
+        A NumPy array for array input, otherwise a list
+    """
+    if _is_datetime_array(timestamps):
+        return _format_datetime64(timestamps, suffix=" UTC")
+
+    is_array = _is_array(timestamps)
+    values = timestamps.tolist() if is_array else list(timestamps)
+    formatted = _dedupe_map(values, format_timestamp_for_display)
+    return _numpy().array(formatted, dtype=object) if is_array else formatted
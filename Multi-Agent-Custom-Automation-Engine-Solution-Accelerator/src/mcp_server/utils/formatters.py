@@ -1,8 +1,86 @@
 """
 Response formatting utilities for MCP tools.
+
+Responses are rendered in one of three modes, chosen per request or per
+session (see ``core.response_mode``):
+
+* ``full``: markdown with the agent instructions (the default);
+* ``compact``: a short markdown summary without the boilerplate;
+* ``structured``: the raw details as JSON, also returned to the client as
+  MCP structured content.
 """
 
-from typing import Dict, Any, Optional
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Any, Iterator, Optional
+
+
+class ResponseMode(str, Enum):
+    """How formatter-based tools render their responses."""
+
+    FULL = "full"
+    COMPACT = "compact"
+    STRUCTURED = "structured"
+
+
+@dataclass
+class ResponseState:
+    """Mode of the current call, its structured payload and whether it failed."""
+
+    mode: ResponseMode = ResponseMode.FULL
+    structured: Optional[Dict[str, Any]] = None
+    error: bool = False
+
+
+_response_state: ContextVar[Optional[ResponseState]] = ContextVar(
+    "response_state", default=None
+)
+
+
+@contextmanager
+def response_mode(mode: ResponseMode) -> Iterator[ResponseState]:
+    """Render every response produced inside the block in ``mode``."""
+    state = ResponseState(mode=ResponseMode(mode))
+    token = _response_state.set(state)
+    try:
+        yield state
+    finally:
+        _response_state.reset(token)
+
+
+def current_response_state() -> Optional[ResponseState]:
+    """State of the call being rendered, if a mode was selected for it."""
+    return _response_state.get()
+
+
+def current_response_mode() -> ResponseMode:
+    """Mode of the response being rendered."""
+    state = _response_state.get()
+    return state.mode if state is not None else ResponseMode.FULL
+
+
+def _structured(payload: Dict[str, Any]) -> str:
+    """Record ``payload`` as the call's structured content and return its JSON."""
+    text = json.dumps(payload, default=str, separators=(",", ":"))
+    state = _response_state.get()
+    if state is not None:
+        state.structured = json.loads(text)
+    return text
+
+
+STANDARD_INSTRUCTIONS = (
+    "Instructions: returning the output of this function call verbatim "
+    "to the user in markdown. Then write AGENT SUMMARY: and then include "
+    "a summary of what you did."
+)
+
+
+def format_label(key: str) -> str:
+    """Turn a content key such as ``email_address`` into ``Email Address``."""
+    return key.replace("_", " ").title()
 
 
 def format_mcp_response(
@@ -23,27 +101,25 @@ def format_mcp_response(
     Returns:
         Formatted markdown response
     """
+    # Full mode is the default and the hot path: read the state directly
+    # rather than resolving the mode through the enum.
+    state = _response_state.get()
+    if state is not None and state.mode is not ResponseMode.FULL:
+        if state.mode is ResponseMode.STRUCTURED:
+            return _structured(content)
+        fields = "; ".join(
+            f"{format_label(key)}: {value}" for key, value in content.items()
+        )
+        return f"**{title}**\n{fields}\n{agent_summary}"
+
     response_parts = [f"##### {title}\n"]
 
-    # Add content fields
     for key, value in content.items():
-        formatted_key = key.replace("_", " ").title()
-        response_parts.append(
-            f"**{formatted_key}:** {value}"
-        )
-
-    response_parts.append("")  # Empty line
+        response_parts.append(f"**{key.replace('_', ' ').title()}:** {value}")
 
-    # Add agent summary
+    response_parts.append("")
     response_parts.append(f"AGENT SUMMARY: {agent_summary}")
-
-    # Add standard instructions
-    standard_instructions = (
-        "Instructions: returning the output of this function call verbatim "
-        "to the user in markdown. Then write AGENT SUMMARY: and then include "
-        "a summary of what you did."
-    )
-    response_parts.append(standard_instructions)
+    response_parts.append(STANDARD_INSTRUCTIONS)
 
     if additional_instructions:
         response_parts.append(additional_instructions)
@@ -64,6 +140,16 @@ def format_error_response(
     Returns:
         Formatted error response
     """
+    state = _response_state.get()
+    if state is not None:
+        state.error = True
+    mode = current_response_mode()
+    if mode is ResponseMode.STRUCTURED:
+        return _structured({"error": error_message, "context": context})
+    if mode is ResponseMode.COMPACT:
+        where = f" ({context})" if context else ""
+        return f"**Error{where}:** {error_message}"
+
     response_parts = ["##### ❌ Error\n"]
 
     if context:
@@ -78,6 +164,34 @@ def format_error_response(
     return "\n".join(response_parts)
 
 
+def parse_error_response(text: str) -> Optional[str]:
+    """
+    Error message of a response rendered by ``format_error_response``.
+
+    Args:
+        text: Text output of a tool, in any response mode
+
+    Returns:
+        The error message, or None if ``text`` is not an error response
+    """
+    if text.startswith("##### ❌ Error\n"):
+        message = text.partition("**Error:** ")[2]
+        return message.partition("\n\nAGENT SUMMARY:")[0]
+    if text.startswith("**Error"):
+        head, found, message = text.partition(":** ")
+        if found and (head == "**Error" or head.startswith("**Error (")):
+            return message
+        return None
+    if text.startswith('{"error":'):
+        try:
+            payload = json.loads(text)
+        except ValueError:
+            return None
+        if isinstance(payload, dict) and set(payload) == {"error", "context"}:
+            return str(payload["error"])
+    return None
+
+
 def format_success_response(
     action: str, details: Dict[str, Any], summary: Optional[str] = None
 ) -> str:
@@ -99,3 +213,15 @@ def format_success_response(
         content=details,
         agent_summary=auto_summary,
     )
+
+
+def measure_response_sizes(
+    action: str, details: Dict[str, Any], summary: Optional[str] = None
+) -> Dict[str, int]:
+    """Return the UTF-8 size in bytes of a success response in every mode."""
+    sizes = {}
+    for mode in ResponseMode:
+        with response_mode(mode):
+            text = format_success_response(action, details, summary)
+        sizes[mode.value] = len(text.encode("utf-8"))
+    return sizes
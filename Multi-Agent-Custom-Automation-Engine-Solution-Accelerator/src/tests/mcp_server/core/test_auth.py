@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from authlib.jose import JsonWebKey
+from fastmcp.server.auth.auth import AccessToken
+from fastmcp.server.auth.providers.jwt import RSAKeyPair
+
+from core import auth as auth_module
+from core.auth import CachedJWKSVerifier, JWKSKeyCache, VerifiedTokenCache
+
+ISSUER = "https://issuer.test"
+AUDIENCE = "api://mcp"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def jwks(*pairs):
+    keys = []
+    for kid, key_pair in pairs:
+        key = JsonWebKey.import_key(key_pair.public_key, {"kty": "RSA"}).as_dict()
+        keys.append({**key, "kid": kid, "use": "sig"})
+    return {"keys": keys}
+
+
+def token(key_pair, kid):
+    return key_pair.create_token(issuer=ISSUER, audience=AUDIENCE, kid=kid)
+
+
+@pytest.fixture(scope="module")
+def key_pairs():
+    return RSAKeyPair.generate(), RSAKeyPair.generate()
+
+
+async def wait_for(predicate):
+    for _ in range(200):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+@pytest.mark.asyncio
+async def test_verifier_uses_local_jwks_file(tmp_path, key_pairs):
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps(jwks(("k1", key_pairs[0]))))
+    key_cache = JWKSKeyCache(jwks_file=str(path))
+    assert key_cache.prefetch() is True
+
+    verifier = CachedJWKSVerifier(key_cache=key_cache, issuer=ISSUER, audience=AUDIENCE)
+    try:
+        access = await verifier.verify_token(token(key_pairs[0], "k1"))
+    finally:
+        key_cache.stop()
+
+    assert access is not None
+    assert access.claims["iss"] == ISSUER
+    assert key_cache.stats()["kids"] == ["k1"]
+    assert key_cache.stats()["source"].startswith("file://")
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_is_rejected_and_refreshed_in_background(tmp_path, key_pairs):
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps(jwks(("k1", key_pairs[0]))))
+    key_cache = JWKSKeyCache(jwks_file=str(path))
+    key_cache.prefetch()
+    verifier = CachedJWKSVerifier(key_cache=key_cache, issuer=ISSUER, audience=AUDIENCE)
+
+    # The provider rotated to k2: the request is rejected without a fetch
+    path.write_text(json.dumps(jwks(("k1", key_pairs[0]), ("k2", key_pairs[1]))))
+    try:
+        assert await verifier.verify_token(token(key_pairs[1], "k2")) is None
+        assert key_cache.fetches == 1
+
+        await wait_for(lambda: key_cache.fetches == 2)
+        assert await verifier.verify_token(token(key_pairs[1], "k2")) is not None
+    finally:
+        key_cache.stop()
+
+
+def test_prefetch_honours_max_age(monkeypatch, key_pairs):
+    clock = FakeClock()
+
+    def fake_get(url, timeout):
+        return httpx.Response(
+            200,
+            json=jwks(("k1", key_pairs[0])),
+            headers={"cache-control": "public, max-age=120"},
+            request=httpx.Request("GET", url),
+        )
+
+    monkeypatch.setattr(auth_module.httpx, "get", fake_get)
+    key_cache = JWKSKeyCache(jwks_uri="https://issuer.test/keys", clock=clock)
+
+    assert key_cache.prefetch() is True
+    assert key_cache.seconds_until_refresh() == pytest.approx(96.0)
+    clock.now += 100
+    assert key_cache.seconds_until_refresh() == 0.0
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_cached_keys(tmp_path, key_pairs):
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps(jwks(("k1", key_pairs[0]))))
+    key_cache = JWKSKeyCache(jwks_file=str(path), clock=FakeClock())
+    key_cache.prefetch()
+    path.unlink()
+
+    assert await key_cache.refresh() is False
+    assert key_cache.get("k1") is not None
+    assert key_cache.failures == 1
+    assert key_cache.seconds_until_refresh() == 1.0
+
+
+@pytest.mark.asyncio
+async def test_failed_prefetch_recovers_without_a_token(tmp_path, key_pairs):
+    path = tmp_path / "jwks.json"
+    key_cache = JWKSKeyCache(jwks_file=str(path))
+    assert key_cache.prefetch() is False
+
+    try:
+        assert await key_cache.ensure_loaded() is False
+        assert key_cache.stats()["refreshing"] is True
+
+        path.write_text(json.dumps(jwks(("k1", key_pairs[0]))))
+        assert await key_cache.ensure_loaded() is True
+        assert key_cache.get("k1") is not None
+    finally:
+        key_cache.stop()
+
+
+def test_key_cache_requires_a_source():
+    with pytest.raises(ValueError):
+        JWKSKeyCache()
+
+
+def access_token(expires_at):
+    return AccessToken(token="t", client_id="c", scopes=[], expires_at=expires_at)
+
+
+def test_token_cache_expires_at_token_exp():
+    clock = FakeClock()
+    cache = VerifiedTokenCache(max_entries=2, clock=clock)
+    cache.put("a", access_token(1010), generation=1)
+
+    assert cache.get("a", generation=1).expires_at == 1010
+    clock.now = 1010
+    assert cache.get("a", generation=1) is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 0}
+
+
+def test_token_cache_is_bounded_and_skips_tokens_without_exp():
+    cache = VerifiedTokenCache(max_entries=2, clock=FakeClock())
+    cache.put("none", access_token(None), generation=1)
+    for name in ("a", "b", "c"):
+        cache.put(name, access_token(2000), generation=1)
+
+    assert cache.get("none", generation=1) is None
+    assert cache.get("a", generation=1) is None
+    assert cache.get("c", generation=1) is not None
+
+
+@pytest.mark.asyncio
+async def test_verifier_reuses_verified_tokens_until_keys_rotate(
+    monkeypatch, tmp_path, key_pairs
+):
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps(jwks(("k1", key_pairs[0]))))
+    key_cache = JWKSKeyCache(jwks_file=str(path))
+    key_cache.prefetch()
+    verifier = CachedJWKSVerifier(key_cache=key_cache, issuer=ISSUER, audience=AUDIENCE)
+
+    decodes = []
+    decode = verifier.jwt.decode
+    monkeypatch.setattr(
+        verifier.jwt, "decode", lambda *args: decodes.append(1) or decode(*args)
+    )
+    bearer = token(key_pairs[0], "k1")
+
+    first = await verifier.verify_token(bearer)
+    assert await verifier.verify_token(bearer) is first
+    assert len(decodes) == 1
+
+    # Same key set reloaded: cached results stay valid
+    await key_cache.refresh()
+    await verifier.verify_token(bearer)
+    assert len(decodes) == 1
+
+    # Rotated key set: every token is verified again
+    path.write_text(json.dumps(jwks(("k1", key_pairs[0]), ("k2", key_pairs[1]))))
+    await key_cache.refresh()
+    await verifier.verify_token(bearer)
+    assert len(decodes) == 2
+    key_cache.stop()
+
+
+@pytest.mark.asyncio
+async def test_verifier_does_not_cache_rejected_tokens(tmp_path, key_pairs):
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps(jwks(("k1", key_pairs[0]))))
+    key_cache = JWKSKeyCache(jwks_file=str(path))
+    key_cache.prefetch()
+    verifier = CachedJWKSVerifier(key_cache=key_cache, issuer="other", audience=AUDIENCE)
+
+    assert await verifier.verify_token(token(key_pairs[0], "k1")) is None
+    assert verifier.token_cache.stats()["size"] == 0
+    key_cache.stop()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from fastmcp.server.auth.providers.jwt import RSAKeyPair
+
+from core.auth import CachedJWKSVerifier, JWKSKeyCache
+
+from .test_auth import AUDIENCE, ISSUER, jwks, token
+
+
+@pytest.fixture(scope="module")
+def setup(tmp_path_factory):
+    key_pair = RSAKeyPair.generate()
+    path = tmp_path_factory.mktemp("jwks") / "jwks.json"
+    path.write_text(json.dumps(jwks(("k1", key_pair))))
+    key_cache = JWKSKeyCache(jwks_file=str(path))
+    key_cache.prefetch()
+    return key_cache, token(key_pair, "k1")
+
+
+def run_verification(benchmark, verifier, bearer):
+    loop = asyncio.new_event_loop()
+    try:
+        result = benchmark(lambda: loop.run_until_complete(verifier.verify_token(bearer)))
+    finally:
+        verifier.key_cache.stop()
+        loop.close()
+    assert result is not None
+
+
+@pytest.mark.benchmark(group="verify_token")
+def test_benchmark_verify_without_token_cache(benchmark, setup):
+    key_cache, bearer = setup
+    verifier = CachedJWKSVerifier(
+        key_cache=key_cache, issuer=ISSUER, audience=AUDIENCE, token_cache_size=0
+    )
+    run_verification(benchmark, verifier, bearer)
+
+
+@pytest.mark.benchmark(group="verify_token")
+def test_benchmark_verify_with_token_cache(benchmark, setup):
+    key_cache, bearer = setup
+    verifier = CachedJWKSVerifier(key_cache=key_cache, issuer=ISSUER, audience=AUDIENCE)
+    run_verification(benchmark, verifier, bearer)
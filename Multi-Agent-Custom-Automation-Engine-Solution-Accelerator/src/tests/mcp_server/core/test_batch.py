@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+from fastmcp import FastMCP
+from starlette.middleware import Middleware
+
+from core.batch import BatchMiddleware
+
+HEADERS = {
+    "content-type": "application/json",
+    "accept": "application/json, text/event-stream",
+}
+
+
+def build_app(max_batch_size: int = 8):
+    mcp = FastMCP("Batch")
+
+    @mcp.tool
+    async def slow_echo(value: str, delay: float = 0.0) -> str:
+        await asyncio.sleep(delay)
+        return value
+
+    return mcp.http_app(
+        stateless_http=True,
+        middleware=[
+            Middleware(BatchMiddleware, path="/mcp", max_batch_size=max_batch_size)
+        ],
+    )
+
+
+def call(request_id: int, value: str, delay: float = 0.0) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": "slow_echo", "arguments": {"value": value, "delay": delay}},
+    }
+
+
+def sse_messages(text: str) -> list:
+    return [
+        json.loads(line[len("data:"):])
+        for line in text.splitlines()
+        if line.startswith("data:")
+    ]
+
+
+async def post(app, payload, headers=HEADERS, path="/mcp/"):
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(path, json=payload, headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_batch_returns_json_array_in_request_order():
+    app = build_app()
+    batch = [call(1, "a", 0.1), call(2, "b"), call(3, "c", 0.05)]
+
+    started = time.perf_counter()
+    response = await post(app, batch, {**HEADERS, "accept": "application/json"})
+    elapsed = time.perf_counter() - started
+
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["id"] for r in results] == [1, 2, 3]
+    assert [r["result"]["content"][0]["text"] for r in results] == ["a", "b", "c"]
+    # Calls run concurrently, not one after another
+    assert elapsed < 0.3
+
+
+@pytest.mark.asyncio
+async def test_batch_streams_responses_in_completion_order():
+    app = build_app()
+    response = await post(app, [call(1, "slow", 0.2), call(2, "fast")])
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert [m["id"] for m in sse_messages(response.text)] == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_oversized_batches():
+    app = build_app(max_batch_size=2)
+    response = await post(app, [call(i, "x") for i in range(3)])
+
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == -32600
+
+
+@pytest.mark.asyncio
+async def test_single_messages_pass_through():
+    app = build_app()
+    response = await post(app, call(7, "solo"), path="/mcp")
+
+    assert response.status_code == 200
+    assert sse_messages(response.text)[-1]["id"] == 7
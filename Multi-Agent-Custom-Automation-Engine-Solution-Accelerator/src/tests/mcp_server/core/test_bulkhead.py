@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastmcp import Client
+
+from core.bulkhead import Bulkhead, BulkheadRegistry, ServerBusyError, SERVER_BUSY
+from core.factory import Domain, MCPToolBase, MCPToolFactory
+from core.metrics import MetricsRegistry
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_queues_then_rejects():
+    bulkhead = Bulkhead("domain:test", max_concurrent=1, max_queue=1)
+
+    await bulkhead.acquire()
+    waiter = asyncio.create_task(bulkhead.acquire())
+    await asyncio.sleep(0)
+    assert bulkhead.stats()["queue_depth"] == 1
+    assert bulkhead.saturated is True
+
+    with pytest.raises(ServerBusyError) as excinfo:
+        await bulkhead.acquire()
+    assert excinfo.value.error.code == SERVER_BUSY
+
+    bulkhead.release()
+    await waiter
+    bulkhead.release()
+
+    stats = bulkhead.stats()
+    assert stats["active"] == 0
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+
+
+def test_bulkhead_registry_limits():
+    registry = BulkheadRegistry(default_concurrency=10, default_queue=5)
+    registry.set_domain_limits("tech_support", max_concurrent=2)
+
+    assert registry.for_domain("general").max_concurrent == 10
+    assert registry.for_domain("tech_support").max_concurrent == 2
+    assert registry.for_tool("cheap", {}) is None
+    assert registry.for_tool("slow", {"max_concurrency": 1}).max_queue == 0
+
+
+class SlowService(MCPToolBase):
+    def __init__(self, gate: asyncio.Event):
+        super().__init__(Domain.TECH_SUPPORT)
+        self.gate = gate
+
+    @property
+    def tool_count(self) -> int:
+        return 2
+
+    def register_tools(self, mcp) -> None:
+        @mcp.tool(meta={"max_concurrency": 1, "max_queue": 0})
+        async def slow() -> str:
+            await self.gate.wait()
+            return "done"
+
+        @mcp.tool
+        async def cheap() -> str:
+            return "fast"
+
+
+@pytest.mark.asyncio
+async def test_factory_rejects_calls_when_tool_queue_is_full():
+    gate = asyncio.Event()
+    factory = MCPToolFactory()
+    factory.register_service(SlowService(gate))
+    mcp = factory.create_mcp_server(name="Test")
+
+    async with Client(mcp) as client:
+        first = asyncio.create_task(client.call_tool("slow", {}))
+        while factory.get_bulkhead_stats().get("tool:slow", {}).get("active") != 1:
+            await asyncio.sleep(0.01)
+
+        with pytest.raises(Exception, match="Server busy"):
+            await client.call_tool("slow", {})
+        assert (await client.call_tool("cheap", {})).data == "fast"
+
+        gate.set()
+        assert (await first).data == "done"
+
+    stats = factory.get_bulkhead_stats()
+    assert stats["tool:slow"]["rejected"] == 1
+    assert stats["domain:tech_support"]["completed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_bulkheads_are_exported_as_metrics():
+    metrics = MetricsRegistry()
+    registry = BulkheadRegistry(default_concurrency=1, default_queue=0)
+    registry.register_metrics(metrics)
+    domain = registry.for_domain("general")
+    tool = registry.for_tool("slow", {"max_concurrency": 1, "max_queue": 1})
+
+    await domain.acquire()
+    with pytest.raises(ServerBusyError):
+        await domain.acquire()
+    await tool.acquire()
+    waiter = asyncio.create_task(tool.acquire())
+    await asyncio.sleep(0)
+    text = metrics.render()
+
+    assert 'mcp_bulkhead_active_calls{scope="domain",name="general"} 1' in text
+    assert 'mcp_bulkhead_rejected_total{scope="domain",name="general"} 1' in text
+    assert 'mcp_bulkhead_queued_calls{scope="tool",name="slow"} 1' in text
+    assert "# TYPE mcp_bulkhead_rejected_total counter" in text
+
+    tool.release()
+    await waiter
+    tool.release()
+    domain.release()
+    assert 'mcp_bulkhead_completed_total{scope="tool",name="slow"} 2' in (
+        metrics.render()
+    )
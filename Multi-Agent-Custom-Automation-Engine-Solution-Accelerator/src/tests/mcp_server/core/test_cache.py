@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import pytest
+from fastmcp import Client
+
+from core.cache import CachePolicy, ResultCache
+from core.factory import Domain, MCPToolBase, MCPToolFactory
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_policy_from_meta():
+    assert CachePolicy.from_meta({"version": "1.0"}) is None
+    assert CachePolicy.from_meta({"cache": True}) == CachePolicy()
+
+    policy = CachePolicy.from_meta({"cache": {"ttl": 5, "key_args": ["a"]}})
+    assert policy.ttl == 5
+    assert policy.make_key({"a": 1, "b": 2}) == policy.make_key({"a": 1, "b": 3})
+
+
+def test_result_cache_ttl_and_lru():
+    clock = FakeClock()
+    cache = ResultCache(clock=clock)
+    policy = CachePolicy(ttl=10, max_entries=2)
+
+    cache.put("demo", "tool", "a", "A", policy)
+    cache.put("demo", "tool", "b", "B", policy)
+    assert cache.get("tool", "a") == (True, "A")
+
+    cache.put("demo", "tool", "c", "C", policy)
+    assert cache.get("tool", "b") == (False, None)
+
+    clock.now = 11
+    assert cache.get("tool", "a") == (False, None)
+
+    stats = cache.stats()["components"]["tool"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["evictions"] == 1
+    assert stats["expirations"] == 1
+
+
+def test_result_cache_domain_memory_limit():
+    cache = ResultCache(domain_memory_limit=10)
+    policy = CachePolicy()
+
+    cache.put("demo", "first", "k", "x" * 6, policy)
+    cache.put("demo", "second", "k", "y" * 6, policy)
+
+    assert cache.get("first", "k") == (False, None)
+    assert cache.get("second", "k")[0] is True
+    assert cache.stats()["domain_bytes"]["demo"] <= 10
+
+
+class CountingService(MCPToolBase):
+    def __init__(self):
+        super().__init__(Domain.DEMO)
+        self.calls = 0
+
+    @property
+    def tool_count(self) -> int:
+        return 1
+
+    def register_tools(self, mcp) -> None:
+        @mcp.tool(meta={"cache": {"ttl": 60}})
+        def double(value: int) -> int:
+            self.calls += 1
+            return value * 2
+
+
+@pytest.mark.asyncio
+async def test_factory_serves_repeated_calls_from_cache():
+    service = CountingService()
+    factory = MCPToolFactory()
+    factory.register_service(service)
+    mcp = factory.create_mcp_server(name="Test")
+
+    async with Client(mcp) as client:
+        first = await client.call_tool("double", {"value": 4})
+        second = await client.call_tool("double", {"value": 4})
+        await client.call_tool("double", {"value": 5})
+
+    assert first.data == second.data == 8
+    assert service.calls == 2
+    assert factory.get_cache_stats()["components"]["double"]["hits"] == 1
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from fastmcp import Client
+
+from core.executors import ExecutorManager, ExecutorPolicy, ManagedProcessPool
+from core.factory import Domain, MCPToolBase, MCPToolFactory
+from core.metrics import MetricsRegistry
+
+
+def current_thread_name() -> str:
+    return threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_executor_manager_runs_sync_functions_on_pools():
+    manager = ExecutorManager(shared_workers=2, domain_workers=1)
+    try:
+        inline = manager.wrap(current_thread_name, ExecutorPolicy.INLINE, "demo")
+        shared = manager.wrap(current_thread_name, ExecutorPolicy.SHARED, "demo")
+        domain = manager.wrap(current_thread_name, ExecutorPolicy.DOMAIN, "demo")
+
+        assert inline is current_thread_name
+        assert (await shared()).startswith("mcp-shared")
+        assert (await domain()).startswith("mcp-domain-demo")
+
+        stats = manager.stats()
+        assert stats["shared"]["completed"] == 1
+        assert stats["domain-demo"]["max_workers"] == 1
+        assert stats["domain-demo"]["queue_depth"] == 0
+    finally:
+        manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executor_manager_exports_pool_metrics():
+    metrics = MetricsRegistry()
+    manager = ExecutorManager(shared_workers=1)
+    manager.register_metrics(metrics)
+    release = threading.Event()
+    try:
+        blocked = manager.wrap(release.wait, ExecutorPolicy.SHARED, "demo")
+        first = asyncio.create_task(blocked())
+        second = asyncio.create_task(blocked())
+        await asyncio.sleep(0.05)
+        busy = metrics.render()
+        release.set()
+        await asyncio.gather(first, second)
+        done = metrics.render()
+    finally:
+        release.set()
+        manager.shutdown()
+
+    assert 'mcp_executor_queue_depth{pool="shared"} 1' in busy
+    assert 'mcp_executor_running_calls{pool="shared"} 1' in busy
+    assert 'mcp_executor_running_calls{pool="process"} 0' in busy
+    assert 'mcp_executor_completed_total{pool="shared"} 2' in done
+    assert 'mcp_executor_started_total{pool="shared"} 2' in done
+    waited = next(
+        line for line in done.splitlines()
+        if line.startswith('mcp_executor_wait_seconds_total{pool="shared"}')
+    )
+    # The second call waited for the first to be released
+    assert float(waited.split()[-1]) >= 0.04
+    assert 'mcp_executor_timeouts_total{pool="process"} 0' in done
+
+
+def test_executor_manager_leaves_coroutines_unchanged():
+    manager = ExecutorManager()
+
+    async def tool() -> str:
+        return "ok"
+
+    assert manager.wrap(tool, ExecutorPolicy.SHARED, "demo") is tool
+
+
+class PooledService(MCPToolBase):
+    executor_policy = ExecutorPolicy.DOMAIN
+
+    def __init__(self):
+        super().__init__(Domain.GENERAL)
+
+    @property
+    def tool_count(self) -> int:
+        return 2
+
+    def register_tools(self, mcp) -> None:
+        @mcp.tool
+        def where(label: str) -> str:
+            return f"{label}:{threading.current_thread().name}"
+
+        @mcp.tool(meta={"executor": "inline"})
+        def where_inline(label: str) -> str:
+            return f"{label}:{threading.current_thread().name}"
+
+
+@pytest.mark.asyncio
+async def test_factory_applies_service_executor_policy():
+    factory = MCPToolFactory()
+    factory.register_service(PooledService())
+    mcp = factory.create_mcp_server(name="Test")
+
+    async with Client(mcp) as client:
+        tools = {tool.name: tool for tool in await client.list_tools()}
+        pooled = await client.call_tool("where", {"label": "a"})
+        inline = await client.call_tool("where_inline", {"label": "b"})
+
+    assert tools["where"].inputSchema["required"] == ["label"]
+    assert pooled.data.startswith("a:mcp-domain-general")
+    assert not inline.data.startswith("b:mcp-")
+    assert factory.get_executor_stats()["domain-general"]["completed"] == 1
+    factory.executors.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_pool_runs_module_level_functions():
+    pool = ManagedProcessPool(max_workers=1, timeout=30)
+    try:
+        assert await pool.run(os.getpid) != os.getpid()
+        assert pool.stats()["completed"] == 1
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_pool_times_out_and_recovers():
+    pool = ManagedProcessPool(max_workers=1, timeout=0.5)
+    try:
+        with pytest.raises(TimeoutError):
+            await pool.run(time.sleep, 5)
+
+        pool.timeout = 30
+        assert await pool.run(os.getpid) != os.getpid()
+        stats = pool.stats()
+        assert stats["timeouts"] == 1
+        assert stats["restarts"] == 1
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_pool_timeout_spares_other_calls():
+    pool = ManagedProcessPool(max_workers=2, timeout=2)
+    try:
+        await pool.ping()
+        stuck = asyncio.create_task(pool.run(time.sleep, 10))
+        await asyncio.sleep(1)
+        other = asyncio.create_task(pool.run(time.sleep, 1.5))
+
+        with pytest.raises(TimeoutError):
+            await stuck
+        # The pool is retired but keeps its workers for the running call
+        assert pool.stats()["retired"] == 1
+        assert await other is None
+        assert pool.stats()["retired"] == 0
+        assert pool.stats()["timeouts"] == 1
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_pool_recovers_from_worker_crash():
+    pool = ManagedProcessPool(max_workers=1, timeout=30)
+    try:
+        with pytest.raises(BrokenProcessPool):
+            await pool.run(os._exit, 1)
+
+        assert await pool.run(os.getpid) != os.getpid()
+        assert pool.stats()["crashes"] == 2
+    finally:
+        pool.shutdown()
+
+
+def test_process_policy_rejects_nested_functions():
+    manager = ExecutorManager(process_workers=1)
+
+    def nested(value: int) -> int:
+        return value
+
+    with pytest.raises(ValueError, match="module-level"):
+        manager.wrap(nested, ExecutorPolicy.PROCESS, "data")
+
+
+def test_process_policy_starts_workers_on_first_call():
+    manager = ExecutorManager(process_workers=1)
+    manager.wrap(os.getpid, ExecutorPolicy.PROCESS, "data")
+
+    stats = manager.stats()["process"]
+    assert stats["running"] is False
+    assert os.getpid.__module__ in manager.process_pool.warm_modules
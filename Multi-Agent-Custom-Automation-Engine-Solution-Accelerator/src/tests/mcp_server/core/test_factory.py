@@ -2,8 +2,13 @@ from __future__ import annotations
 
 from typing import List
 
+import pytest
+from fastmcp import Client
+from fastmcp.tools import Tool
+from mcp.server.lowlevel import Server
+
 import core.factory as factory_module
-from core.factory import MCPToolBase, MCPToolFactory, Domain
+from core.factory import MCPToolBase, MCPToolFactory, Domain, ServiceDescriptor
 
 
 class DummyMCP:
@@ -11,6 +16,11 @@ class DummyMCP:
         self.name = name
         self.auth = auth
         self.tools: List[str] = []
+        self.middleware: List[object] = []
+        self._mcp_server = Server(name)
+
+    def add_middleware(self, middleware) -> None:
+        self.middleware.append(middleware)
 
 
 class DummyService(MCPToolBase):
@@ -48,3 +58,151 @@ def test_factory_create_mcp_server_registers_tools(monkeypatch):
     mcp = factory.create_mcp_server(name="Test", auth=None)
     assert isinstance(mcp, DummyMCP)
     assert service.registered is True
+
+
+def _general_descriptor() -> ServiceDescriptor:
+    return ServiceDescriptor(
+        domain=Domain.GENERAL,
+        module="services.demo_general_service",
+        class_name="GeneralService",
+        tools=(
+            "greet_test",
+            "get_server_status",
+            "set_response_mode",
+            "format_dates",
+        ),
+    )
+
+
+def test_factory_descriptor_is_not_loaded_until_used():
+    factory = MCPToolFactory()
+    factory.register_descriptor(_general_descriptor())
+    factory.create_mcp_server(name="Test")
+
+    summary = factory.get_tool_summary()
+    assert summary["total_tools"] == 4
+    assert summary["services"]["general"]["loaded"] is False
+    assert factory.get_all_services() == {}
+
+
+@pytest.mark.asyncio
+async def test_factory_loads_descriptor_on_first_call():
+    factory = MCPToolFactory()
+    factory.register_descriptor(_general_descriptor())
+    mcp = factory.create_mcp_server(name="Test")
+
+    async with Client(mcp) as client:
+        result = await client.call_tool("greet_test", {"name": "Ana"})
+
+    assert "Hello from BB MCP Server, Ana" in result.content[0].text
+    assert factory.get_tool_summary()["services"]["general"]["loaded"] is True
+
+
+@pytest.mark.asyncio
+async def test_factory_loads_descriptors_on_list():
+    factory = MCPToolFactory()
+    factory.register_descriptor(_general_descriptor())
+    mcp = factory.create_mcp_server(name="Test")
+
+    async with Client(mcp) as client:
+        tools = await client.list_tools()
+
+    assert {tool.name for tool in tools} == {
+        "greet_test",
+        "get_server_status",
+        "set_response_mode",
+        "format_dates",
+    }
+
+
+class TaggedService(MCPToolBase):
+    def __init__(self):
+        super().__init__(Domain.DATA)
+
+    @property
+    def tool_count(self) -> int:
+        return 3
+
+    def register_tools(self, mcp) -> None:
+        @mcp.tool(tags={"math", "public"})
+        def add(a: int, b: int) -> int:
+            return a + b
+
+        @mcp.tool(tags={"math", "internal"})
+        def subtract(a: int, b: int) -> int:
+            return a - b
+
+        @mcp.tool
+        def echo(text: str) -> str:
+            return text
+
+
+def test_factory_indexes_tools_by_name_and_tag():
+    factory = MCPToolFactory()
+    factory.register_service(TaggedService())
+    factory.create_mcp_server(name="Test")
+
+    entry = factory.get_tool_entry("add")
+    assert entry.domain is Domain.DATA
+    assert entry.handler(2, 3) == 5
+    assert factory.find_tools(include_tags={"math"}) == {"add", "subtract"}
+    assert factory.find_tools(exclude_tags={"internal"}) == {"add", "echo"}
+
+
+@pytest.mark.asyncio
+async def test_factory_tag_filter_applies_to_listing_and_calls():
+    factory = MCPToolFactory()
+    factory.register_service(TaggedService())
+    mcp = factory.create_mcp_server(name="Test", exclude_tags={"internal"})
+
+    async with Client(mcp) as client:
+        first = await client.list_tools()
+        second = await client.list_tools()
+        with pytest.raises(Exception, match="Unknown tool"):
+            await client.call_tool("subtract", {"a": 3, "b": 1})
+
+    assert {tool.name for tool in first} == {"add", "echo"}
+    assert [tool.name for tool in first] == [tool.name for tool in second]
+
+
+@pytest.mark.asyncio
+async def test_factory_listing_reuses_its_serialized_form_until_components_change():
+    factory = MCPToolFactory()
+    factory.register_service(TaggedService())
+    mcp = factory.create_mcp_server(name="Test")
+
+    def multiply(a: int, b: int) -> int:
+        return a * b
+
+    async with Client(mcp) as client:
+        first = await client.list_tools()
+        second = await client.list_tools()
+        assert factory.get_listing_stats() == {"hits": 1, "misses": 1}
+
+        # Components added or disabled on FastMCP itself, not via the factory
+        mcp.add_tool(Tool.from_function(multiply))
+        added = await client.list_tools()
+        (await mcp.get_tool("echo")).disable()
+        disabled = await client.list_tools()
+
+    assert [tool.name for tool in first] == [tool.name for tool in second]
+    assert {tool.name for tool in added} - {tool.name for tool in first} == {
+        "multiply"
+    }
+    assert "echo" not in {tool.name for tool in disabled}
+    assert factory.get_listing_stats() == {"hits": 1, "misses": 3}
+
+
+@pytest.mark.asyncio
+async def test_factory_listing_refreshes_when_registry_changes():
+    factory = MCPToolFactory()
+    factory.register_service(TaggedService())
+    factory.register_descriptor(_general_descriptor())
+    mcp = factory.create_mcp_server(name="Test")
+    version = factory.registry.version
+
+    async with Client(mcp) as client:
+        tools = await client.list_tools()
+
+    assert factory.registry.version > version
+    assert "greet_test" in {tool.name for tool in tools}
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastmcp import Client
+from fastmcp.tools.tool import ToolResult
+
+import core.idempotency as idempotency_module
+from core.factory import Domain, MCPToolBase, MCPToolFactory
+from core.idempotency import (
+    IdempotencyMiddleware,
+    IdempotencyPolicy,
+    MemoryIdempotencyStore,
+    SQLiteIdempotencyStore,
+)
+from utils.formatters import format_error_response, format_success_response
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_policy_key_uses_only_key_args():
+    policy = IdempotencyPolicy.from_meta({"idempotency": {"key_args": ["name"]}})
+
+    assert policy.make_key("t", {"name": "a", "note": "x"}) == policy.make_key(
+        "t", {"name": "a", "note": "y"}
+    )
+    assert IdempotencyPolicy.from_meta({}) is None
+
+
+def test_policy_key_separates_modes_and_callers():
+    policy = IdempotencyPolicy.from_meta({"idempotency": {"key_args": ["name"]}})
+    keys = {
+        policy.make_key("t", {"name": "a"}, mode=mode, principal=principal)
+        for mode in ("full", "structured")
+        for principal in ("alice", "bob")
+    }
+    assert len(keys) == 4
+
+
+def test_key_uses_the_token_subject(monkeypatch):
+    token = SimpleNamespace(claims={"sub": "alice"}, client_id="app")
+    monkeypatch.setattr(idempotency_module, "get_access_token", lambda: token)
+    assert idempotency_module.current_principal() == "alice"
+    monkeypatch.setattr(idempotency_module, "get_access_token", lambda: None)
+    assert idempotency_module.current_principal() == ""
+
+
+def test_memory_store_expires_entries():
+    clock = FakeClock()
+    store = MemoryIdempotencyStore(max_entries=2, clock=clock)
+    store.put("a", ToolResult(content="first"), ttl=10)
+    store.put("b", ToolResult(content="second"), ttl=10)
+    store.put("c", ToolResult(content="third"), ttl=10)
+
+    assert store.get("a") is None
+    assert store.get("b").content[0].text == "second"
+    clock.now += 11
+    assert store.get("b") is None
+
+
+def test_sqlite_store_round_trips_results(tmp_path):
+    clock = FakeClock()
+    path = str(tmp_path / "idempotency.db")
+    store = SQLiteIdempotencyStore(path, clock=clock)
+    store.put("k", ToolResult(content="sent", structured_content={"result": "sent"}), ttl=5)
+    store.close()
+
+    reopened = SQLiteIdempotencyStore(path, clock=clock)
+    result = reopened.get("k")
+    assert result.content[0].text == "sent"
+    assert result.structured_content == {"result": "sent"}
+    clock.now += 6
+    assert reopened.get("k") is None
+    reopened.close()
+
+
+class EmailService(MCPToolBase):
+    def __init__(self):
+        super().__init__(Domain.TECH_SUPPORT)
+        self.sent = 0
+
+    @property
+    def tool_count(self) -> int:
+        return 2
+
+    def register_tools(self, mcp) -> None:
+        @mcp.tool(meta={"idempotency": {"key_args": ["email"]}})
+        async def send_email(email: str, note: str = "") -> str:
+            self.sent += 1
+            await asyncio.sleep(0.05)
+            return f"sent #{self.sent} to {email}"
+
+        @mcp.tool(
+            output_schema=None, meta={"idempotency": {"key_args": ["email"]}}
+        )
+        async def notify(email: str, fail: bool = False) -> str:
+            self.sent += 1
+            if fail:
+                return format_error_response("mail server down", "notifying")
+            return format_success_response("Notified", {"email": email})
+
+
+@pytest.mark.asyncio
+async def test_duplicate_calls_execute_once():
+    service = EmailService()
+    factory = MCPToolFactory()
+    factory.register_service(service)
+    mcp = factory.create_mcp_server(name="Test")
+
+    async with Client(mcp) as client:
+        concurrent = await asyncio.gather(
+            *(client.call_tool("send_email", {"email": "a@x.com"}) for _ in range(3))
+        )
+        retried = await client.call_tool(
+            "send_email", {"email": "a@x.com", "note": "retry"}
+        )
+        other = await client.call_tool("send_email", {"email": "b@x.com"})
+
+    assert {r.data for r in concurrent} == {"sent #1 to a@x.com"}
+    assert retried.data == "sent #1 to a@x.com"
+    assert other.data == "sent #2 to b@x.com"
+    assert service.sent == 2
+
+    stats = factory.get_idempotency_stats()["tools"]["send_email"]
+    assert stats == {"executed": 2, "replayed": 1, "joined": 2}
+
+
+@pytest.mark.asyncio
+async def test_replays_only_successes_in_the_requested_mode():
+    service = EmailService()
+    factory = MCPToolFactory()
+    factory.register_service(service)
+    mcp = factory.create_mcp_server(name="Test")
+
+    async with Client(mcp) as client:
+        failed = await client.call_tool("notify", {"email": "a@x.com", "fail": True})
+        full = await client.call_tool("notify", {"email": "a@x.com"})
+        structured = await client.session.call_tool(
+            "notify", {"email": "a@x.com"}, meta={"response_mode": "structured"}
+        )
+        replayed = await client.call_tool("notify", {"email": "a@x.com"})
+
+    assert "mail server down" in failed.content[0].text
+    assert "Notified Completed" in full.content[0].text
+    assert structured.structuredContent == {"email": "a@x.com"}
+    assert replayed.content[0].text == full.content[0].text
+    assert service.sent == 3
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_replays_through_the_middleware(tmp_path):
+    service = EmailService()
+    factory = MCPToolFactory(idempotency_db_path=str(tmp_path / "keys.db"))
+    factory.register_service(service)
+    mcp = factory.create_mcp_server(name="Test")
+
+    async with Client(mcp) as client:
+        first = await client.call_tool("send_email", {"email": "a@x.com"})
+        second = await client.call_tool("send_email", {"email": "a@x.com"})
+
+    assert first.data == second.data == "sent #1 to a@x.com"
+    assert factory.get_idempotency_stats()["stored"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_call_hands_over_to_a_waiting_one():
+    factory = MCPToolFactory()
+    factory.register_service(EmailService())
+    factory.create_mcp_server(name="Test")
+    middleware = IdempotencyMiddleware(factory.registry, MemoryIdempotencyStore())
+    started = asyncio.Event()
+    runs = []
+
+    async def call_next(context):
+        runs.append(context)
+        started.set()
+        await asyncio.sleep(0.05)
+        return ToolResult(content=f"run {len(runs)}")
+
+    def context():
+        message = SimpleNamespace(name="send_email", arguments={"email": "a@x.com"})
+        return SimpleNamespace(message=message)
+
+    first = asyncio.create_task(middleware.on_call_tool(context(), call_next))
+    await started.wait()
+    waiting = asyncio.create_task(middleware.on_call_tool(context(), call_next))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    result = await waiting
+    assert result.content[0].text == "run 2"
+    assert first.cancelled()
+    assert middleware.stats()["tools"]["send_email"]["executed"] == 1
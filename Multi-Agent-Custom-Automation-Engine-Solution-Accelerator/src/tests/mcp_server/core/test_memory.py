@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+
+import httpx
+import pytest
+from fastmcp import Client, FastMCP
+
+from core.factory import MCPToolFactory
+from core.memory import MemoryProfiler, SessionTracker, estimate_size
+from mcp_server import mcp_server as mcp_server_module
+from services.bb_demo_service import BBDemoService
+
+_retained = []
+
+
+def allocate_for_diff() -> None:
+    _retained.append([bytearray(1024) for _ in range(200)])
+
+
+@pytest.fixture
+def memory_profiler():
+    profiler = MemoryProfiler()
+    yield profiler
+    profiler.stop()
+    _retained.clear()
+
+
+def test_diff_reports_growing_sites(memory_profiler):
+    with pytest.raises(ValueError):
+        memory_profiler.diff()
+
+    assert memory_profiler.snapshot()["tracing"] is True
+    allocate_for_diff()
+    sites = memory_profiler.diff(top=5)
+
+    assert "test_memory.py" in sites[0]["site"]
+    assert sites[0]["size_diff"] >= 200 * 1024
+    assert sites[0]["count_diff"] >= 200
+
+    # The diff became the baseline, nothing has grown since
+    assert all(site["size_diff"] < 200 * 1024 for site in memory_profiler.diff())
+
+
+def test_estimate_size_stops_at_excluded_and_shared_objects():
+    shared = [bytearray(10_000)]
+    own = {"payload": bytearray(50_000), "shared": shared, "module": pytest}
+
+    size = estimate_size(own)
+    assert size > 60_000
+    assert 50_000 < estimate_size(own, exclude=[shared]) < 60_000
+    # Modules (and what only they reach) are never attributed
+    assert size < 100_000
+
+
+def build_factory() -> MCPToolFactory:
+    factory = MCPToolFactory()
+    factory.register_service(BBDemoService())
+    factory.create_mcp_server(name="Test")
+    return factory
+
+
+@pytest.mark.asyncio
+async def test_sessions_and_pending_elicitations_are_tracked():
+    factory = build_factory()
+    asked = asyncio.Event()
+    answer = asyncio.Event()
+
+    async def handler(message, response_type, params, context):
+        asked.set()
+        await answer.wait()
+        return {}
+
+    async with Client(factory._mcp_server, elicitation_handler=handler) as client:
+        call = asyncio.create_task(client.call_tool("get_user_info", {"user_id": 1}))
+        await asyncio.wait_for(asked.wait(), 5)
+
+        stats = await factory.estimate_session_stats()
+        assert stats["live_sessions"] == 1
+        assert stats["pending_elicitations"] == 1
+        (session,) = stats["sessions"].values()
+        assert session["pending_elicitations"] == 1
+        assert session["estimated_bytes"] > 0
+
+        answer.set()
+        result = await call
+        assert result.data["status"] == "active"
+        assert factory.get_session_stats()["pending_elicitations"] == 0
+
+    gc.collect()
+    assert factory.sessions.live_sessions == 0
+
+
+def test_tracker_forgets_collected_sessions():
+    class Session:
+        pass
+
+    clock = iter([0.0, 10.0, 20.0])
+    tracker = SessionTracker(clock=lambda: next(clock))
+    session = Session()
+    tracker.touch("s1", session)
+
+    assert tracker.stats()["sessions"] == {
+        "s1": {"pending_elicitations": 0, "idle_seconds": 10.0}
+    }
+    del session
+    gc.collect()
+    assert tracker.stats()["live_sessions"] == 0
+
+
+def test_tracker_counts_elicitations():
+    tracker = SessionTracker()
+    tracker.begin_elicitation("s1")
+    tracker.begin_elicitation("s1")
+    tracker.end_elicitation("s1")
+    assert tracker.pending_elicitations == 1
+
+    tracker.end_elicitation("s1")
+    assert tracker.pending_elicitations == 0
+    assert tracker.stats()["sessions"] == {}
+
+
+@pytest.mark.asyncio
+async def test_debug_memory_routes(monkeypatch):
+    monkeypatch.setattr(mcp_server_module.config, "debug_token", "secret")
+    monkeypatch.setattr(mcp_server_module, "factory", build_factory(), raising=False)
+    server = FastMCP("Test")
+    mcp_server_module.add_debug_routes(server)
+    transport = httpx.ASGITransport(app=server.http_app())
+    auth = {"authorization": "Bearer secret"}
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        assert (await client.get("/debug/memory")).status_code == 401
+        assert (await client.post("/debug/memory/snapshot")).status_code == 401
+
+        response = await client.get("/debug/memory", headers=auth)
+        assert response.status_code == 200
+        body = response.json()
+        assert body["sessions"]["live_sessions"] == 0
+        assert "idempotency" in body and "caches" in body
+        response = await client.get(
+            "/debug/memory", params={"estimate": "true"}, headers=auth
+        )
+        assert response.json()["sessions"]["live_sessions"] == 0
+
+        response = await client.get("/debug/memory/diff", headers=auth)
+        assert response.status_code == 400
+
+        try:
+            response = await client.post("/debug/memory/snapshot", headers=auth)
+            assert response.json()["tracing"] is True
+            response = await client.get(
+                "/debug/memory/diff", params={"top": 3}, headers=auth
+            )
+            assert response.status_code == 200
+            assert len(response.json()["sites"]) <= 3
+
+            response = await client.get(
+                "/debug/memory/diff", params={"group_by": "file"}, headers=auth
+            )
+            assert response.status_code == 400
+        finally:
+            response = await client.post("/debug/memory/stop", headers=auth)
+        assert response.json()["tracing"] is False
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+from fastmcp import Client, FastMCP
+from fastmcp.exceptions import ToolError
+
+from core.factory import Domain, MCPToolBase, MCPToolFactory
+from core.metrics import CONTENT_TYPE, MetricsRegistry
+from mcp_server import mcp_server as mcp_server_module
+
+
+class MeteredService(MCPToolBase):
+    def __init__(self):
+        super().__init__(Domain.GENERAL)
+
+    def register_tools(self, mcp) -> None:
+        @mcp.tool(tags={self.domain.value})
+        def echo(text: str) -> str:
+            return text
+
+        @mcp.tool(tags={self.domain.value})
+        def broken(text: str) -> str:
+            raise ValueError("boom")
+
+        @mcp.resource("metered://items/{item}")
+        def item(item: str) -> str:
+            return f"item {item}"
+
+        @mcp.prompt
+        def ask(topic: str) -> str:
+            return f"Tell me about {topic}"
+
+    @property
+    def tool_count(self) -> int:
+        return 2
+
+
+def test_registry_renders_prometheus_text():
+    metrics = MetricsRegistry()
+    calls = metrics.counter("calls_total", "Calls.", ("name",))
+    latency = metrics.histogram("latency_seconds", "Latency.", ("name",), (0.1, 1.0))
+    calls.inc('a"b')
+    latency.observe(0.5, "a")
+    latency.observe(5.0, "a")
+
+    assert metrics.render().splitlines() == [
+        "# HELP calls_total Calls.",
+        "# TYPE calls_total counter",
+        'calls_total{name="a\\"b"} 1',
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{name="a",le="0.1"} 0',
+        'latency_seconds_bucket{name="a",le="1.0"} 1',
+        'latency_seconds_bucket{name="a",le="+Inf"} 2',
+        'latency_seconds_sum{name="a"} 5.5',
+        'latency_seconds_count{name="a"} 2',
+    ]
+
+    with pytest.raises(ValueError):
+        metrics.gauge("calls_total", "Again.")
+
+
+def test_observed_metrics_are_read_at_render_time():
+    metrics = MetricsRegistry()
+    depth = {("shared",): 0}
+    metrics.observed("gauge", "queue_depth", "Depth.", ("pool",), lambda: depth)
+    depth[("shared",)] = 3
+
+    assert metrics.render().splitlines()[-1] == 'queue_depth{pool="shared"} 3'
+    with pytest.raises(ValueError):
+        metrics.observed("histogram", "waits", "Waits.", (), dict)
+
+
+@pytest.mark.asyncio
+async def test_factory_records_calls_by_component():
+    factory = MCPToolFactory()
+    factory.register_service(MeteredService())
+    mcp = factory.create_mcp_server(name="Test")
+    metrics = factory.call_metrics
+
+    async with Client(mcp) as client:
+        await client.call_tool("echo", {"text": "hello"})
+        await client.call_tool("echo", {"text": "again"})
+        with pytest.raises(ToolError):
+            await client.call_tool("broken", {"text": "x"})
+        with pytest.raises(ToolError):
+            await client.call_tool("nonexistent", {})
+        await client.read_resource("metered://items/7")
+        await client.get_prompt("ask", {"topic": "caching"})
+
+    echo = ("tool", "echo", "general")
+    assert metrics.calls.get(*echo) == 2
+    assert metrics.errors.get(*echo) == 0
+    assert metrics.latency.count(*echo) == 2
+    assert metrics.request_size.count(*echo) == 2
+    assert metrics.response_size.count(*echo) == 2
+    assert metrics.errors.get("tool", "broken", "general") == 1
+    assert metrics.errors.get("tool", "unknown", "unknown") == 1
+    assert metrics.calls.get("resource", "metered://items/{item}", "general") == 1
+    assert metrics.calls.get("prompt", "ask", "general") == 1
+    assert metrics.in_flight.get("tool", "general") == 0
+
+    text = factory.render_metrics()
+    assert 'mcp_calls_total{kind="tool",name="echo",domain="general"} 2' in text
+    assert "# TYPE mcp_call_duration_seconds histogram" in text
+    assert 'mcp_bulkhead_completed_total{scope="domain",name="general"} 4' in text
+
+
+@pytest.mark.asyncio
+async def test_metrics_route(monkeypatch):
+    factory = MCPToolFactory()
+    factory.register_service(MeteredService())
+    factory.create_mcp_server(name="Test")
+    factory.call_metrics.calls.inc("tool", "echo", "general")
+    monkeypatch.setattr(mcp_server_module, "factory", factory)
+    server = FastMCP("Test")
+    mcp_server_module.add_metrics_route(server)
+    transport = httpx.ASGITransport(app=server.http_app())
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE
+    assert 'mcp_calls_total{kind="tool",name="echo",domain="general"} 1' in response.text
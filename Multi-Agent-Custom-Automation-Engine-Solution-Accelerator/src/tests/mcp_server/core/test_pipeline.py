@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from fastmcp import Client, Context
+
+from core.factory import Domain, MCPToolBase, MCPToolFactory
+from core.pipeline import COMPLETED, FAILED, SKIPPED, Step, run_pipeline, tool_step
+from utils.date_utils import SimulatedClock
+from utils.formatters import format_error_response
+
+
+def sleeper(delay: float, value: str):
+    async def run():
+        await asyncio.sleep(delay)
+        return value
+
+    return run
+
+
+@pytest.mark.asyncio
+async def test_pipeline_runs_independent_steps_concurrently():
+    steps = [
+        Step("a", sleeper(0.1, "a")),
+        Step("b", sleeper(0.1, "b")),
+        Step("c", sleeper(0.1, "c"), depends_on=("a", "b")),
+    ]
+
+    started = time.perf_counter()
+    results = await run_pipeline(steps)
+    elapsed = time.perf_counter() - started
+
+    assert [r.status for r in results.values()] == [COMPLETED] * 3
+    assert results["c"].result == "c"
+    assert results["c"].started >= results["a"].duration
+    # Critical path is two steps long, not three
+    assert elapsed < 0.28
+
+
+@pytest.mark.asyncio
+async def test_pipeline_skips_steps_after_a_failure():
+    async def boom():
+        raise RuntimeError("directory unavailable")
+
+    done = []
+
+    async def on_step_done(result):
+        done.append(result.name)
+
+    results = await run_pipeline(
+        [
+            Step("accounts", boom),
+            Step("email", sleeper(0, "sent"), depends_on=("accounts",)),
+            Step("laptop", sleeper(0, "ok")),
+        ],
+        on_step_done=on_step_done,
+    )
+
+    assert results["accounts"].status == FAILED
+    assert results["accounts"].error == "directory unavailable"
+    assert results["email"].status == SKIPPED
+    assert results["laptop"].status == COMPLETED
+    assert sorted(done) == ["accounts", "email", "laptop"]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_rejects_cycles_and_unknown_steps():
+    with pytest.raises(ValueError, match="cycle"):
+        await run_pipeline(
+            [Step("a", sleeper(0, ""), ("b",)), Step("b", sleeper(0, ""), ("a",))]
+        )
+    with pytest.raises(ValueError, match="unknown step"):
+        await run_pipeline([Step("a", sleeper(0, ""), ("missing",))])
+
+
+@pytest.mark.asyncio
+async def test_pipeline_times_steps_with_injected_clock():
+    clock = SimulatedClock()
+
+    async def slow():
+        clock.advance(2.5)
+        return "done"
+
+    steps = [Step("a", slow), Step("b", slow, depends_on=("a",))]
+    results = await run_pipeline(steps, clock=clock.monotonic)
+
+    assert results["a"].duration == 2.5
+    assert results["b"].started == 2.5
+    assert results["b"].duration == 2.5
+
+
+class WorkflowService(MCPToolBase):
+    # One slot: a workflow holding it would starve its own steps
+    max_concurrency = 1
+
+    def __init__(self):
+        super().__init__(Domain.GENERAL)
+
+    @property
+    def tool_count(self) -> int:
+        return 3
+
+    def register_tools(self, mcp) -> None:
+        @mcp.tool
+        async def shout(word: str) -> str:
+            return word.upper()
+
+        @mcp.tool
+        async def out_of_stock() -> str:
+            return format_error_response("no laptops left", context="ordering")
+
+        @mcp.tool(meta={"domain_bulkhead": False, "max_concurrency": 1})
+        async def workflow(ctx: Context) -> str:
+            async with Client(ctx.fastmcp) as client:
+                results = await run_pipeline(
+                    [
+                        tool_step(client, "shout", {"word": "a"}),
+                        tool_step(client, "missing", {}, depends_on=("shout",)),
+                        tool_step(client, "out_of_stock", {}),
+                    ]
+                )
+            return ",".join(
+                f"{r.name}={r.status}:{r.error or ''}" for r in results.values()
+            )
+
+
+@pytest.mark.asyncio
+async def test_tool_steps_call_tools_through_the_server():
+    factory = MCPToolFactory()
+    factory.register_service(WorkflowService())
+    mcp = factory.create_mcp_server(name="Test")
+
+    async with Client(mcp) as client:
+        result = await asyncio.wait_for(client.call_tool("workflow", {}), 5)
+
+    shout, missing, out_of_stock = result.data.split(",")
+    assert shout == f"shout={COMPLETED}:"
+    assert missing.startswith(f"missing={FAILED}:Unknown tool")
+    # Error responses of tools that report rather than raise fail the step
+    assert out_of_stock == f"out_of_stock={FAILED}:no laptops left"
+    bulkheads = factory.get_bulkhead_stats()
+    assert bulkheads["domain:general"]["completed"] == 2
+    assert bulkheads["tool:workflow"]["completed"] == 1
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+import pytest
+import uvicorn
+
+from core.prefork import (
+    PreforkSupervisor,
+    create_listening_socket,
+    run_prefork,
+    serve_worker,
+)
+
+
+def test_listening_sockets_share_port_with_reuseport():
+    first = create_listening_socket("127.0.0.1", 0)
+    port = first.getsockname()[1]
+    second = create_listening_socket("127.0.0.1", port)
+    try:
+        assert second.getsockname()[1] == port
+    finally:
+        first.close()
+        second.close()
+
+
+def _run_supervisor(supervisor: PreforkSupervisor, seconds: float) -> None:
+    thread = threading.Thread(
+        target=supervisor.run, kwargs={"install_signal_handlers": False}
+    )
+    thread.start()
+    time.sleep(seconds)
+    supervisor.stop()
+    thread.join(timeout=15)
+    assert not thread.is_alive()
+
+
+def test_supervisor_restarts_exited_workers():
+    supervisor = PreforkSupervisor(
+        target=lambda: os._exit(1), workers=1, min_healthy_uptime=0
+    )
+    _run_supervisor(supervisor, 1.0)
+
+    assert supervisor.restarts >= 1
+
+
+def test_supervisor_stops_running_workers():
+    supervisor = PreforkSupervisor(target=lambda: time.sleep(60), workers=2)
+    _run_supervisor(supervisor, 0.5)
+
+    assert supervisor.restarts == 0
+    assert supervisor.alive_workers() == 0
+
+
+def test_worker_gives_requests_a_grace_period(monkeypatch):
+    configs = []
+    monkeypatch.setattr(
+        uvicorn.Server, "run", lambda server, sockets=None: configs.append(server.config)
+    )
+
+    serve_worker(lambda: object(), "127.0.0.1", 0, graceful_shutdown=7.5)
+
+    assert configs[0].timeout_graceful_shutdown == 7.5
+
+
+def test_prefork_rejects_a_zero_grace_period():
+    with pytest.raises(ValueError, match="must be positive"):
+        run_prefork(lambda: object(), "127.0.0.1", 0, workers=1, graceful_shutdown=0)
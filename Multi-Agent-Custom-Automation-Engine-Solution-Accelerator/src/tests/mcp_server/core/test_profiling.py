@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import marshal
+import threading
+
+import httpx
+import pytest
+from fastmcp import FastMCP
+from fastmcp.server.auth.providers.jwt import StaticTokenVerifier
+
+import core.profiling as profiling_module
+from core.profiling import Profiler, ProfilerBusyError
+from mcp_server import mcp_server as mcp_server_module
+
+
+def spin_for_profile(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+async def busy_coroutine_for_profile(seconds: float) -> None:
+    loop = asyncio.get_running_loop()
+    until = loop.time() + seconds
+    while loop.time() < until:
+        sum(range(1000))
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def busy_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=spin_for_profile, args=(stop,), name="busy")
+    thread.start()
+    yield thread
+    stop.set()
+    thread.join()
+
+
+@pytest.mark.asyncio
+async def test_sampler_collects_collapsed_stacks(busy_thread):
+    sampler = await Profiler(sample_interval=0.002).sample(0.2)
+
+    assert sampler.samples > 10
+    busy = [
+        line for line in sampler.collapsed().splitlines() if line.startswith("busy;")
+    ]
+    assert busy and "spin_for_profile (test_profiling.py:" in busy[0]
+    assert int(busy[0].rsplit(" ", 1)[1]) > 0
+
+
+@pytest.mark.asyncio
+async def test_cprofile_sees_event_loop_work():
+    profiler = Profiler()
+    task = asyncio.create_task(busy_coroutine_for_profile(0.2))
+    profile = await profiler.cprofile(0.15)
+    await task
+
+    profile.create_stats()
+    names = {name for _file, _line, name in profile.stats}
+    assert "busy_coroutine_for_profile" in names
+    assert profiler.stats() == {"running": False, "runs": 1}
+
+
+@pytest.mark.asyncio
+async def test_one_profile_at_a_time():
+    profiler = Profiler(max_seconds=1)
+    with pytest.raises(ValueError):
+        await profiler.sample(5)
+
+    running = asyncio.create_task(profiler.sample(0.1))
+    await asyncio.sleep(0.01)
+    with pytest.raises(ProfilerBusyError):
+        await profiler.cprofile(0.1)
+    await running
+
+
+@pytest.mark.asyncio
+async def test_debug_profile_route(monkeypatch, busy_thread):
+    monkeypatch.setattr(mcp_server_module.config, "debug_token", "secret")
+    server = FastMCP("Test")
+    mcp_server_module.add_debug_routes(server)
+    transport = httpx.ASGITransport(app=server.http_app())
+    auth = {"authorization": "Bearer secret"}
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        assert (await client.get("/debug/profile")).status_code == 401
+        response = await client.get(
+            "/debug/profile", headers={"authorization": "Bearer wrong"}
+        )
+        assert response.status_code == 401
+
+        response = await client.get(
+            "/debug/profile", params={"mode": "bogus"}, headers=auth
+        )
+        assert response.status_code == 400
+
+        response = await client.get(
+            "/debug/profile", params={"seconds": 0.2}, headers=auth
+        )
+        assert response.status_code == 200
+        assert "spin_for_profile" in response.text
+
+        response = await client.get(
+            "/debug/profile",
+            params={"mode": "cprofile", "seconds": 0.05, "format": "pstats"},
+            headers=auth,
+        )
+        assert response.headers["content-type"] == "application/octet-stream"
+        assert isinstance(marshal.loads(response.content), dict)
+
+
+@pytest.mark.asyncio
+async def test_debug_profile_route_needs_the_debug_scope(monkeypatch):
+    monkeypatch.setattr(mcp_server_module.config, "debug_token", None)
+    verifier = StaticTokenVerifier(
+        {
+            "ops-token": {"client_id": "ops", "scopes": ["mcp.debug"]},
+            "client-token": {"client_id": "agent", "scopes": []},
+        }
+    )
+    server = FastMCP("Test", auth=verifier)
+    mcp_server_module.add_debug_routes(server)
+    transport = httpx.ASGITransport(app=server.http_app())
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(
+            "/debug/profile",
+            params={"mode": "cprofile", "seconds": 0.05},
+            headers={"authorization": "Bearer ops-token"},
+        )
+        assert response.status_code == 200
+        assert "function calls" in response.text
+
+        for bearer in ("client-token", "nope"):
+            response = await client.get(
+                "/debug/profile", headers={"authorization": f"Bearer {bearer}"}
+            )
+            assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_debug_profile_route_reports_another_profiler_as_busy(monkeypatch):
+    class ActiveProfile:
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+        def disable(self):
+            pass
+
+    monkeypatch.setattr(profiling_module.cProfile, "Profile", ActiveProfile)
+    monkeypatch.setattr(mcp_server_module.config, "debug_token", "secret")
+    server = FastMCP("Test")
+    mcp_server_module.add_debug_routes(server)
+    transport = httpx.ASGITransport(app=server.http_app())
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(
+            "/debug/profile",
+            params={"mode": "cprofile", "seconds": 0.05},
+            headers={"authorization": "Bearer secret"},
+        )
+    assert response.status_code == 409
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastmcp import FastMCP
+from fastmcp.server.auth.providers.jwt import RSAKeyPair
+
+from core.factory import Domain, MCPToolBase, MCPToolFactory
+from core.readiness import EVENT_LOOP, ReadinessMonitor
+from mcp_server import mcp_server as mcp_server_module
+
+from .test_auth import jwks
+
+
+class CheckedService(MCPToolBase):
+    def __init__(self):
+        super().__init__(Domain.GENERAL)
+        self.healthy = True
+
+    def register_tools(self, mcp) -> None:
+        @mcp.tool(tags={self.domain.value})
+        def noop() -> str:
+            return "ok"
+
+    def readiness_checks(self, factory):
+        return {"backend": lambda: self.healthy}
+
+    @property
+    def tool_count(self) -> int:
+        return 1
+
+
+@pytest.mark.asyncio
+async def test_monitor_runs_checks():
+    async def slow():
+        await asyncio.sleep(1)
+        return True
+
+    async def failing():
+        return False
+
+    def broken():
+        raise RuntimeError("database down")
+
+    monitor = ReadinessMonitor(timeout=0.05)
+    monitor.add_check("passing", lambda: True)
+    monitor.add_check("async_failing", failing)
+    monitor.add_check("broken", broken)
+    monitor.add_check("slow", slow)
+    assert monitor.ready is False
+
+    await monitor.run_checks()
+    checks = monitor.status()["checks"]
+
+    assert checks["passing"]["ok"] is True
+    assert checks[EVENT_LOOP]["ok"] is True
+    assert checks["broken"]["detail"] == "database down"
+    assert checks["slow"]["detail"] == "timed out after 0.05s"
+    assert checks["async_failing"]["detail"] == "failed"
+    assert monitor.ready is False
+
+
+@pytest.mark.asyncio
+async def test_live_checks_and_loop_lag():
+    shedding = False
+    monitor = ReadinessMonitor(max_loop_lag=0.5)
+    monitor.add_check("load_shedding", lambda: not shedding, live=True)
+
+    await monitor.run_checks()
+    assert monitor.ready is True
+
+    # Live checks are evaluated on every probe, without waiting for a run
+    shedding = True
+    assert monitor.ready is False
+    shedding = False
+
+    monitor.loop_lag = 2.0
+    await monitor.run_checks()
+    assert monitor.status()["checks"][EVENT_LOOP] == {
+        "ok": False,
+        "detail": "lag 2.000s",
+        "duration": 0.0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_factory_readiness():
+    factory = MCPToolFactory(domain_max_concurrency=1, domain_max_queue=0)
+    service = CheckedService()
+    factory.register_service(service)
+    assert factory.readiness.status()["checks"]["server"]["ok"] is False
+
+    factory.create_mcp_server(name="Test")
+    status = await factory.readiness.probe()
+    assert status["ready"] is True
+    assert "general.backend" in status["checks"]
+
+    service.healthy = False
+    await factory.readiness.run_checks()
+    assert factory.get_readiness_stats()["ready"] is False
+    service.healthy = True
+    await factory.readiness.run_checks()
+
+    bulkhead = factory.bulkheads.for_domain("general")
+    await bulkhead.acquire()
+    try:
+        assert factory.readiness.ready is False
+    finally:
+        bulkhead.release()
+    assert factory.readiness.ready is True
+    factory.readiness.stop()
+
+
+@pytest.mark.asyncio
+async def test_ready_route(monkeypatch):
+    factory = MCPToolFactory()
+    service = CheckedService()
+    service.healthy = False
+    factory.register_service(service)
+    factory.create_mcp_server(name="Test")
+    monkeypatch.setattr(mcp_server_module, "factory", factory)
+    server = FastMCP("Test")
+    mcp_server_module.add_readiness_route(server)
+    transport = httpx.ASGITransport(app=server.http_app())
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["checks"]["general.backend"]["ok"] is False
+
+        service.healthy = True
+        await factory.readiness.run_checks()
+        response = await client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["ready"] is True
+
+    factory.readiness.stop()
+
+
+@pytest.mark.asyncio
+async def test_jwks_check_retries_a_failed_prefetch(monkeypatch, tmp_path):
+    path = tmp_path / "jwks.json"
+    factory = MCPToolFactory()
+    monkeypatch.setattr(mcp_server_module, "factory", factory)
+    monkeypatch.setattr(mcp_server_module.config, "enable_auth", True)
+    monkeypatch.setattr(mcp_server_module.config, "jwks_file", str(path))
+    monkeypatch.setattr(mcp_server_module.config, "jwks_uri", None)
+    monkeypatch.setattr(mcp_server_module.config, "issuer", "https://issuer.test")
+    monkeypatch.setattr(mcp_server_module.config, "audience", "api://mcp")
+    server = mcp_server_module.create_fastmcp_server()
+    key_cache = server.auth.key_cache
+
+    try:
+        status = await factory.readiness.probe()
+        assert status["checks"]["jwks"]["ok"] is False
+
+        # No token arrives while the pod is unready; the check loads the keys
+        path.write_text(json.dumps(jwks(("k1", RSAKeyPair.generate()))))
+        await factory.readiness.run_checks()
+        assert factory.readiness.ready is True
+        assert key_cache.stats()["kids"] == ["k1"]
+    finally:
+        factory.readiness.stop()
+        key_cache.stop()
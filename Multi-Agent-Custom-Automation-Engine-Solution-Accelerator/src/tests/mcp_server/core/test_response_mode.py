@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import gc
+from types import SimpleNamespace
+
+import pytest
+from fastmcp import Client
+from mcp.types import INVALID_PARAMS
+
+import core.response_mode as response_mode_module
+from core.factory import MCPToolFactory
+from core.response_mode import (
+    UnknownResponseModeError,
+    get_session_response_mode,
+    set_session_response_mode,
+)
+from services.demo_general_service import GeneralService
+from utils.formatters import ResponseMode
+
+
+def build_factory(**kwargs) -> MCPToolFactory:
+    factory = MCPToolFactory(**kwargs)
+    factory.register_service(GeneralService())
+    factory.create_mcp_server(name="Test")
+    return factory
+
+
+@pytest.mark.asyncio
+async def test_response_mode_per_request_meta():
+    factory = build_factory()
+
+    async with Client(factory._mcp_server) as client:
+        full = await client.call_tool("greet_test", {"name": "Ana"})
+        compact = await client.session.call_tool(
+            "greet_test", {"name": "Ana"}, meta={"response_mode": "compact"}
+        )
+        structured = await client.session.call_tool(
+            "greet_test", {"name": "Ana"}, meta={"response_mode": "structured"}
+        )
+
+    assert "Instructions:" in full.content[0].text
+    assert compact.content[0].text.startswith("**Greeting Completed**")
+    assert "Instructions:" not in compact.content[0].text
+    assert structured.structuredContent["name"] == "Ana"
+    assert structured.structuredContent["greeting"] == "Hello from BB MCP Server, Ana!"
+
+    stats = factory.get_response_stats()
+    assert set(stats) == {"full", "compact", "structured"}
+    assert stats["compact"]["avg_bytes"] < stats["full"]["avg_bytes"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_response_mode_is_invalid_params():
+    factory = build_factory()
+    with pytest.raises(UnknownResponseModeError) as excinfo:
+        factory.response_modes.resolve(
+            SimpleNamespace(
+                fastmcp_context=None,
+                message=SimpleNamespace(meta=SimpleNamespace(response_mode="xml")),
+            )
+        )
+    assert excinfo.value.error.code == INVALID_PARAMS
+
+    async with Client(factory._mcp_server) as client:
+        rejected = await client.session.call_tool(
+            "greet_test", {"name": "Ana"}, meta={"response_mode": "verbose"}
+        )
+        accepted = await client.call_tool("greet_test", {"name": "Ana"})
+
+    assert rejected.isError is True
+    assert rejected.content[0].text.startswith("Unknown response mode 'verbose'")
+    assert "Instructions:" in accepted.content[0].text
+    assert set(factory.get_response_stats()) == {"full"}
+
+
+@pytest.mark.asyncio
+async def test_response_mode_per_session_and_default():
+    factory = build_factory(default_response_mode="compact")
+
+    async with Client(factory._mcp_server) as client:
+        default = await client.call_tool("get_server_status", {})
+        await client.call_tool("set_response_mode", {"mode": "structured"})
+        session = await client.call_tool("get_server_status", {})
+        override = await client.session.call_tool(
+            "get_server_status", {}, meta={"response_mode": "full"}
+        )
+
+    assert default.content[0].text.startswith("**Server Status Completed**")
+    assert session.structured_content["status"] == "Running"
+    assert override.content[0].text.startswith("##### Server Status Completed")
+
+
+def test_session_mode_is_dropped_with_the_session():
+    class Session:
+        pass
+
+    session = Session()
+    set_session_response_mode(session, "compact")
+    assert get_session_response_mode(session) is ResponseMode.COMPACT
+    assert get_session_response_mode(None) is None
+
+    del session
+    gc.collect()
+    assert not any(
+        isinstance(key, Session) for key in response_mode_module._session_modes
+    )
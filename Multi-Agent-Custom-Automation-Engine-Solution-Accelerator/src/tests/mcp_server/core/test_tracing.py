@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+pytest.importorskip("opentelemetry.sdk")
+
+from fastmcp import Client
+from fastmcp.server.auth.providers.jwt import RSAKeyPair
+from starlette.middleware import Middleware
+
+from core.auth import CachedJWKSVerifier, JWKSKeyCache
+from core.factory import Domain, MCPToolBase, MCPToolFactory
+from core.tracing import (
+    AUTH_CACHED,
+    AUTH_SPAN,
+    CACHE_STATUS,
+    DOMAIN,
+    FILE,
+    QUEUE_WAIT,
+    TOOL_NAME,
+    AuthTimingMiddleware,
+    Tracing,
+)
+
+from .test_auth import AUDIENCE, ISSUER, jwks, token
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+TRACEPARENT = f"00-{TRACE_ID}-{PARENT_ID}-01"
+
+
+class TracedService(MCPToolBase):
+    def __init__(self):
+        super().__init__(Domain.GENERAL)
+
+    def register_tools(self, mcp) -> None:
+        @mcp.tool(tags={self.domain.value}, meta={"cache": {"ttl": 60}})
+        async def lookup(key: str) -> str:
+            await asyncio.sleep(0.01)
+            return key.upper()
+
+    @property
+    def tool_count(self) -> int:
+        return 1
+
+
+def build_factory(tracing: Tracing, **kwargs) -> MCPToolFactory:
+    factory = MCPToolFactory()
+    factory.register_service(TracedService())
+    factory.create_mcp_server(name="Test", tracing=tracing, **kwargs)
+    return factory
+
+
+def spans_by_name(tracing: Tracing) -> dict:
+    spans = {}
+    for span in tracing.finished_spans():
+        spans.setdefault(span.name, []).append(span)
+    return spans
+
+
+@pytest.mark.asyncio
+async def test_request_and_tool_spans_join_client_trace():
+    tracing = Tracing()
+    factory = build_factory(tracing)
+
+    async with Client(factory._mcp_server) as client:
+        await client.session.call_tool(
+            "lookup", {"key": "a"}, meta={"traceparent": TRACEPARENT}
+        )
+        await client.call_tool("lookup", {"key": "a"})
+
+    spans = spans_by_name(tracing)
+    first, second = spans["tools/call lookup"]
+    (tool,) = spans["execute_tool lookup"]
+
+    assert format(first.context.trace_id, "032x") == TRACE_ID
+    assert format(first.parent.span_id, "016x") == PARENT_ID
+    assert tool.parent.span_id == first.context.span_id
+    assert tool.attributes[TOOL_NAME] == "lookup"
+    assert tool.attributes[DOMAIN] == "general"
+    assert tool.attributes[QUEUE_WAIT] >= 0
+    assert first.attributes[CACHE_STATUS] == "miss"
+    assert first.attributes[DOMAIN] == "general"
+
+    # The cached call never reaches the tool, and starts a trace of its own
+    assert second.attributes[CACHE_STATUS] == "hit"
+    assert second.parent is None
+
+
+@pytest.mark.asyncio
+async def test_http_spans_include_auth(tmp_path):
+    key_pair = RSAKeyPair.generate()
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps(jwks(("k1", key_pair))))
+    key_cache = JWKSKeyCache(jwks_file=str(path))
+    key_cache.prefetch()
+    verifier = CachedJWKSVerifier(
+        key_cache=key_cache, issuer=ISSUER, audience=AUDIENCE
+    )
+
+    tracing = Tracing()
+    factory = build_factory(tracing, auth=verifier)
+    app = factory._mcp_server.http_app(
+        stateless_http=True, middleware=[Middleware(AuthTimingMiddleware)]
+    )
+    bearer = token(key_pair, "k1")
+    headers = {
+        "authorization": f"Bearer {bearer}",
+        "traceparent": TRACEPARENT,
+        "content-type": "application/json",
+        "accept": "application/json, text/event-stream",
+    }
+    payload = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "tools/call",
+        "params": {"name": "lookup", "arguments": {"key": "b"}},
+    }
+
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                for _ in range(2):
+                    response = await client.post("/mcp", json=payload, headers=headers)
+                    assert response.status_code == 200
+    finally:
+        key_cache.stop()
+
+    spans = spans_by_name(tracing)
+    first, second = spans["tools/call lookup"]
+    # Before the first call the server refreshes its tool list; that is the
+    # first request span of the HTTP request, so it carries the auth span
+    (listing,) = spans["tools/list"]
+    first_auth, second_auth = spans[AUTH_SPAN]
+
+    assert format(first.context.trace_id, "032x") == TRACE_ID
+    assert first_auth.parent.span_id == listing.context.span_id
+    assert first_auth.attributes[AUTH_CACHED] is False
+
+    assert second_auth.parent.span_id == second.context.span_id
+    assert second_auth.attributes[AUTH_CACHED] is True
+    assert second.start_time == second_auth.start_time
+    assert second.attributes[CACHE_STATUS] == "hit"
+
+
+def test_file_exporter_writes_json_lines(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    tracing = Tracing(FILE, str(path))
+    with tracing.tracer.start_as_current_span("one"):
+        pass
+    tracing.shutdown()
+
+    (line,) = path.read_text().splitlines()
+    assert json.loads(line)["name"] == "one"
+
+
+def test_unknown_exporter():
+    with pytest.raises(ValueError):
+        Tracing("zipkin")
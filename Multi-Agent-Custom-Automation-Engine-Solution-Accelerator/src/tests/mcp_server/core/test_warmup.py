@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastmcp import Client, FastMCP
+
+from core.factory import Domain, MCPToolBase, MCPToolFactory
+from core.warmup import READY, ToolWarmer, WarmupCall
+from mcp_server import mcp_server as mcp_server_module
+
+
+class WarmService(MCPToolBase):
+    warmup_calls = (
+        WarmupCall("double", {"value": 2}),
+        WarmupCall("missing"),
+    )
+
+    def __init__(self):
+        super().__init__(Domain.GENERAL)
+        self.calls = []
+
+    def register_tools(self, mcp) -> None:
+        @mcp.tool(tags={self.domain.value})
+        def double(value: int) -> int:
+            self.calls.append(value)
+            return value * 2
+
+        @mcp.tool(tags={self.domain.value})
+        def fail(value: int) -> int:
+            raise ValueError("never called")
+
+    @property
+    def tool_count(self) -> int:
+        return 2
+
+
+async def wait_until_ready(warmer: ToolWarmer) -> None:
+    for _ in range(200):
+        if warmer.ready:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"warm-up did not finish: {warmer.stats()}")
+
+
+def test_disabled_warmer_is_ready():
+    assert ToolWarmer().ready is True
+    assert ToolWarmer(enabled=True).ready is False
+
+
+@pytest.mark.asyncio
+async def test_factory_warms_up_tools_on_start():
+    factory = MCPToolFactory()
+    service = WarmService()
+    factory.register_service(service)
+    mcp = factory.create_mcp_server(name="Test", warmup=True)
+    assert factory.warmer.ready is False
+
+    async with Client(mcp):
+        await wait_until_ready(factory.warmer)
+
+    stats = factory.get_warmup_stats()
+    assert stats["status"] == READY
+    assert stats["tools"] == 2
+    assert stats["calls"] == 1
+    assert stats["errors"] == ["missing: unknown tool"]
+    assert service.calls == [2]
+
+
+@pytest.mark.asyncio
+async def test_warmup_is_off_by_default():
+    factory = MCPToolFactory()
+    service = WarmService()
+    factory.register_service(service)
+    mcp = factory.create_mcp_server(name="Test")
+
+    async with Client(mcp) as client:
+        await client.list_tools()
+
+    assert factory.warmer.ready is True
+    assert factory.get_warmup_stats()["enabled"] is False
+    assert service.calls == []
+
+
+@pytest.mark.asyncio
+async def test_health_reports_warming_up(monkeypatch):
+    warmer = ToolWarmer(enabled=True)
+    monkeypatch.setattr(mcp_server_module, "factory", SimpleNamespace(warmer=warmer))
+    server = FastMCP("Test")
+    mcp_server_module.add_health_route(server)
+    transport = httpx.ASGITransport(app=server.http_app())
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/health")
+        assert response.status_code == 503
+        assert response.text == "WARMING UP"
+
+        warmer.status = READY
+        assert (await client.get("/health")).text == "OK"
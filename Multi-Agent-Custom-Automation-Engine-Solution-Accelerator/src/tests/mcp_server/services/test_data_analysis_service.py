@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import pytest
+from fastmcp import Client
+
+from core.factory import MCPToolFactory
+from services.data_analysis_service import DataAnalysisService, describe_data_points
+
+
+def test_describe_data_points_statistics():
+    result = describe_data_points([4.0, 1.0, 3.0, 2.0])
+
+    assert result["count"] == 4
+    assert result["min"] == 1.0
+    assert result["max"] == 4.0
+    assert result["mean"] == 2.5
+    assert result["median"] == 2.5
+
+
+def test_describe_data_points_empty():
+    assert describe_data_points([]) == {"count": 0}
+
+
+@pytest.mark.asyncio
+async def test_data_analysis_service_runs_in_process_pool():
+    factory = MCPToolFactory(process_workers=1)
+    factory.register_service(DataAnalysisService())
+    mcp = factory.create_mcp_server(name="Test")
+
+    try:
+        async with Client(mcp) as client:
+            result = await client.call_tool(
+                "describe_data_points", {"data_points": [1, 2, 3]}
+            )
+        assert result.data["median"] == 2
+        assert factory.get_executor_stats()["process"]["completed"] == 1
+    finally:
+        factory.executors.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_data_analysis_service_readiness_leaves_the_pool_alone():
+    factory = MCPToolFactory(process_workers=1)
+    factory.register_service(DataAnalysisService())
+    factory.create_mcp_server(name="Test")
+    factory.readiness.timeout = 60
+    pool = factory.executors.process_pool
+
+    try:
+        await factory.readiness.run_checks()
+        check = factory.get_readiness_stats()["checks"]["data.process_pool"]
+        assert check["ok"] and check["detail"] == "not started"
+        # The probe does not spawn the workers
+        assert pool.stats()["running"] is False
+
+        await pool.ping()
+        await factory.readiness.run_checks()
+        check = factory.get_readiness_stats()["checks"]["data.process_pool"]
+        assert check["ok"] and check["detail"] == "answered"
+    finally:
+        factory.executors.shutdown()
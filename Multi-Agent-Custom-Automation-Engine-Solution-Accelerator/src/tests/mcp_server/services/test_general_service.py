@@ -22,6 +22,7 @@ def test_general_service_registers_tools():
 
     assert "greet_test" in mcp.tools
     assert "get_server_status" in mcp.tools
+    assert "format_dates" in mcp.tools
 
 
 def test_general_service_greet_tool_returns_success():
@@ -32,3 +33,14 @@ def test_general_service_greet_tool_returns_success():
     result = mcp.tools["greet_test"]("Alice")
     assert "Greeting Completed" in result
     assert "Hello from BB MCP Server, Alice" in result
+
+
+def test_general_service_format_dates_tool_formats_column():
+    mcp = FakeMCP()
+    service = GeneralService()
+    service.register_tools(mcp)
+
+    result = mcp.tools["format_dates"](["01/02/2024", "25/12/2024"])
+    assert "Date Normalization Completed" in result
+    assert "February 01, 2024 at 12:00 AM" in result
+    assert "December 25, 2024 at 12:00 AM" in result
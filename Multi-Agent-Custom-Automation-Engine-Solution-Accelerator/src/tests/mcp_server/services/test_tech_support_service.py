@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+
 import pytest
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+from fastmcp.server.middleware import Middleware
 
+from core.factory import MCPToolFactory
 from services.demo_tech_support_service import TechSupportService
 
 
@@ -33,3 +39,148 @@ async def test_tech_support_registers_tools_and_run():
     )
     assert "Welcome Email Sent" in result
     assert "sam@example.com" in result
+
+
+def build_server():
+    factory = MCPToolFactory()
+    factory.register_service(TechSupportService())
+    return factory, factory.create_mcp_server(name="Test")
+
+
+def text(result) -> str:
+    return result.content[0].text
+
+
+def progress_recorder():
+    progress = []
+
+    async def handler(done, total, message):
+        progress.append((done, total, message))
+
+    return progress, handler
+
+
+class FailTool(Middleware):
+    def __init__(self, name):
+        self.name = name
+
+    async def on_call_tool(self, context, call_next):
+        if context.message.name == self.name:
+            raise ToolError("directory unavailable")
+        return await call_next(context)
+
+
+ONBOARDING = {
+    "employee_name": "Sam",
+    "email_address": "sam@example.com",
+    "laptop_model": "ThinkPad X1",
+}
+
+
+@pytest.mark.asyncio
+async def test_onboard_employee_runs_all_steps_with_progress():
+    factory, mcp = build_server()
+    progress, handler = progress_recorder()
+
+    async with Client(mcp, progress_handler=handler) as client:
+        result = text(await client.call_tool("onboard_employee", ONBOARDING))
+        await client.call_tool("onboard_employee", ONBOARDING)
+
+    assert "Employee Onboarding Completed" in result
+    assert "**Send Welcome Email:** completed in" in result
+    assert [p[0] for p in progress[:5]] == [1, 2, 3, 4, 5]
+    assert all(p[1] == 5 for p in progress)
+    # The welcome email waits for the accounts it announces
+    finished = [p[2].split()[0] for p in progress[:5]]
+    assert finished.index("send_welcome_email") > finished.index(
+        "create_system_accounts"
+    )
+    assert finished.index("send_welcome_email") > finished.index(
+        "set_up_office_365_account"
+    )
+    # Steps go through the tools' idempotency policies
+    stats = factory.get_idempotency_stats()["tools"]["send_welcome_email"]
+    assert stats["executed"] == 1 and stats["replayed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_onboard_employee_skips_steps_after_a_failure():
+    _factory, mcp = build_server()
+    mcp.add_middleware(FailTool("create_system_accounts"))
+
+    async with Client(mcp) as client:
+        result = text(await client.call_tool("onboard_employee", ONBOARDING))
+
+    assert "2 of 5 onboarding steps completed for Sam" in result
+    assert "create_system_accounts: failed" in result
+    assert "directory unavailable" in result
+    assert "setup_vpn_access: skipped" in result
+    assert "send_welcome_email: skipped" in result
+    assert "configure_laptop" not in result
+
+
+@pytest.mark.asyncio
+async def test_bulk_onboard_employees_returns_compact_summary():
+    _factory, mcp = build_server()
+    progress, handler = progress_recorder()
+    cohort = [
+        {
+            "employee_name": f"Hire {i}",
+            "email_address": f"hire{i}@example.com",
+            "laptop_model": "ThinkPad X1",
+        }
+        for i in range(20)
+    ]
+
+    async with Client(mcp, progress_handler=handler) as client:
+        result = text(
+            await client.call_tool(
+                "bulk_onboard_employees", {"employees": cohort, "max_parallel": 4}
+            )
+        )
+
+    assert "Bulk Employee Onboarding Completed" in result
+    assert "**Onboarded:** 20" in result
+    assert "**Failed:** 0" in result
+    assert "Welcome Email" not in result
+    assert [p[0] for p in progress] == list(range(1, 21))
+    assert all("onboarded in" in p[2] for p in progress)
+
+
+class SlowTool(Middleware):
+    def __init__(self, name, delay):
+        self.name = name
+        self.delay = delay
+
+    async def on_call_tool(self, context, call_next):
+        if context.message.name == self.name:
+            await asyncio.sleep(self.delay)
+        return await call_next(context)
+
+
+@pytest.mark.asyncio
+async def test_bulk_onboarding_stays_within_the_step_bulkheads():
+    factory, mcp = build_server()
+    mcp.add_middleware(SlowTool("set_up_office_365_account", 0.2))
+    cohort = [
+        {
+            "employee_name": f"Hire {i}",
+            "email_address": f"hire{i}@example.com",
+            "laptop_model": "ThinkPad X1",
+        }
+        for i in range(24)
+    ]
+    arguments = {"employees": cohort, "max_parallel": 24}
+
+    # Two cohorts at full width would queue 48 Office 365 calls, more than
+    # its bulkhead holds (8 running, 32 waiting)
+    async with Client(mcp) as client:
+        results = await asyncio.gather(
+            client.call_tool("bulk_onboard_employees", arguments),
+            client.call_tool("bulk_onboard_employees", arguments),
+        )
+
+    assert all("**Failed:** 0" in text(result) for result in results)
+    office = factory.get_bulkhead_stats()["tool:set_up_office_365_account"]
+    assert office["rejected"] == 0
+    assert office["completed"] == 48
@@ -6,18 +6,32 @@ from mcp_server import mcp_server as mcp_server_module
 def test_create_fastmcp_server_with_auth(monkeypatch):
     created = {}
 
-    def fake_create_mcp_server(name, auth=None):
+    def fake_create_mcp_server(name, auth=None, **kwargs):
         created["name"] = name
         created["auth"] = auth
         return "server"
 
-    def fake_jwt(**kwargs):
+    class FakeKeyCache:
+        def __init__(self, **kwargs):
+            self.kwargs = kwargs
+            self.prefetched = False
+
+        def prefetch(self):
+            self.prefetched = True
+            return True
+
+        async def ensure_loaded(self):
+            return True
+
+    def fake_verifier(**kwargs):
         return {"jwt": kwargs}
 
-    monkeypatch.setattr(mcp_server_module, "JWTVerifier", fake_jwt)
+    monkeypatch.setattr(mcp_server_module, "JWKSKeyCache", FakeKeyCache)
+    monkeypatch.setattr(mcp_server_module, "CachedJWKSVerifier", fake_verifier)
     monkeypatch.setattr(mcp_server_module.factory, "create_mcp_server", fake_create_mcp_server)
     monkeypatch.setattr(mcp_server_module.config, "enable_auth", True)
     monkeypatch.setattr(mcp_server_module.config, "jwks_uri", "jwks")
+    monkeypatch.setattr(mcp_server_module.config, "jwks_file", None)
     monkeypatch.setattr(mcp_server_module.config, "issuer", "issuer")
     monkeypatch.setattr(mcp_server_module.config, "audience", "aud")
     monkeypatch.setattr(mcp_server_module.config, "server_name", "Server")
@@ -25,7 +39,9 @@ def test_create_fastmcp_server_with_auth(monkeypatch):
     server = mcp_server_module.create_fastmcp_server()
     assert server == "server"
     assert created["name"] == "Server"
-    assert created["auth"]["jwt"]["jwks_uri"] == "jwks"
+    key_cache = created["auth"]["jwt"]["key_cache"]
+    assert key_cache.kwargs["jwks_uri"] == "jwks"
+    assert key_cache.prefetched is True
 
 
 def test_create_fastmcp_server_without_auth(monkeypatch):
@@ -49,6 +65,7 @@ def test_run_server_http_transport(monkeypatch):
     assert calls["transport"] == "http"
     assert calls["host"] == "0.0.0.0"
     assert calls["port"] == 9000
+    assert calls["middleware"][0].cls.__name__ == "BatchMiddleware"
 
 
 def test_run_server_stdio_transport(monkeypatch):
@@ -64,3 +81,71 @@ def test_run_server_stdio_transport(monkeypatch):
     assert calls["transport"] == "stdio"
     assert "log_level" not in calls
     assert calls["extra"] == "ok"
+
+
+class RecordingMCP:
+    def __init__(self):
+        self.tools = []
+        self.resources = []
+        self.prompts = []
+
+    def tool(self, name_or_fn=None, **kwargs):
+        def decorator(fn):
+            self.tools.append(kwargs.get("name") or fn.__name__)
+            return fn
+
+        return decorator
+
+    def resource(self, uri, **_kwargs):
+        def decorator(fn):
+            self.resources.append(uri)
+            return fn
+
+        return decorator
+
+    def prompt(self, fn):
+        self.prompts.append(fn.__name__)
+        return fn
+
+
+def test_service_descriptors_match_registered_components():
+    for descriptor in mcp_server_module.factory._descriptors.values():
+        recorder = RecordingMCP()
+        descriptor.load().register_tools(recorder)
+
+        assert tuple(recorder.tools) == descriptor.tools
+        assert tuple(recorder.resources) == descriptor.resources
+        assert tuple(recorder.prompts) == descriptor.prompts
+
+
+def test_run_server_prefork_workers(monkeypatch, caplog):
+    import core.prefork as prefork_module
+
+    calls = {}
+
+    class FakeMCP:
+        def http_app(self, **kwargs):
+            calls["http_app"] = kwargs
+            return "app"
+
+    def fake_run_prefork(app_factory, host, port, workers, log_level, graceful_shutdown):
+        calls.update(
+            app=app_factory(),
+            host=host,
+            port=port,
+            workers=workers,
+            graceful_shutdown=graceful_shutdown,
+        )
+
+    monkeypatch.setattr(mcp_server_module, "mcp", FakeMCP())
+    monkeypatch.setattr(prefork_module, "run_prefork", fake_run_prefork)
+
+    mcp_server_module.run_server(
+        transport="http", host="0.0.0.0", port=9000, workers=4, log_level="info"
+    )
+    assert calls["app"] == "app"
+    assert calls["workers"] == 4
+    assert calls["graceful_shutdown"] == mcp_server_module.config.graceful_shutdown_timeout
+    assert calls["http_app"]["transport"] == "http"
+    assert calls["http_app"]["stateless_http"] is True
+    assert "elicitation" in caplog.text
@@ -1,6 +1,45 @@
 from __future__ import annotations
 
-from utils.date_utils import format_date_for_user, get_current_timestamp, format_timestamp_for_display
+import itertools
+from datetime import datetime, timezone
+
+import pytest
+
+from utils.date_utils import (
+    CALLER_CACHE_SIZE,
+    DISPLAY_FORMAT,
+    Clock,
+    DateParser,
+    SimulatedClock,
+    detect_day_first,
+    format_date_for_user,
+    format_dates_for_user,
+    format_timestamp_for_display,
+    format_timestamps_for_display,
+    get_current_timestamp,
+    get_date_parser,
+    set_clock,
+)
+
+LEGACY_FORMATS = [
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%m/%d/%Y",
+    "%d/%m/%Y",
+]
+
+
+def legacy_format_date_for_user(date_str):
+    """The original strptime loop, kept as the reference output."""
+    for fmt in LEGACY_FORMATS:
+        try:
+            parsed = datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+        return parsed.strftime("%B %d, %Y at %I:%M %p")
+    return date_str
 
 
 def test_format_date_for_user_parses_common_formats():
@@ -23,3 +62,171 @@ def test_format_timestamp_for_display_handles_none_and_invalid():
     formatted = format_timestamp_for_display()
     assert "UTC" in formatted
     assert format_timestamp_for_display("invalid") == "invalid"
+
+
+def test_format_date_for_user_matches_legacy_parser():
+    samples = [
+        f"{a}/{b}/2024" for a, b in itertools.product(["1", "03", "12", "13", "31", "32"], repeat=2)
+    ] + [
+        "2024-01-18",
+        "2024-1-8",
+        "2024-02-30",
+        "2024-13-01",
+        "2024-01-18 10:30:00",
+        "2024-01-18 7:5:3",
+        "2024-01-18T23:59:59",
+        "2024-01-18T24:00:00",
+        "2024-01-18T10:30:00Z",
+        "2024-01-18 10:30:00Z",
+        "2024-01-18T10:30",
+        "24-01-18",
+        "01/18/24",
+        " 2024-01-18",
+        "",
+    ]
+    for sample in samples:
+        assert format_date_for_user(sample) == legacy_format_date_for_user(sample), sample
+
+
+def test_format_date_for_user_day_first():
+    assert format_date_for_user("03/04/2024").startswith("March 04")
+    assert format_date_for_user("03/04/2024", day_first=True).startswith("April 03")
+    # Unambiguous dates are read the only way they can be
+    assert format_date_for_user("04/25/2024", day_first=True).startswith("April 25")
+
+
+def test_date_parser_remembers_caller_date_order():
+    parser = DateParser()
+
+    assert parser.format("03/04/2024").startswith("March 04")
+    assert parser.format("25/04/2024").startswith("April 25")
+    assert parser.day_first is True
+    assert parser.format("03/04/2024").startswith("April 03")
+
+    fixed = DateParser(day_first=False)
+    fixed.format("25/04/2024")
+    assert fixed.format("03/04/2024").startswith("March 04")
+
+
+def test_caller_parsers_are_bounded():
+    parser = get_date_parser("hr-export")
+    format_date_for_user("25/04/2024", caller="hr-export")
+
+    assert get_date_parser("hr-export") is parser
+    assert parser.day_first is True
+
+    for n in range(CALLER_CACHE_SIZE):
+        get_date_parser(f"caller-{n}")
+    assert get_date_parser("hr-export") is not parser
+
+
+def test_format_date_for_user_handles_non_strings():
+    assert format_date_for_user(None) is None
+
+
+def test_format_dates_for_user_matches_scalar_function():
+    dates = ["2024-01-18", "01/02/2024", "2024-01-18", "not a date", None]
+    assert format_dates_for_user(dates, day_first=False) == [
+        format_date_for_user(d, day_first=False) for d in dates
+    ]
+
+
+def test_format_dates_for_user_detects_column_date_order():
+    dates = ["01/02/2024", "25/12/2024"]
+    assert detect_day_first(dates) is True
+    assert format_dates_for_user(dates)[0] == "February 01, 2024 at 12:00 AM"
+
+    # A month-first-only date makes the column ambiguous again
+    assert detect_day_first(dates + ["12/25/2024"]) is False
+
+
+def test_format_timestamps_for_display_matches_scalar_function():
+    timestamps = ["2024-01-18T10:30:00Z", "bad", ""]
+    assert format_timestamps_for_display(timestamps) == [
+        format_timestamp_for_display(t) for t in timestamps
+    ]
+
+
+def test_format_dates_for_user_vectorizes_datetime64_arrays():
+    np = pytest.importorskip("numpy")
+    values = np.array(
+        ["2024-01-18T00:00", "1999-12-31T23:59", "NaT", "2024-07-04T12:05"],
+        dtype="datetime64[m]",
+    )
+
+    formatted = format_dates_for_user(values)
+    assert isinstance(formatted, np.ndarray)
+    expected = [
+        v.strftime(DISPLAY_FORMAT) if v is not None else "NaT"
+        for v in values.astype(datetime)
+    ]
+    assert formatted.tolist() == expected
+    assert format_timestamps_for_display(values)[0] == expected[0] + " UTC"
+
+
+def test_format_dates_for_user_handles_years_outside_datetime():
+    np = pytest.importorskip("numpy")
+    values = np.array(
+        ["2024-01-18T10:30", "12000-01-01T00:00", "NaT"], dtype="datetime64[m]"
+    )
+
+    assert format_dates_for_user(values).tolist() == [
+        "January 18, 2024 at 10:30 AM",
+        "12000-01-01T00:00",
+        "NaT",
+    ]
+    nanoseconds = np.array(["2024-01-18T10:30:00.5"], dtype="datetime64[ns]")
+    assert format_dates_for_user(nanoseconds).tolist() == [
+        "January 18, 2024 at 10:30 AM"
+    ]
+
+
+def test_format_dates_for_user_keeps_array_shape_for_strings():
+    np = pytest.importorskip("numpy")
+    values = np.array(["2024-01-18", "2024-01-19"])
+
+    formatted = format_dates_for_user(values)
+    assert isinstance(formatted, np.ndarray)
+    assert formatted.tolist() == [format_date_for_user(v) for v in values.tolist()]
+
+
+def test_clock_formats_timestamp_once_per_tick():
+    calls = []
+    wall = iter([100.2, 100.7, 101.1])
+
+    def now():
+        calls.append(1)
+        return next(wall)
+
+    clock = Clock(resolution=1.0, wall=now)
+    first = clock.timestamp()
+    assert clock.timestamp() is first
+    assert first == "1970-01-01T00:01:40+00:00"
+    assert clock.timestamp() == "1970-01-01T00:01:41+00:00"
+    assert len(calls) == 3
+
+
+def test_clock_without_resolution_keeps_microseconds():
+    clock = Clock(resolution=0, wall=lambda: 1.25)
+    assert clock.timestamp() == "1970-01-01T00:00:01.250000+00:00"
+    assert Clock(wall=lambda: 1.25).timestamp() == clock.timestamp()
+
+    with pytest.raises(ValueError):
+        Clock(resolution=-1)
+
+
+def test_simulated_clock_drives_timestamps_and_durations():
+    clock = SimulatedClock(start=datetime(2024, 1, 18, 10, 30, tzinfo=timezone.utc))
+    previous = set_clock(clock)
+    try:
+        started = clock.monotonic()
+        assert get_current_timestamp() == "2024-01-18T10:30:00+00:00"
+        clock.advance(90)
+        assert clock.monotonic() - started == 90
+        assert get_current_timestamp() == "2024-01-18T10:31:30+00:00"
+        assert format_timestamp_for_display() == "January 18, 2024 at 10:31 AM UTC"
+    finally:
+        set_clock(previous)
+
+    with pytest.raises(ValueError):
+        clock.advance(-1)
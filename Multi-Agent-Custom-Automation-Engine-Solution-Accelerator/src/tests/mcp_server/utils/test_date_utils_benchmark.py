@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import itertools
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from utils.date_utils import (
+    DISPLAY_FORMAT,
+    Clock,
+    _format_cached,
+    detect_date,
+    format_date_for_user,
+    format_dates_for_user,
+)
+
+from .test_date_utils import legacy_format_date_for_user
+
+# Ambiguous slashed dates are the legacy parser's slowest path
+SAMPLES = [
+    "2024-01-18",
+    "2024-01-18T10:30:00Z",
+    "03/04/2024",
+    "25/12/2024",
+]
+
+
+@pytest.mark.benchmark(group="format_date_for_user")
+@pytest.mark.parametrize("sample", SAMPLES)
+def test_benchmark_legacy_parser(benchmark, sample):
+    benchmark(legacy_format_date_for_user, sample)
+
+
+@pytest.mark.benchmark(group="format_date_for_user")
+@pytest.mark.parametrize("sample", SAMPLES)
+def test_benchmark_cache_hit(benchmark, sample):
+    format_date_for_user(sample)
+    benchmark(format_date_for_user, sample)
+
+
+@pytest.mark.benchmark(group="format_date_for_user")
+@pytest.mark.parametrize("sample", SAMPLES)
+def test_benchmark_cache_miss(benchmark, sample):
+    def miss():
+        _format_cached.cache_clear()
+        return format_date_for_user(sample)
+
+    assert benchmark(miss) == legacy_format_date_for_user(sample)
+
+
+@pytest.mark.benchmark(group="detect_date")
+def test_benchmark_unique_export_rows(benchmark):
+    rows = [
+        f"{day:02d}/{month:02d}/2024"
+        for month, day in itertools.product(range(1, 13), range(1, 29))
+    ]
+
+    def parse_all():
+        for row in rows:
+            detect_date(row, day_first=True)
+
+    benchmark(parse_all)
+
+
+COLUMN = [datetime(2024, 1, 1) + timedelta(minutes=7 * i) for i in range(20_000)]
+
+
+@pytest.mark.benchmark(group="format_dates_for_user")
+def test_benchmark_column_strftime_loop(benchmark):
+    benchmark(lambda: [value.strftime(DISPLAY_FORMAT) for value in COLUMN])
+
+
+@pytest.mark.benchmark(group="format_dates_for_user")
+def test_benchmark_column_datetime64(benchmark):
+    np = pytest.importorskip("numpy")
+    column = np.array(COLUMN, dtype="datetime64[m]")
+    benchmark(format_dates_for_user, column)
+
+
+# Distinct ISO strings, and an export that repeats a few thousand slashed dates
+STRING_COLUMNS = {
+    "distinct": [value.strftime("%Y-%m-%d %H:%M:%S") for value in COLUMN],
+    "repeated": [
+        (datetime(2024, 1, 1) + timedelta(days=i % 3000)).strftime("%d/%m/%Y")
+        for i in range(len(COLUMN))
+    ],
+}
+
+
+@pytest.mark.benchmark(group="string_column")
+@pytest.mark.parametrize("kind", sorted(STRING_COLUMNS))
+def test_benchmark_string_column_scalar_loop(benchmark, kind):
+    column = STRING_COLUMNS[kind]
+    day_first = kind == "repeated"
+
+    def run():
+        _format_cached.cache_clear()
+        return [format_date_for_user(value, day_first=day_first) for value in column]
+
+    benchmark(run)
+
+
+@pytest.mark.benchmark(group="string_column")
+@pytest.mark.parametrize("kind", sorted(STRING_COLUMNS))
+def test_benchmark_string_column_batch(benchmark, kind):
+    column = STRING_COLUMNS[kind]
+
+    def run():
+        _format_cached.cache_clear()
+        return format_dates_for_user(column)
+
+    formatted = benchmark(run)
+    # The batch path detects the order the scalar loop is told
+    assert formatted == [
+        format_date_for_user(value, day_first=kind == "repeated") for value in column
+    ]
+
+
+@pytest.mark.benchmark(group="timestamp")
+def test_benchmark_timestamp_uncached(benchmark):
+    benchmark(lambda: datetime.now(timezone.utc).isoformat())
+
+
+@pytest.mark.benchmark(group="timestamp")
+def test_benchmark_timestamp_cached_clock(benchmark):
+    benchmark(Clock(resolution=1.0).timestamp)
+
+
+@pytest.mark.benchmark(group="timestamp")
+def test_benchmark_timestamp_default_clock(benchmark):
+    benchmark(Clock().timestamp)
@@ -1,6 +1,17 @@
 from __future__ import annotations
 
-from utils.formatters import format_success_response, format_error_response, format_mcp_response
+import pytest
+
+from utils.formatters import (
+    ResponseMode,
+    format_error_response,
+    format_label,
+    format_mcp_response,
+    format_success_response,
+    measure_response_sizes,
+    parse_error_response,
+    response_mode,
+)
 
 
 def test_format_mcp_response_basic():
@@ -26,3 +37,70 @@ def test_format_error_response_includes_context():
     assert "##### ❌ Error" in result
     assert "**Context:** testing" in result
     assert "**Error:** boom" in result
+
+
+def legacy_format_mcp_response(title, content, agent_summary, additional_instructions=None):
+    """The original list-based renderer, kept as the reference output."""
+    response_parts = [f"##### {title}\n"]
+    for key, value in content.items():
+        formatted_key = key.replace("_", " ").title()
+        response_parts.append(f"**{formatted_key}:** {value}")
+    response_parts.append("")
+    response_parts.append(f"AGENT SUMMARY: {agent_summary}")
+    response_parts.append(
+        "Instructions: returning the output of this function call verbatim "
+        "to the user in markdown. Then write AGENT SUMMARY: and then include "
+        "a summary of what you did."
+    )
+    if additional_instructions:
+        response_parts.append(additional_instructions)
+    return "\n".join(response_parts)
+
+
+@pytest.mark.parametrize(
+    "content, extra",
+    [
+        ({}, None),
+        ({"employee_name": "Sam", "email_address": "sam@example.com"}, None),
+        ({"count": 3, "ratio": 0.5, "items": ["a", "b"], "none": None}, "Be brief."),
+    ],
+)
+def test_renderer_matches_legacy_output(content, extra):
+    assert format_mcp_response("Title", content, "done", extra) == (
+        legacy_format_mcp_response("Title", content, "done", extra)
+    )
+
+
+@pytest.mark.parametrize("mode", list(ResponseMode))
+def test_parse_error_response_in_every_mode(mode):
+    with response_mode(mode):
+        error = format_error_response("boom: again", context="testing")
+        bare = format_error_response("boom")
+        success = format_success_response("Greeting", {"error": "none"})
+
+    assert parse_error_response(error) == "boom: again"
+    assert parse_error_response(bare) == "boom"
+    assert parse_error_response(success) is None
+
+
+def test_format_label():
+    assert format_label("email_address") == "Email Address"
+
+
+def test_response_modes_render_compact_and_structured():
+    with response_mode(ResponseMode.COMPACT):
+        compact = format_success_response("Greeting", {"name": "Alice"})
+        error = format_error_response("boom", context="testing")
+    with response_mode(ResponseMode.STRUCTURED) as state:
+        structured = format_success_response("Greeting", {"name": "Alice"})
+
+    assert compact == "**Greeting Completed**\nName: Alice\nSuccessfully completed greeting"
+    assert error == "**Error (testing):** boom"
+    assert structured == '{"name":"Alice"}'
+    assert state.structured == {"name": "Alice"}
+
+
+def test_measure_response_sizes():
+    sizes = measure_response_sizes("Greeting", {"name": "Alice", "status": "ok"})
+
+    assert sizes["structured"] < sizes["compact"] < sizes["full"]
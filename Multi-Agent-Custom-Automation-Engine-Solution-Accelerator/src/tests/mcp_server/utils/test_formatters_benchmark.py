@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from itertools import cycle
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from utils.formatters import format_mcp_response
+
+from .test_formatters import legacy_format_mcp_response
+
+TITLE = "Office 365 Account Setup Completed"
+SUMMARY = "Office 365 account has been set up."
+
+REPEATED = [
+    {
+        "employee_name": "Sam Example",
+        "email_address": "sam@example.com",
+        "department": "Engineering",
+        "licenses": "Office 365 Business Premium",
+        "status": "Account Created",
+    }
+]
+
+# Content keys that never repeat across calls.
+DISTINCT = [
+    {f"field_{i}_{j}_name": f"value {j}" for j in range(5)} for i in range(3000)
+]
+
+PAYLOADS = {"repeated": REPEATED, "distinct": DISTINCT}
+
+
+def _render_all(renderer, kind):
+    payloads = cycle(PAYLOADS[kind])
+    return lambda: renderer(TITLE, next(payloads), SUMMARY)
+
+
+@pytest.mark.parametrize("kind", sorted(PAYLOADS))
+@pytest.mark.benchmark(group="format_mcp_response")
+def test_benchmark_legacy_renderer(benchmark, kind):
+    benchmark(_render_all(legacy_format_mcp_response, kind))
+
+
+@pytest.mark.parametrize("kind", sorted(PAYLOADS))
+@pytest.mark.benchmark(group="format_mcp_response")
+def test_benchmark_renderer(benchmark, kind):
+    benchmark(_render_all(format_mcp_response, kind))
+
+    for content in PAYLOADS[kind]:
+        assert format_mcp_response(TITLE, content, SUMMARY) == (
+            legacy_format_mcp_response(TITLE, content, SUMMARY)
+        )